@@ -0,0 +1,24 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query
+from app.repositories.repository import OrderRepository, PaymentRepository, ReviewRepository
+from app.models.enums import ExportFormat
+from app.models.filters import GetOrderFilters, GetPaymentFilters, GetReviewFilters
+from app.core.responses import ErrorResponse
+from app.utils.export import export_response
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+order_repo = OrderRepository()
+payment_repo = PaymentRepository()
+review_repo = ReviewRepository()
+
+@router.get("/orders", responses={400: {"model": ErrorResponse}})
+def export_orders(filters: GetOrderFilters = Depends(), format: ExportFormat = Query(ExportFormat.NDJSON), created_from: datetime = Query(None), created_to: datetime = Query(None)):
+    return export_response("orders", order_repo, filters, format, created_from, created_to)
+
+@router.get("/payments", responses={400: {"model": ErrorResponse}})
+def export_payments(filters: GetPaymentFilters = Depends(), format: ExportFormat = Query(ExportFormat.NDJSON), created_from: datetime = Query(None), created_to: datetime = Query(None)):
+    return export_response("payments", payment_repo, filters, format, created_from, created_to)
+
+@router.get("/reviews", responses={400: {"model": ErrorResponse}})
+def export_reviews(filters: GetReviewFilters = Depends(), format: ExportFormat = Query(ExportFormat.NDJSON), created_from: datetime = Query(None), created_to: datetime = Query(None)):
+    return export_response("reviews", review_repo, filters, format, created_from, created_to)
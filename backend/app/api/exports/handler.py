@@ -0,0 +1,6 @@
+from fastapi import APIRouter
+from app.api.exports.exports import router as exports_router
+
+router = APIRouter()
+
+router.include_router(exports_router)
@@ -1,14 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File as FastAPIFile
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File as FastAPIFile, Form
 from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID
+import json
 from app.repositories.repository import FileRepository, UserRepository, RestaurantRepository
 from app.models.file import File, validate_file
 from app.models.filters import GetFileFilters, GetRestaurantFilters
 from app.core.responses import SuccessResponse, ErrorResponse
+from app.core.serialization import list_response, parse_fields
 from app.db.session import get_db
+from app.db.unit_of_work import unit_of_work
 from app.core.errors import NotFoundError, BadRequestError
 from app.schemas.file import FileCreate, FileUpdate, FileListResponse, FileSingleResponse, FileCreateForm
 from app.utils.file import save_file
-from app.utils.ocr import process_menu_image
+from app.utils.ocr import process_menu_image, process_menu_files
 from app.models.enums import FileTypes
 
 router = APIRouter(prefix="/files", tags=["files"])
@@ -17,11 +22,12 @@ user_repo = UserRepository()
 restaurant_repo = RestaurantRepository()
 
 @router.get("/", response_model=FileListResponse)
-def get_files(filters: GetFileFilters = Depends(), db: Session = Depends(get_db)):
-    files = file_repo.get(db, filters=filters)
+def get_files(filters: GetFileFilters = Depends(), fields: str = Query(None), db: Session = Depends(get_db)):
+    selected = parse_fields(FileListResponse, fields)
+    files = file_repo.get(db, filters=filters, fields=selected)
     if not files:
         raise NotFoundError("No files found")
-    return FileListResponse(data=files)
+    return list_response(FileListResponse, files, selected)
 
 @router.post("/", response_model=FileSingleResponse, status_code=status.HTTP_201_CREATED)
 def create_file(db: Session = Depends(get_db), file: UploadFile = FastAPIFile(...), form_data: FileCreateForm = Depends()):
@@ -37,8 +43,7 @@ def create_file(db: Session = Depends(get_db), file: UploadFile = FastAPIFile(..
         file_obj = File(**file_data.dict())
         validate_file(file_obj)
 
-        user = user_repo.get(db, id=file_data.uploaded_by)
-        if not user:
+        if not user_repo.exists(db, id=file_data.uploaded_by):
             raise NotFoundError(f"User {file_data.uploaded_by} not found")
 
         restaurant = None
@@ -49,10 +54,12 @@ def create_file(db: Session = Depends(get_db), file: UploadFile = FastAPIFile(..
                 raise NotFoundError(f"Restaurant for user {file_data.uploaded_by} not found")
             restaurant = restaurants[0]
 
-        created = file_repo.create(db, obj_in=file_data)
+        # The File row only commits if the menu it points at was imported.
+        with unit_of_work(db):
+            created = file_repo.create(db, obj_in=file_data)
 
-        if form_data.file_type == FileTypes.MENU and restaurant and restaurant.id:
-            process_menu_image(db=db, file_path=file_path, restaurant_id=restaurant.id)
+            if form_data.file_type == FileTypes.MENU and restaurant and restaurant.id:
+                process_menu_image(db=db, file_path=file_path, restaurant_id=restaurant.id)
 
         return FileSingleResponse(data=created, message="File created successfully")
     except HTTPException as e:
@@ -60,6 +67,49 @@ def create_file(db: Session = Depends(get_db), file: UploadFile = FastAPIFile(..
     except Exception as e:
         raise BadRequestError(str(e))
 
+@router.post("/menu", response_model=FileListResponse, status_code=status.HTTP_201_CREATED)
+def upload_menu_files(
+    db: Session = Depends(get_db),
+    files: List[UploadFile] = FastAPIFile(...),
+    uploaded_by: UUID = Form(...),
+    meta: Optional[str] = Form(None)
+):
+    try:
+        if not user_repo.exists(db, id=uploaded_by):
+            raise NotFoundError(f"User {uploaded_by} not found")
+
+        restaurant_filter = GetRestaurantFilters(owner_id=uploaded_by)
+        restaurants = restaurant_repo.get(db, filters=restaurant_filter)
+        if not restaurants:
+            raise NotFoundError(f"Restaurant for user {uploaded_by} not found")
+        restaurant = restaurants[0]
+
+        file_meta = json.loads(meta) if meta else None
+        created_files = []
+        file_paths = []
+        # File rows and the import commit together, so a failed parse or import
+        # leaves no File rows for a menu that was never imported.
+        with unit_of_work(db):
+            for file in files:
+                file_path = save_file(file)
+                file_data = FileCreate(
+                    file_url=file_path,
+                    file_type=FileTypes.MENU.value,
+                    uploaded_by=uploaded_by,
+                    meta=file_meta
+                )
+                validate_file(File(**file_data.dict()))
+                created_files.append(file_repo.create(db, obj_in=file_data))
+                file_paths.append(file_path)
+
+            process_menu_files(db=db, file_paths=file_paths, restaurant_id=restaurant.id)
+
+        return FileListResponse(data=created_files, message="Menu files uploaded successfully")
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise BadRequestError(str(e))
+
 @router.patch("/", response_model=FileSingleResponse, responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}})
 def update_file(file_data: FileUpdate, file_id: str = Query(...), db: Session = Depends(get_db)):
     file = file_repo.get(db, id=file_id)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 from app.repositories.repository import AddonsRepository
 from app.models.addons import Addons, validate_addons
@@ -6,17 +6,39 @@ from app.models.filters import GetAddonsFilters
 from app.core.errors import NotFoundError, BadRequestError
 from app.core.responses import SuccessResponse, ErrorResponse
 from app.db.session import get_db
-from app.schemas.addons import AddonsCreate, AddonsUpdate, AddonsListResponse, AddonsSingleResponse
+from app.schemas.addons import AddonsCreate, AddonsUpdate, AddonsBulkUpdate, AddonsListResponse, AddonsSingleResponse, AddonsBulkResponse
+from app.schemas.bulk import BulkDeleteRequest
+from app.utils.bulk import check_bulk_size
+from typing import List
+from app.utils.catalogue import get_all_addons, get_restaurant_addons
+from app.core.http_cache import cache_headers, etag_matches, not_modified, variant_etag
+from app.core.serialization import bulk_response, encode_list, encoded_list_response, list_response, parse_fields
 
 router = APIRouter(prefix="/addons", tags=["addons"])
 addon_repo = AddonsRepository()
 
 @router.get("/", response_model=AddonsListResponse)
-def get_addons(filters: GetAddonsFilters = Depends(), db: Session = Depends(get_db)):
-    addons = addon_repo.get(db, filters=filters)
+def get_addons(request: Request, filters: GetAddonsFilters = Depends(), fields: str = Query(None), db: Session = Depends(get_db)):
+    selected = parse_fields(AddonsListResponse, fields)
+    cached = None
+    if filters.restaurant_id and not filters.dict(exclude={"restaurant_id"}, exclude_none=True):
+        cached = get_restaurant_addons(db, filters.restaurant_id)
+    elif not filters.dict(exclude_none=True):
+        cached = get_all_addons(db)
+
+    if cached is not None:
+        etag = variant_etag(cached.etag, ",".join(selected or ()))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        if not cached.value:
+            raise NotFoundError("No addons found")
+        body = cached.body if selected is None else encode_list(AddonsListResponse, cached.value, selected)
+        return encoded_list_response(AddonsListResponse, body, headers=cache_headers(etag))
+
+    addons = addon_repo.get(db, filters=filters, fields=selected)
     if not addons:
         raise NotFoundError("No addons found")
-    return AddonsListResponse(data=addons)
+    return list_response(AddonsListResponse, addons, selected)
 
 @router.post("/", response_model=AddonsSingleResponse, status_code=status.HTTP_201_CREATED)
 def create_addon(addon: AddonsCreate, db: Session = Depends(get_db)):
@@ -49,4 +71,22 @@ def delete_addon(addon_id: str, db: Session = Depends(get_db)):
     addon = addon_repo.delete(db, id=addon_id)
     if not addon:
         raise NotFoundError(f"Addon {addon_id} not found")
-    return SuccessResponse(message="Addon deleted successfully")
\ No newline at end of file
+    return SuccessResponse(message="Addon deleted successfully")
+
+@router.post("/bulk", response_model=AddonsBulkResponse, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
+def create_addons(addons: List[AddonsCreate], atomic: bool = Query(True), db: Session = Depends(get_db)):
+    check_bulk_size(addons)
+    created, errors = addon_repo.create_many(db, addons, atomic=atomic)
+    return bulk_response(AddonsBulkResponse, created, errors, status_code=status.HTTP_201_CREATED)
+
+@router.patch("/bulk", response_model=AddonsBulkResponse, responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}})
+def update_addons(addons: List[AddonsBulkUpdate], atomic: bool = Query(True), db: Session = Depends(get_db)):
+    check_bulk_size(addons)
+    updated, errors = addon_repo.update_many(db, addons, atomic=atomic)
+    return bulk_response(AddonsBulkResponse, updated, errors)
+
+@router.post("/bulk/delete", response_model=AddonsBulkResponse, responses={404: {"model": ErrorResponse}})
+def delete_addons(delete_in: BulkDeleteRequest, atomic: bool = Query(True), db: Session = Depends(get_db)):
+    check_bulk_size(delete_in.ids)
+    deleted, errors = addon_repo.delete_many(db, delete_in.ids, atomic=atomic)
+    return bulk_response(AddonsBulkResponse, deleted, errors)
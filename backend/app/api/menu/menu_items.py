@@ -1,30 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
-from app.repositories.repository import MenuItemRepository, RestaurantRepository, MenuItemAddonsRepository
+from app.repositories.repository import MenuItemRepository, RestaurantRepository
 from app.models.menu_items import MenuItem, validate_menu_item
-from app.models.filters import GetMenuItemFilters, GetMenuItemAddonsFilters
+from app.models.filters import GetMenuItemFilters
 from app.core.errors import NotFoundError, BadRequestError
 from app.core.responses import SuccessResponse, ErrorResponse
 from app.db.session import get_db
-from app.schemas.menu_items import MenuItemCreate, MenuItemUpdate, MenuItemListResponse, MenuItemSingleResponse
-from app.utils.embedding import create_menu_item_embedding
+from app.schemas.menu_items import MenuItemCreate, MenuItemUpdate, MenuItemBulkUpdate, MenuItemListResponse, MenuItemSingleResponse, MenuItemBulkResponse
+from app.schemas.bulk import BulkDeleteRequest
+from app.utils.embedding import EMBEDDING_FIELDS, create_menu_item_embedding, upsert_menu_item_embeddings
+from app.utils.bulk import check_bulk_size
+from typing import List
+from contextlib import nullcontext
+from app.db.unit_of_work import unit_of_work
+from app.utils.catalogue import get_restaurant_menu, serialize_menu_items
+from app.core.http_cache import cache_headers, etag_matches, not_modified, variant_etag
+from app.core.serialization import bulk_response, dumps, encode_list, encoded_list_response, parse_fields
 
 router = APIRouter(prefix="/menu_items", tags=["menu_items"])
 menu_item_repo = MenuItemRepository()
 restaurant_repo = RestaurantRepository()
-menu_item_addons_repo = MenuItemAddonsRepository()
 
 @router.get("/", response_model=MenuItemListResponse)
-def get_menu_items(filters: GetMenuItemFilters = Depends(), db: Session = Depends(get_db)):
-    menu_items = menu_item_repo.get(db, filters=filters)
+def get_menu_items(request: Request, filters: GetMenuItemFilters = Depends(), fields: str = Query(None), db: Session = Depends(get_db)):
+    selected = parse_fields(MenuItemListResponse, fields)
+    if filters.restaurant_id and not filters.dict(exclude={"restaurant_id"}, exclude_none=True):
+        menu = get_restaurant_menu(db, filters.restaurant_id)
+        etag = variant_etag(menu.etag, ",".join(selected or ()))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        if not menu.value:
+            raise NotFoundError("No menu items found")
+        body = menu.body if selected is None else encode_list(MenuItemListResponse, menu.value, selected)
+        return encoded_list_response(MenuItemListResponse, body, headers=cache_headers(etag))
+
+    projected = selected
+    if selected is not None and "options" in selected and "restaurant_id" not in selected:
+        # Option prices are discounted by the owning restaurant's active promotion.
+        projected = selected + ("restaurant_id",)
+    menu_items = menu_item_repo.get(db, filters=filters, fields=projected)
     if not menu_items:
         raise NotFoundError("No menu items found")
-    
-    for menu_item in menu_items:
-        addons_filters = GetMenuItemAddonsFilters(menu_item_id=menu_item.id)
-        menu_item.addons = menu_item_addons_repo.get(db, filters=addons_filters)
-    
-    return MenuItemListResponse(data=menu_items)
+
+    return encoded_list_response(MenuItemListResponse, dumps(serialize_menu_items(db, menu_items, selected)))
 
 @router.post("/", response_model=MenuItemSingleResponse, status_code=status.HTTP_201_CREATED)
 def create_menu_item(menu_item: MenuItemCreate, db: Session = Depends(get_db)):
@@ -32,8 +50,7 @@ def create_menu_item(menu_item: MenuItemCreate, db: Session = Depends(get_db)):
         menu_item_obj = MenuItem(**menu_item.dict())
         validate_menu_item(menu_item_obj)
 
-        restaurant = restaurant_repo.get(db, id=menu_item.restaurant_id)
-        if not restaurant:
+        if not restaurant_repo.exists(db, id=menu_item.restaurant_id):
             raise NotFoundError(f"Restaurant {menu_item.restaurant_id} not found")
 
         created = menu_item_repo.create(db, obj_in=menu_item)
@@ -63,4 +80,52 @@ def delete_menu_item(menu_item_id: str, db: Session = Depends(get_db)):
     menu_item = menu_item_repo.delete(db, id=menu_item_id)
     if not menu_item:
         raise NotFoundError(f"Menu item {menu_item_id} not found")
-    return SuccessResponse(message="Menu item deleted successfully")
\ No newline at end of file
+    return SuccessResponse(message="Menu item deleted successfully")
+
+# Atomic bulk writes embed inside the same transaction, so an embedding failure
+# rolls the rows back too. Non-atomic writes have already committed the rows by
+# then, so a failed embedding batch is reported against each of its rows next to
+# the write errors and the rows stay without embeddings.
+def _bulk_transaction(db: Session, atomic: bool):
+    return unit_of_work(db) if atomic else nullcontext()
+
+def _embed(db: Session, menu_items: list, indexes: dict, atomic: bool) -> list:
+    if atomic:
+        upsert_menu_item_embeddings(db, menu_items)
+        return []
+    try:
+        upsert_menu_item_embeddings(db, menu_items)
+    except HTTPException as e:
+        return [
+            {"index": indexes.get(menu_item.id), "id": str(menu_item.id), "detail": e.detail}
+            for menu_item in menu_items
+        ]
+    return []
+
+@router.post("/bulk", response_model=MenuItemBulkResponse, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
+def create_menu_items(menu_items: List[MenuItemCreate], atomic: bool = Query(True), db: Session = Depends(get_db)):
+    check_bulk_size(menu_items)
+    with _bulk_transaction(db, atomic):
+        created, errors = menu_item_repo.create_many(db, menu_items, atomic=atomic)
+        # Created rows come back in input order, without the rows that failed.
+        failed = {error["index"] for error in errors}
+        indexes = dict(zip((menu_item.id for menu_item in created), (index for index in range(len(menu_items)) if index not in failed)))
+        errors = sorted(errors + _embed(db, created, indexes, atomic), key=lambda error: error["index"])
+    return bulk_response(MenuItemBulkResponse, serialize_menu_items(db, created), errors, status_code=status.HTTP_201_CREATED)
+
+@router.patch("/bulk", response_model=MenuItemBulkResponse, responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}})
+def update_menu_items(menu_items: List[MenuItemBulkUpdate], atomic: bool = Query(True), db: Session = Depends(get_db)):
+    check_bulk_size(menu_items)
+    with _bulk_transaction(db, atomic):
+        updated, errors = menu_item_repo.update_many(db, menu_items, atomic=atomic)
+        reembed_ids = {menu_item.id for menu_item in menu_items if menu_item.model_fields_set & set(EMBEDDING_FIELDS)}
+        indexes = {menu_item.id: index for index, menu_item in enumerate(menu_items)}
+        reembed = [menu_item for menu_item in updated if menu_item.id in reembed_ids]
+        errors = sorted(errors + _embed(db, reembed, indexes, atomic), key=lambda error: error["index"])
+    return bulk_response(MenuItemBulkResponse, serialize_menu_items(db, updated), errors)
+
+@router.post("/bulk/delete", response_model=MenuItemBulkResponse, responses={404: {"model": ErrorResponse}})
+def delete_menu_items(delete_in: BulkDeleteRequest, atomic: bool = Query(True), db: Session = Depends(get_db)):
+    check_bulk_size(delete_in.ids)
+    deleted, errors = menu_item_repo.delete_many(db, delete_in.ids, atomic=atomic)
+    return bulk_response(MenuItemBulkResponse, serialize_menu_items(db, deleted), errors)
@@ -5,19 +5,23 @@ from app.models.delivery_persons import DeliveryPerson, validate_delivery_person
 from app.models.filters import GetDeliveryPersonFilters
 from app.core.errors import NotFoundError, BadRequestError
 from app.core.responses import SuccessResponse, ErrorResponse
+from app.core.serialization import list_response, parse_fields
 from app.db.session import get_db
-from app.schemas.delivery_persons import DeliveryPersonCreate, DeliveryPersonUpdate, DeliveryPersonListResponse, DeliveryPersonSingleResponse
+from app.schemas.delivery_persons import DeliveryPersonAvailability, DeliveryPersonCreate, DeliveryPersonUpdate, DeliveryPersonListResponse, DeliveryPersonSingleResponse
+from app.utils.dispatch import dispatcher
+from app.utils.locations import known_riders
 
 router = APIRouter(prefix="/delivery_persons", tags=["delivery_persons"])
 delivery_person_repo = DeliveryPersonRepository()
 user_repo = UserRepository()
 
 @router.get("/", response_model=DeliveryPersonListResponse, responses={404: {"model": ErrorResponse}})
-def list_delivery_persons(filters: GetDeliveryPersonFilters = Depends(), db: Session = Depends(get_db)):
-    delivery_persons = delivery_person_repo.get(db, filters=filters)
+def list_delivery_persons(filters: GetDeliveryPersonFilters = Depends(), fields: str = Query(None), db: Session = Depends(get_db)):
+    selected = parse_fields(DeliveryPersonListResponse, fields)
+    delivery_persons = delivery_person_repo.get(db, filters=filters, fields=selected)
     if not delivery_persons:
         raise NotFoundError("No delivery persons found")
-    return DeliveryPersonListResponse(data=delivery_persons)
+    return list_response(DeliveryPersonListResponse, delivery_persons, selected)
 
 @router.post("/", response_model=DeliveryPersonSingleResponse, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
 def create_delivery_person(delivery_person_in: DeliveryPersonCreate, db: Session = Depends(get_db)):
@@ -25,11 +29,11 @@ def create_delivery_person(delivery_person_in: DeliveryPersonCreate, db: Session
         delivery_person_obj = DeliveryPerson(**delivery_person_in.dict())
         validate_delivery_person(delivery_person_obj)
 
-        user = user_repo.get(db, id=delivery_person_in.user_id)
-        if not user:
+        if not user_repo.exists(db, id=delivery_person_in.user_id):
             raise NotFoundError(f"User {delivery_person_in.user_id} not found")
 
         created = delivery_person_repo.create(db, obj_in=delivery_person_in)
+        known_riders.add(created.id)
         return DeliveryPersonSingleResponse(data=created, message="Delivery person created successfully")
     except HTTPException as e:
         raise e
@@ -55,5 +59,16 @@ def delete_delivery_person(delivery_person_id: str, db: Session = Depends(get_db
     delivery_person = delivery_person_repo.get(db, id=delivery_person_id)
     if not delivery_person:
         raise NotFoundError(f"Delivery person {delivery_person_id} not found")
-    delivery_person_repo.delete(db, id=delivery_person_id)
+    delivery_person_repo.delete(db, db_obj=delivery_person)
+    known_riders.discard(delivery_person.id)
     return SuccessResponse(message="Delivery person deleted successfully")
+
+@router.put("/availability", response_model=SuccessResponse, responses={404: {"model": ErrorResponse}})
+def update_delivery_person_availability(availability: DeliveryPersonAvailability, delivery_person_id: str = Query(...), db: Session = Depends(get_db)):
+    if not delivery_person_repo.exists(db, id=delivery_person_id):
+        raise NotFoundError(f"Delivery person {delivery_person_id} not found")
+    if availability.available:
+        dispatcher.set_available(delivery_person_id, availability.latitude, availability.longitude, availability.active_orders)
+    else:
+        dispatcher.set_unavailable(delivery_person_id)
+    return SuccessResponse(message="Availability updated successfully")
@@ -4,9 +4,12 @@ from app.db.session import get_db
 from app.schemas.order_assignments import OrderAssignmentCreate, OrderAssignmentUpdate, OrderAssignmentOut, OrderAssignmentListResponse, OrderAssignmentSingleResponse
 from app.repositories.repository import OrderAssignmentsRepository, OrderRepository, DeliveryPersonRepository
 from app.models.filters import GetOrderAssignmentsFilters
-from app.models.order_assignments import OrderAssignments, validate_order_assignments
+from app.models.order_assignments import OrderAssignments, is_active_assignment, validate_order_assignments
 from app.core.errors import NotFoundError, BadRequestError
 from app.core.responses import SuccessResponse, ErrorResponse
+from app.core.serialization import list_response, parse_fields
+from app.utils.dispatch import dispatcher
+from app.utils.locations import location_store
 
 router = APIRouter(prefix="/order_assignments", tags=["order_assignments"])
 order_assignment_repo = OrderAssignmentsRepository()
@@ -14,11 +17,27 @@ order_repo = OrderRepository()
 delivery_person_repo = DeliveryPersonRepository()
 
 @router.get("/", response_model=OrderAssignmentListResponse)
-def get_order_assignments(filters: GetOrderAssignmentsFilters = Depends(), db: Session = Depends(get_db)):
-    order_assignments = order_assignment_repo.get(db, filters=filters)
+def get_order_assignments(filters: GetOrderAssignmentsFilters = Depends(), fields: str = Query(None), db: Session = Depends(get_db)):
+    selected = parse_fields(OrderAssignmentListResponse, fields)
+    order_assignments = order_assignment_repo.get(db, filters=filters, fields=selected)
     if not order_assignments:
         raise NotFoundError("No order assignments found")
-    return OrderAssignmentListResponse(data=order_assignments)
+    return list_response(OrderAssignmentListResponse, order_assignments, selected)
+
+# Queues the order (if given) and runs a matching round immediately instead of
+# waiting for the background dispatcher.
+@router.post("/dispatch", response_model=OrderAssignmentListResponse, responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}})
+def dispatch_orders(order_id: str = Query(None), db: Session = Depends(get_db)):
+    if order_id:
+        order = order_repo.get(db, id=order_id)
+        if not order:
+            raise NotFoundError(f"Order {order_id} not found")
+        if order_assignment_repo.get_assigned_order_ids(db, [order.id]):
+            raise BadRequestError(f"Order {order_id} is already assigned")
+        if not dispatcher.submit_order(db, order):
+            raise BadRequestError(f"Restaurant {order.restaurant_id} has no location to dispatch from")
+    created = dispatcher.run_round(db)
+    return list_response(OrderAssignmentListResponse, created)
 
 @router.post("/", response_model=OrderAssignmentSingleResponse, status_code=status.HTTP_201_CREATED)
 def create_order_assignment(order_assignment: OrderAssignmentCreate, db: Session = Depends(get_db)):
@@ -26,15 +45,15 @@ def create_order_assignment(order_assignment: OrderAssignmentCreate, db: Session
         order_assignment_obj = OrderAssignments(**order_assignment.dict())
         validate_order_assignments(order_assignment_obj)
 
-        order = order_repo.get(db, id=order_assignment.order_id)
-        if not order:
+        if not order_repo.exists(db, id=order_assignment.order_id):
             raise NotFoundError(f"Order {order_assignment.order_id} not found")
 
-        delivery_person = delivery_person_repo.get(db, id=order_assignment.delivery_person_id)
-        if not delivery_person:
+        if not delivery_person_repo.exists(db, id=order_assignment.delivery_person_id):
             raise NotFoundError(f"Delivery person {order_assignment.delivery_person_id} not found")
 
         created = order_assignment_repo.create(db, obj_in=order_assignment)
+        dispatcher.withdraw(order_assignment.order_id)
+        location_store.forget(order_assignment.order_id)
         return OrderAssignmentSingleResponse(data=created, message="Order assignment created successfully")
     except HTTPException as e:
         raise e
@@ -48,17 +67,24 @@ def update_order_assignment(order_assignment_data: OrderAssignmentUpdate, order_
         raise NotFoundError(f"Order assignment {order_assignment_id} not found")
 
     if order_assignment_data.order_id:
-        order = order_repo.get(db, id=order_assignment_data.order_id)
-        if not order:
+        if not order_repo.exists(db, id=order_assignment_data.order_id):
             raise NotFoundError(f"Order {order_assignment_data.order_id} not found")
 
     if order_assignment_data.delivery_person_id:
-        delivery_person = delivery_person_repo.get(db, id=order_assignment_data.delivery_person_id)
-        if not delivery_person:
+        if not delivery_person_repo.exists(db, id=order_assignment_data.delivery_person_id):
             raise NotFoundError(f"Delivery person {order_assignment_data.delivery_person_id} not found")
     
+    # A delivered, cancelled or handed-over assignment frees a slot on the rider
+    # it was counted against.
+    before = (str(order_assignment.delivery_person_id), is_active_assignment(order_assignment))
+    previous_order_id = order_assignment.order_id
     try:
         updated = order_assignment_repo.update(db, db_obj=order_assignment, obj_in=order_assignment_data)
+        # Tracking caches the rider per order; a hand-over must show the new rider.
+        location_store.forget(previous_order_id)
+        location_store.forget(updated.order_id)
+        if before[1] and (not is_active_assignment(updated) or str(updated.delivery_person_id) != before[0]):
+            dispatcher.complete(before[0])
         return OrderAssignmentSingleResponse(data=updated, message="Order assignment updated successfully")
     except HTTPException as e:
         raise e
@@ -70,5 +96,9 @@ def delete_order_assignment(order_assignment_id: str, db: Session = Depends(get_
     order_assignment = order_assignment_repo.get(db, id=order_assignment_id)
     if not order_assignment:
         raise NotFoundError(f"Order assignment {order_assignment_id} not found")
-    order_assignment_repo.delete(db, id=order_assignment_id)
+    active = is_active_assignment(order_assignment)
+    order_assignment_repo.delete(db, db_obj=order_assignment)
+    location_store.forget(order_assignment.order_id)
+    if active:
+        dispatcher.complete(order_assignment.delivery_person_id)
     return SuccessResponse(message="Order assignment deleted successfully")
\ No newline at end of file
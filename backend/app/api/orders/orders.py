@@ -5,8 +5,13 @@ from app.models.order import Order, validate_order
 from app.models.filters import GetOrderFilters
 from app.core.errors import NotFoundError, BadRequestError
 from app.core.responses import SuccessResponse, ErrorResponse
+from app.core.serialization import list_response, parse_fields
 from app.db.session import get_db
 from app.schemas.orders import OrderCreate, OrderUpdate, OrderListResponse, OrderSingleResponse
+from app.utils.order_items import build_order_items
+from app.utils.pricing import to_cents
+from app.utils.dispatch import dispatcher
+from app.core.config import settings
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 order_repo = OrderRepository()
@@ -14,27 +19,37 @@ user_repo = UserRepository()
 restaurant_repo = RestaurantRepository()
 
 @router.get("/", response_model=OrderListResponse, responses={404: {"model": ErrorResponse}})
-def list_orders(filters: GetOrderFilters = Depends(), db: Session = Depends(get_db)):
-    orders = order_repo.get(db, filters=filters)
+def list_orders(filters: GetOrderFilters = Depends(), fields: str = Query(None), db: Session = Depends(get_db)):
+    selected = parse_fields(OrderListResponse, fields)
+    orders = order_repo.get(db, filters=filters, fields=selected)
     if not orders:
         raise NotFoundError("No orders found")
-    return OrderListResponse(data=orders)
+    return list_response(OrderListResponse, orders, selected)
 
 @router.post("/", response_model=OrderSingleResponse, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
 def create_order(order_in: OrderCreate, db: Session = Depends(get_db)):
     try:
-        order_obj = Order(**order_in.dict())
-        validate_order(order_obj)
-
-        user = user_repo.get(db, id=order_in.user_id)
-        if not user:
+        if not user_repo.exists(db, id=order_in.user_id):
             raise NotFoundError(f"User {order_in.user_id} not found")
 
-        restaurant = restaurant_repo.get(db, id=order_in.restaurant_id)
-        if not restaurant:
+        if not restaurant_repo.exists(db, id=order_in.restaurant_id):
             raise NotFoundError(f"Restaurant {order_in.restaurant_id} not found")
 
-        created = order_repo.create(db, obj_in=order_in)
+        # Totals are always priced server-side from the items; a client total is
+        # only accepted as a check against that price.
+        if not order_in.items:
+            raise BadRequestError("Order items must be provided")
+        items, total_price = build_order_items(db, order_in.restaurant_id, order_in.items)
+        if order_in.total_price is not None and to_cents(order_in.total_price) != to_cents(total_price):
+            raise BadRequestError(f"Total price {order_in.total_price} does not match {total_price}")
+        order_in = order_in.model_copy(update={"total_price": float(total_price)})
+
+        order_obj = Order(**order_in.dict(exclude={"items"}))
+        validate_order(order_obj)
+
+        created = order_repo.create(db, obj_in=order_in, items=items)
+        if settings.DISPATCH_ENABLED:
+            dispatcher.submit_order(db, created)
         return OrderSingleResponse(data=created, message="Order created successfully")
     except HTTPException as e:
         raise e
@@ -60,5 +75,5 @@ def delete_order(order_id: str, db: Session = Depends(get_db)):
     order = order_repo.get(db, id=order_id)
     if not order:
         raise NotFoundError(f"Order {order_id} not found")
-    order_repo.delete(db, id=order_id)
+    order_repo.delete(db, db_obj=order)
     return SuccessResponse(message="Order deleted successfully")
\ No newline at end of file
@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+from uuid import UUID
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.errors import NotFoundError, BadRequestError
+from app.core.responses import SuccessResponse, ErrorResponse
+from app.db.session import get_db
+from app.models.filters import GetOrderAssignmentsFilters
+from app.repositories.repository import OrderAssignmentsRepository
+from app.schemas.rider_locations import RiderLocationBatch, RiderLocationUpdate, RiderLocationSingleResponse
+from app.utils.locations import location_store, record_locations
+
+router = APIRouter(prefix="/tracking", tags=["tracking"])
+order_assignment_repo = OrderAssignmentsRepository()
+
+
+def _location_response(delivery_person_id: UUID) -> RiderLocationSingleResponse:
+    location = location_store.get(delivery_person_id)
+    if location is None:
+        raise NotFoundError(f"No location reported for delivery person {delivery_person_id}")
+    latitude, longitude, recorded_at = location
+    return RiderLocationSingleResponse(data={
+        "delivery_person_id": delivery_person_id,
+        "latitude": latitude,
+        "longitude": longitude,
+        "recorded_at": datetime.fromtimestamp(recorded_at, timezone.utc),
+    })
+
+@router.post("/locations", response_model=SuccessResponse, status_code=status.HTTP_202_ACCEPTED, responses={400: {"model": ErrorResponse}})
+def ingest_locations(batch: RiderLocationBatch):
+    if len(batch.locations) > settings.LOCATION_BATCH_MAX:
+        raise BadRequestError(f"At most {settings.LOCATION_BATCH_MAX} locations can be sent per request")
+    accepted = record_locations(batch.locations)
+    return SuccessResponse(message="Locations accepted", meta={"accepted": accepted, "received": len(batch.locations)})
+
+# Long-lived rider connections send either a single location or {"locations": [...]}.
+# Nothing is sent back unless a message is invalid.
+@router.websocket("/ws")
+async def ingest_locations_ws(websocket: WebSocket):
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive_json()
+            try:
+                if isinstance(message, dict) and "locations" in message:
+                    locations = RiderLocationBatch.model_validate(message).locations[:settings.LOCATION_BATCH_MAX]
+                else:
+                    locations = [RiderLocationUpdate.model_validate(message)]
+            except ValidationError as e:
+                await websocket.send_json({"detail": str(e)})
+                continue
+            record_locations(locations)
+    except WebSocketDisconnect:
+        pass
+
+@router.get("/riders/{delivery_person_id}", response_model=RiderLocationSingleResponse, responses={404: {"model": ErrorResponse}})
+def get_rider_location(delivery_person_id: UUID):
+    return _location_response(delivery_person_id)
+
+@router.get("/orders/{order_id}", response_model=RiderLocationSingleResponse, responses={404: {"model": ErrorResponse}})
+def get_order_location(order_id: UUID, db: Session = Depends(get_db)):
+    delivery_person_id = location_store.rider_for_order(order_id)
+    if delivery_person_id is None:
+        assignments = order_assignment_repo.get(db, filters=GetOrderAssignmentsFilters(order_id=order_id))
+        if not assignments:
+            raise NotFoundError(f"Order {order_id} has not been assigned")
+        delivery_person_id = max(assignments, key=lambda assignment: assignment.assigned_at).delivery_person_id
+        location_store.assign(order_id, delivery_person_id)
+    return _location_response(delivery_person_id)
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.db.session import get_db
+from app.db.unit_of_work import unit_of_work
 from app.schemas.menu_items import MenuItemListResponse
 from app.schemas.queries import QueryCreate
-from app.repositories.repository import QueriesRepository, RecommendationRepository, MenuItemRepository, MenuItemAddonsRepository
+from app.repositories.repository import QueriesRepository, RecommendationRepository, MenuItemRepository
 from app.utils.recommend import resolve_query_gemini_top_k, resolve_query_gemini_threshold
-from app.models.filters import GetMenuItemAddonsFilters
+from app.core.serialization import dumps, encoded_list_response
+from app.utils.catalogue import serialize_menu_items
 from app.schemas.recommendation import RecommendationCreate
 
 router = APIRouter(prefix="/queries", tags=["queries"])
@@ -15,31 +17,26 @@ def resolve_query(query: QueryCreate, db: Session = Depends(get_db)):
     try:
         queries_repo = QueriesRepository()
         menu_item_repo = MenuItemRepository()
-        menu_item_addons_repo = MenuItemAddonsRepository()
         recommendation_repo = RecommendationRepository()
 
-        query_obj = queries_repo.create(db, obj_in=query)
-
         menu_item_ids, context = resolve_query_gemini_top_k(db, user_id=query.user_id, query_text=query.query_text)
         # menu_item_ids, context = resolve_query_gemini_threshold(db, user_id=query.user_id, query_text=query.query_text)
-        menu_items = []
-        for mid in menu_item_ids:
-            menu_item = menu_item_repo.get(db, id=mid)
-            if menu_item:
-                addons_filters = GetMenuItemAddonsFilters(menu_item_id=menu_item.id)
-                addons = menu_item_addons_repo.get(db, filters=addons_filters)
-                menu_item.addons = addons
-                menu_items.append(menu_item)
+        menu_items = menu_item_repo.get_many(db, menu_item_ids)
 
-        for mid in menu_item_ids:
-            recommendation = RecommendationCreate(
-                query_id=query_obj.id,
-                menu_item_id=mid,
-                confidence_score=context['confidences'].get(mid, 1.0),
-                meta={}
-            )
-            recommendation_repo.create(db, obj_in=recommendation)
+        with unit_of_work(db):
+            query_obj = queries_repo.create(db, obj_in=query)
+            recommendations = [
+                RecommendationCreate(
+                    query_id=query_obj.id,
+                    menu_item_id=mid,
+                    confidence_score=context['confidences'].get(mid, 1.0),
+                    meta={}
+                )
+                for mid in menu_item_ids
+            ]
+            if recommendations:
+                recommendation_repo.create_many(db, recommendations)
 
-        return MenuItemListResponse(data=menu_items)
+        return encoded_list_response(MenuItemListResponse, dumps(serialize_menu_items(db, menu_items)))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) 
\ No newline at end of file
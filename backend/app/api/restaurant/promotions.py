@@ -5,8 +5,14 @@ from app.models.promotions import Promotion, validate_promotion
 from app.models.filters import GetPromotionFilters
 from app.core.errors import NotFoundError, BadRequestError
 from app.core.responses import SuccessResponse, ErrorResponse
+from app.core.serialization import bulk_response, list_response, parse_fields
 from app.db.session import get_db
-from app.schemas.promotions import PromotionListResponse, PromotionSingleResponse, PromotionCreate, PromotionUpdate
+from app.schemas.promotions import PromotionListResponse, PromotionSingleResponse, PromotionCreate, PromotionUpdate, PromotionBulkUpdate, PromotionBulkResponse
+from app.schemas.bulk import BulkDeleteRequest
+from app.utils.bulk import check_bulk_size
+from app.utils.promotion_fanout import submit_fanout
+from app.core.config import settings
+from typing import List
 from app.repositories.repository import RestaurantRepository
 
 router = APIRouter(prefix="/promotions", tags=["promotions"])
@@ -14,11 +20,12 @@ promotion_repo = PromotionRepository()
 restaurant_repo = RestaurantRepository()
 
 @router.get("/", response_model=PromotionListResponse, responses={404: {"model": ErrorResponse}})
-def list_promotions(filters: GetPromotionFilters = Depends(), db: Session = Depends(get_db)):
-    promotions = promotion_repo.get(db, filters=filters)
+def list_promotions(filters: GetPromotionFilters = Depends(), fields: str = Query(None), db: Session = Depends(get_db)):
+    selected = parse_fields(PromotionListResponse, fields)
+    promotions = promotion_repo.get(db, filters=filters, fields=selected)
     if not promotions:
         raise NotFoundError("No promotions found")
-    return PromotionListResponse(data=promotions)
+    return list_response(PromotionListResponse, promotions, selected)
 
 @router.post("/", response_model=PromotionSingleResponse, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
 def create_promotion(promotion_in: PromotionCreate, db: Session = Depends(get_db)):
@@ -26,11 +33,12 @@ def create_promotion(promotion_in: PromotionCreate, db: Session = Depends(get_db
         promotion_obj = Promotion(**promotion_in.dict())
         validate_promotion(promotion_obj)
 
-        restaurant = restaurant_repo.get(db, id=promotion_in.restaurant_id)
-        if not restaurant:
+        if not restaurant_repo.exists(db, id=promotion_in.restaurant_id):
             raise NotFoundError(f"Restaurant {promotion_in.restaurant_id} not found")
 
         created = promotion_repo.create(db, obj_in=promotion_in)
+        if settings.PROMOTION_FANOUT_ENABLED:
+            submit_fanout(created.id)
         return PromotionSingleResponse(data=created, message="Promotion created successfully")
     except HTTPException as e:
         raise e
@@ -44,8 +52,7 @@ def update_promotion(promotion_id: str = Query(...), promotion_in: PromotionUpda
         raise NotFoundError(f"Promotion {promotion_id} not found")
     
     if promotion_in.restaurant_id:
-        restaurant = restaurant_repo.get(db, id=promotion_in.restaurant_id)
-        if not restaurant:
+        if not restaurant_repo.exists(db, id=promotion_in.restaurant_id):
             raise NotFoundError(f"Restaurant {promotion_in.restaurant_id} not found")
 
     try:
@@ -61,5 +68,26 @@ def delete_promotion(promotion_id: str, db: Session = Depends(get_db)):
     promotion = promotion_repo.get(db, id=promotion_id)
     if not promotion:
         raise NotFoundError(f"Promotion {promotion_id} not found")
-    promotion_repo.delete(db, id=promotion_id)
+    promotion_repo.delete(db, db_obj=promotion)
     return SuccessResponse(message="Promotion deleted successfully")
+
+@router.post("/bulk", response_model=PromotionBulkResponse, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
+def create_promotions(promotions: List[PromotionCreate], atomic: bool = Query(True), db: Session = Depends(get_db)):
+    check_bulk_size(promotions)
+    created, errors = promotion_repo.create_many(db, promotions, atomic=atomic)
+    if settings.PROMOTION_FANOUT_ENABLED:
+        for promotion in created:
+            submit_fanout(promotion.id)
+    return bulk_response(PromotionBulkResponse, created, errors, status_code=status.HTTP_201_CREATED)
+
+@router.patch("/bulk", response_model=PromotionBulkResponse, responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}})
+def update_promotions(promotions: List[PromotionBulkUpdate], atomic: bool = Query(True), db: Session = Depends(get_db)):
+    check_bulk_size(promotions)
+    updated, errors = promotion_repo.update_many(db, promotions, atomic=atomic)
+    return bulk_response(PromotionBulkResponse, updated, errors)
+
+@router.post("/bulk/delete", response_model=PromotionBulkResponse, responses={404: {"model": ErrorResponse}})
+def delete_promotions(delete_in: BulkDeleteRequest, atomic: bool = Query(True), db: Session = Depends(get_db)):
+    check_bulk_size(delete_in.ids)
+    deleted, errors = promotion_repo.delete_many(db, delete_in.ids, atomic=atomic)
+    return bulk_response(PromotionBulkResponse, deleted, errors)
@@ -1,24 +1,81 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
-from app.repositories.repository import RestaurantRepository
+from uuid import UUID
+from app.repositories.repository import RestaurantRepository, ReviewRepository
 from app.models.restaurant import Restaurant, validate_restaurant
 from app.models.filters import GetRestaurantFilters
 from app.core.errors import NotFoundError, BadRequestError
 from app.core.responses import SuccessResponse, ErrorResponse
 from app.db.session import get_db
-from app.schemas.restaurant import RestaurantListResponse, RestaurantSingleResponse, RestaurantCreate, RestaurantUpdate
+from app.schemas.reviews import ReviewListResponse
+from app.schemas.restaurant import RestaurantListResponse, RestaurantSingleResponse, RestaurantCreate, RestaurantUpdate, NearbyRestaurantListResponse, NearbyRestaurantOut
 from app.repositories.repository import UserRepository
+from app.utils.catalogue import get_all_restaurants
+from app.core.http_cache import cache_headers, etag_matches, not_modified, variant_etag
+from app.core.serialization import dumps, encode_list, encoded_list_response, get_serializer, list_response, parse_fields
+from app.core.config import settings
 
 router = APIRouter(prefix="/restaurant", tags=["restaurant"])
 restaurant_repo = RestaurantRepository()
+review_repo = ReviewRepository()
 user_repo = UserRepository()
 
 @router.get("/", response_model=RestaurantListResponse, responses={404: {"model": ErrorResponse}})
-def list_restaurants(filters: GetRestaurantFilters = Depends(), db: Session = Depends(get_db)):
-    restaurants = restaurant_repo.get(db, filters=filters)
+def list_restaurants(request: Request, filters: GetRestaurantFilters = Depends(), fields: str = Query(None), db: Session = Depends(get_db)):
+    selected = parse_fields(RestaurantListResponse, fields)
+    if not filters.dict(exclude_none=True):
+        cached = get_all_restaurants(db)
+        etag = variant_etag(cached.etag, ",".join(selected or ()))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        if not cached.value:
+            raise NotFoundError("No restaurants found")
+        body = cached.body if selected is None else encode_list(RestaurantListResponse, cached.value, selected)
+        return encoded_list_response(RestaurantListResponse, body, headers=cache_headers(etag))
+
+    restaurants = restaurant_repo.get(db, filters=filters, fields=selected)
     if not restaurants:
         raise NotFoundError("No restaurants found")
-    return RestaurantListResponse(data=restaurants)
+    return list_response(RestaurantListResponse, restaurants, selected)
+
+@router.get("/nearby", response_model=NearbyRestaurantListResponse, responses={404: {"model": ErrorResponse}})
+def list_nearby_restaurants(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(5, gt=0, le=settings.NEARBY_MAX_RADIUS_KM),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    fields: str = Query(None),
+    db: Session = Depends(get_db),
+):
+    selected = parse_fields(NearbyRestaurantListResponse, fields)
+    nearby = restaurant_repo.get_nearby(db, latitude, longitude, radius_km, limit=limit, offset=offset)
+    if not nearby:
+        raise NotFoundError("No restaurants found nearby")
+    serializer = get_serializer(NearbyRestaurantOut, selected, computed=("distance_km",))
+    with_distance = selected is None or "distance_km" in selected
+    data = [
+        serializer(restaurant, distance_km=round(distance, 3)) if with_distance else serializer(restaurant)
+        for restaurant, distance in nearby
+    ]
+    return encoded_list_response(NearbyRestaurantListResponse, dumps(data))
+
+@router.get("/{restaurant_id}/reviews", response_model=ReviewListResponse, responses={404: {"model": ErrorResponse}})
+def list_restaurant_reviews(
+    restaurant_id: UUID,
+    rating: int = Query(None, ge=1, le=5),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    fields: str = Query(None),
+    db: Session = Depends(get_db),
+):
+    selected = parse_fields(ReviewListResponse, fields)
+    if not restaurant_repo.exists(db, id=restaurant_id):
+        raise NotFoundError(f"Restaurant {restaurant_id} not found")
+    reviews = review_repo.get_for_restaurant(db, restaurant_id, rating=rating, limit=limit, offset=offset, fields=selected)
+    if not reviews:
+        raise NotFoundError("No reviews found")
+    return list_response(ReviewListResponse, reviews, selected)
 
 @router.post("/", response_model=RestaurantSingleResponse, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
 def create_restaurant(restaurant_in: RestaurantCreate, db: Session = Depends(get_db)):
@@ -26,8 +83,7 @@ def create_restaurant(restaurant_in: RestaurantCreate, db: Session = Depends(get
         restaurant_obj = Restaurant(**restaurant_in.dict())
         validate_restaurant(restaurant_obj)
 
-        owner = user_repo.get(db, id=restaurant_in.owner_id)
-        if not owner:
+        if not user_repo.exists(db, id=restaurant_in.owner_id):
             raise NotFoundError(f"User {restaurant_in.owner_id} not found")
 
         created = restaurant_repo.create(db, obj_in=restaurant_in)
@@ -44,8 +100,7 @@ def update_restaurant(restaurant_id: str = Query(...), restaurant_in: Restaurant
         raise NotFoundError(f"Restaurant {restaurant_id} not found")
 
     if restaurant_in.owner_id:
-        owner = user_repo.get(db, id=restaurant_in.owner_id)
-        if not owner:
+        if not user_repo.exists(db, id=restaurant_in.owner_id):
             raise NotFoundError(f"User {restaurant_in.owner_id} not found")
 
     try:
@@ -61,6 +116,6 @@ def delete_restaurant(restaurant_id: str, db: Session = Depends(get_db)):
     restaurant = restaurant_repo.get(db, id=restaurant_id)
     if not restaurant:
         raise NotFoundError(f"Restaurant {restaurant_id} not found")
-    restaurant_repo.delete(db, id=restaurant_id)
+    restaurant_repo.delete(db, db_obj=restaurant)
     return SuccessResponse(message="Restaurant deleted successfully")
 
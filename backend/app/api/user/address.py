@@ -4,6 +4,7 @@ from app.repositories.repository import AddressRepository
 from app.models.address import Address
 from app.core.errors import NotFoundError, BadRequestError
 from app.core.responses import SuccessResponse, ErrorResponse
+from app.core.serialization import list_response, parse_fields
 from app.db.session import get_db
 from app.schemas.address import AddressCreate, AddressUpdate, AddressListResponse, AddressSingleResponse
 from uuid import UUID
@@ -15,17 +16,19 @@ address_repo = AddressRepository()
 def get_addresses(
     user_id: UUID = Query(None),
     restaurant_id: UUID = Query(None),
+    fields: str = Query(None),
     db: Session = Depends(get_db)
 ):
+    selected = parse_fields(AddressListResponse, fields)
     filters = {}
     if user_id:
         filters["user_id"] = user_id
     if restaurant_id:
         filters["restaurant_id"] = restaurant_id
-    addresses = address_repo.get(db, filters=filters)
+    addresses = address_repo.get(db, filters=filters, fields=selected)
     if not addresses:
         raise NotFoundError("No addresses found")
-    return AddressListResponse(data=addresses)
+    return list_response(AddressListResponse, addresses, selected)
 
 @router.post("/", response_model=AddressSingleResponse, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
 def create_address(
@@ -84,5 +87,5 @@ def delete_address(
         raise NotFoundError(f"Address {address_id} not found for this user")
     if restaurant_id and address.restaurant_id != restaurant_id:
         raise NotFoundError(f"Address {address_id} not found for this restaurant")
-    address_repo.delete(db, id=address_id)
+    address_repo.delete(db, db_obj=address)
     return SuccessResponse(message=f"Address {address_id} deleted successfully") 
\ No newline at end of file
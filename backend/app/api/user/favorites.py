@@ -4,6 +4,7 @@ from app.repositories.repository import FavoritesRepository
 from app.models.favorites import Favorites, validate_favorites
 from app.core.errors import NotFoundError, BadRequestError
 from app.core.responses import SuccessResponse, ErrorResponse
+from app.core.serialization import list_response, parse_fields
 from app.db.session import get_db
 from app.schemas.favorites import FavoritesCreate, FavoritesUpdate, FavoritesListResponse, FavoritesSingleResponse
 
@@ -11,11 +12,12 @@ router = APIRouter(prefix="/favorites", tags=["favorites"])
 favorites_repo = FavoritesRepository()
 
 @router.get("/", response_model=FavoritesListResponse, responses={404: {"model": ErrorResponse}})
-def list_favorites(db: Session = Depends(get_db)):
-    favorites = favorites_repo.get(db)
+def list_favorites(fields: str = Query(None), db: Session = Depends(get_db)):
+    selected = parse_fields(FavoritesListResponse, fields)
+    favorites = favorites_repo.get(db, fields=selected)
     if not favorites:
         raise NotFoundError("No favorites found")
-    return FavoritesListResponse(data=favorites)
+    return list_response(FavoritesListResponse, favorites, selected)
 
 @router.post("/", response_model=FavoritesSingleResponse, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
 def create_favorite(favorite_in: FavoritesCreate, db: Session = Depends(get_db)):
@@ -4,6 +4,7 @@ from .favorites import router as favorites_router
 from .user_preferences import router as user_preferences_router
 from .reviews import router as reviews_router
 from .address import router as address_router
+from .notification import router as notification_router
 
 
 router = APIRouter()
@@ -13,4 +14,5 @@ router.include_router(user_router)
 router.include_router(favorites_router)
 router.include_router(user_preferences_router)
 router.include_router(reviews_router)
-router.include_router(address_router)
\ No newline at end of file
+router.include_router(address_router)
+router.include_router(notification_router)
\ No newline at end of file
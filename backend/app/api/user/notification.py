@@ -0,0 +1,136 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import List
+from uuid import UUID
+import asyncio
+from app.repositories.repository import NotificationRepository, UserRepository
+from app.models.notification import Notification, validate_notification
+from app.models.filters import GetNotificationFilters
+from app.core.errors import NotFoundError, BadRequestError
+from app.core.responses import SuccessResponse, ErrorResponse
+from app.core.serialization import bulk_response, list_response, parse_fields
+from app.db.session import SessionLocal, get_db
+from app.core.config import settings
+from app.schemas.bulk import BulkDeleteRequest
+from app.schemas.notification import (
+    NotificationCreate,
+    NotificationUpdate,
+    NotificationBulkUpdate,
+    NotificationListResponse,
+    NotificationSingleResponse,
+    NotificationBulkResponse,
+    NotificationSeenRequest,
+)
+from app.utils.bulk import check_bulk_size
+from app.utils.notifications import notification_event, notification_hub, sse_message
+
+router = APIRouter(prefix="/notifications", tags=["notifications"])
+notification_repo = NotificationRepository()
+user_repo = UserRepository()
+
+@router.get("/", response_model=NotificationListResponse, responses={404: {"model": ErrorResponse}})
+def list_notifications(filters: GetNotificationFilters = Depends(), fields: str = Query(None), db: Session = Depends(get_db)):
+    selected = parse_fields(NotificationListResponse, fields)
+    notifications = notification_repo.get(db, filters=filters, fields=selected)
+    if not notifications:
+        raise NotFoundError("No notifications found")
+    return list_response(NotificationListResponse, notifications, selected)
+
+def _unseen_events(user_id: UUID) -> list:
+    db = SessionLocal()
+    try:
+        unseen = notification_repo.get(db, filters=GetNotificationFilters(user_id=user_id, seen=False))
+        return [notification_event(notification) for notification in unseen]
+    finally:
+        db.close()
+
+# Server-sent events: unseen notifications first, then live "notification" and
+# "seen" events for the user from any worker. The subscription is opened before
+# the backlog is read so nothing falls in between; clients dedupe by id.
+@router.get("/stream")
+async def stream_notifications(request: Request, user_id: UUID = Query(...), backlog: bool = Query(True)):
+    subscription = notification_hub.subscribe(user_id)
+    try:
+        unseen = await run_in_threadpool(_unseen_events, user_id) if backlog else []
+    except Exception:
+        notification_hub.unsubscribe(subscription)
+        raise
+
+    async def events():
+        try:
+            for event in unseen:
+                yield sse_message(event)
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), settings.NOTIFICATION_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield sse_message(event)
+        finally:
+            notification_hub.unsubscribe(subscription)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.post("/seen", response_model=SuccessResponse, responses={400: {"model": ErrorResponse}})
+def mark_notifications_seen(seen_in: NotificationSeenRequest, db: Session = Depends(get_db)):
+    if seen_in.ids is not None:
+        check_bulk_size(seen_in.ids)
+    seen = notification_repo.mark_seen(db, seen_in.user_id, ids=seen_in.ids)
+    return SuccessResponse(message="Notifications marked as seen", meta={"updated": len(seen)})
+
+@router.post("/", response_model=NotificationSingleResponse, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
+def create_notification(notification_in: NotificationCreate, db: Session = Depends(get_db)):
+    try:
+        notification_obj = Notification(**notification_in.dict())
+        validate_notification(notification_obj)
+
+        if not user_repo.exists(db, id=notification_in.user_id):
+            raise NotFoundError(f"User {notification_in.user_id} not found")
+
+        created = notification_repo.create(db, obj_in=notification_in)
+        return NotificationSingleResponse(data=created, message="Notification created successfully")
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise BadRequestError(str(e))
+
+@router.patch("/", response_model=NotificationSingleResponse, responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}})
+def update_notification(notification_id: str = Query(...), notification_in: NotificationUpdate = None, db: Session = Depends(get_db)):
+    notification = notification_repo.get(db, id=notification_id)
+    if not notification:
+        raise NotFoundError(f"Notification {notification_id} not found")
+    try:
+        updated = notification_repo.update(db, db_obj=notification, obj_in=notification_in)
+        return NotificationSingleResponse(data=updated, message="Notification updated successfully")
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise BadRequestError(str(e))
+
+@router.delete("/{notification_id}", response_model=SuccessResponse, responses={404: {"model": ErrorResponse}})
+def delete_notification(notification_id: str, db: Session = Depends(get_db)):
+    notification = notification_repo.delete(db, id=notification_id)
+    if not notification:
+        raise NotFoundError(f"Notification {notification_id} not found")
+    return SuccessResponse(message="Notification deleted successfully")
+
+@router.post("/bulk", response_model=NotificationBulkResponse, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
+def create_notifications(notifications: List[NotificationCreate], atomic: bool = Query(True), db: Session = Depends(get_db)):
+    check_bulk_size(notifications)
+    created, errors = notification_repo.create_many(db, notifications, atomic=atomic)
+    return bulk_response(NotificationBulkResponse, created, errors, status_code=status.HTTP_201_CREATED)
+
+@router.patch("/bulk", response_model=NotificationBulkResponse, responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}})
+def update_notifications(notifications: List[NotificationBulkUpdate], atomic: bool = Query(True), db: Session = Depends(get_db)):
+    check_bulk_size(notifications)
+    updated, errors = notification_repo.update_many(db, notifications, atomic=atomic)
+    return bulk_response(NotificationBulkResponse, updated, errors)
+
+@router.post("/bulk/delete", response_model=NotificationBulkResponse, responses={404: {"model": ErrorResponse}})
+def delete_notifications(delete_in: BulkDeleteRequest, atomic: bool = Query(True), db: Session = Depends(get_db)):
+    check_bulk_size(delete_in.ids)
+    deleted, errors = notification_repo.delete_many(db, delete_in.ids, atomic=atomic)
+    return bulk_response(NotificationBulkResponse, deleted, errors)
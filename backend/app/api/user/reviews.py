@@ -2,8 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from app.repositories.repository import ReviewRepository, UserRepository, RestaurantRepository
 from app.models.reviews import Review, validate_review
+from app.models.filters import GetReviewFilters
 from app.core.errors import NotFoundError, BadRequestError
 from app.core.responses import SuccessResponse, ErrorResponse
+from app.core.serialization import list_response, parse_fields
 from app.db.session import get_db
 from app.schemas.reviews import ReviewCreate, ReviewUpdate, ReviewListResponse, ReviewSingleResponse
 
@@ -13,11 +15,12 @@ user_repo = UserRepository()
 restaurant_repo = RestaurantRepository()
 
 @router.get("/", response_model=ReviewListResponse, responses={404: {"model": ErrorResponse}})
-def list_reviews(db: Session = Depends(get_db)):
-    reviews = review_repo.get(db)
+def list_reviews(filters: GetReviewFilters = Depends(), fields: str = Query(None), db: Session = Depends(get_db)):
+    selected = parse_fields(ReviewListResponse, fields)
+    reviews = review_repo.get(db, filters=filters, fields=selected)
     if not reviews:
         raise NotFoundError("No reviews found")
-    return ReviewListResponse(data=reviews)
+    return list_response(ReviewListResponse, reviews, selected)
 
 @router.post("/", response_model=ReviewSingleResponse, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
 def create_review(review_in: ReviewCreate, db: Session = Depends(get_db)):
@@ -25,12 +28,10 @@ def create_review(review_in: ReviewCreate, db: Session = Depends(get_db)):
         review_obj = Review(**review_in.dict())
         validate_review(review_obj)
 
-        user = user_repo.get(db, id=review_in.user_id)
-        if not user:
+        if not user_repo.exists(db, id=review_in.user_id):
             raise NotFoundError(f"User {review_in.user_id} not found")
 
-        restaurant = restaurant_repo.get(db, id=review_in.restaurant_id)
-        if not restaurant:
+        if not restaurant_repo.exists(db, id=review_in.restaurant_id):
             raise NotFoundError(f"Restaurant {review_in.restaurant_id} not found")
 
         created = review_repo.create(db, obj_in=review_in)
@@ -58,5 +59,5 @@ def delete_review(review_id: str, db: Session = Depends(get_db)):
     review = review_repo.get(db, id=review_id)
     if not review:
         raise NotFoundError(f"Review {review_id} not found")
-    review_repo.delete(db, id=review_id)
+    review_repo.delete(db, db_obj=review)
     return SuccessResponse(message=f"Review {review_id} deleted successfully")
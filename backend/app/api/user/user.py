@@ -5,6 +5,7 @@ from app.models.user import User, validate_user
 from app.models.filters import GetUserFilters
 from app.core.errors import NotFoundError, BadRequestError
 from app.core.responses import SuccessResponse, ErrorResponse
+from app.core.serialization import list_response, parse_fields
 from app.db.session import get_db
 from app.schemas.user import UserCreate, UserUpdate, UserListResponse, UserSingleResponse
 
@@ -12,11 +13,12 @@ router = APIRouter(prefix="/users", tags=["users"])
 user_repo = UserRepository()
 
 @router.get("/", response_model=UserListResponse, responses={404: {"model": ErrorResponse}})
-def list_users(filters: GetUserFilters = Depends(), db: Session = Depends(get_db)):
-    users = user_repo.get(db, filters=filters)
+def list_users(filters: GetUserFilters = Depends(), fields: str = Query(None), db: Session = Depends(get_db)):
+    selected = parse_fields(UserListResponse, fields)
+    users = user_repo.get(db, filters=filters, fields=selected)
     if not users:
         raise NotFoundError("No users found")
-    return UserListResponse(data=users)
+    return list_response(UserListResponse, users, selected)
 
 @router.post("/", response_model=UserSingleResponse, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
 def create_user(user_in: UserCreate, db: Session = Depends(get_db)):
@@ -58,5 +60,5 @@ def delete_user(user_id: str, db: Session = Depends(get_db)):
     user = user_repo.get(db, id=user_id)
     if not user:
         raise NotFoundError(f"User {user_id} not found")
-    user_repo.delete(db, id=user_id)
+    user_repo.delete(db, db_obj=user)
     return SuccessResponse(message=f"User {user_id} deleted successfully")
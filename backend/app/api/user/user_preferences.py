@@ -4,6 +4,7 @@ from app.repositories.repository import UserPreferencesRepository
 from app.models.user_preferences import UserPreferences, validate_user_preferences
 from app.core.errors import NotFoundError, BadRequestError
 from app.core.responses import SuccessResponse, ErrorResponse
+from app.core.serialization import list_response, parse_fields
 from app.db.session import get_db
 from app.schemas.user_preferences import (
     UserPreferencesCreate, UserPreferencesUpdate, UserPreferencesListResponse, UserPreferencesSingleResponse
@@ -13,11 +14,12 @@ router = APIRouter(prefix="/user-preferences", tags=["user-preferences"])
 user_preferences_repo = UserPreferencesRepository()
 
 @router.get("/", response_model=UserPreferencesListResponse, responses={404: {"model": ErrorResponse}})
-def list_user_preferences(db: Session = Depends(get_db)):
-    preferences = user_preferences_repo.get(db)
+def list_user_preferences(fields: str = Query(None), db: Session = Depends(get_db)):
+    selected = parse_fields(UserPreferencesListResponse, fields)
+    preferences = user_preferences_repo.get(db, fields=selected)
     if not preferences:
         raise NotFoundError("No user preferences found")
-    return UserPreferencesListResponse(data=preferences)
+    return list_response(UserPreferencesListResponse, preferences, selected)
 
 @router.post("/", response_model=UserPreferencesSingleResponse, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
 def create_user_preferences(preferences_in: UserPreferencesCreate, db: Session = Depends(get_db)):
@@ -6,6 +6,40 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     UPLOADS_DIR: str = "uploads"
     GEMINI_API_KEY: str
+    OCR_MODE: str = "hybrid"
+    OCR_MIN_CONFIDENCE: float = 75.0
+    OCR_WORKERS: int = 2
+    MENU_PAGE_WORKERS: int = 4
+    CATALOGUE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CATALOGUE_CACHE_NOTIFY: bool = False
+    PRICING_CACHE_SIZE: int = 4096
+    MENU_CACHE_MAX_AGE: int = 60
+    MENU_CACHE_STALE_WHILE_REVALIDATE: int = 300
+    BULK_MAX_ROWS: int = 1000
+    EXPORT_BATCH_SIZE: int = 1000
+    NEARBY_MAX_RADIUS_KM: float = 50
+    DISPATCH_ENABLED: bool = False
+    DISPATCH_INTERVAL_SECONDS: float = 5
+    DISPATCH_RADIUS_KM: float = 5
+    DISPATCH_MAX_LOAD: int = 2
+    DISPATCH_LOAD_PENALTY_KM: float = 1.5
+    DISPATCH_CANDIDATES: int = 10
+    TRACK_SAMPLE_SECONDS: float = 30
+    TRACK_SAMPLE_METERS: float = 100
+    TRACK_FLUSH_SECONDS: float = 10
+    TRACK_BUFFER_MAX: int = 100000
+    LOCATION_BATCH_MAX: int = 5000
+    NOTIFICATIONS_NOTIFY: bool = False
+    NOTIFICATION_QUEUE_SIZE: int = 100
+    NOTIFICATION_HEARTBEAT_SECONDS: float = 15
+    PROMOTION_FANOUT_ENABLED: bool = True
+    PROMOTION_FANOUT_CHUNK_SIZE: int = 5000
+    PROMOTION_FANOUT_EVENTS_PER_SECOND: int = 50000
+    POPULARITY_FLUSH_SECONDS: float = 60
+    POPULARITY_NOTIFY: bool = False
+    POPULARITY_WEIGHT: float = 0.03
+    POPULARITY_MAX_BOOST: float = 0.2
+    LEXICAL_SHORT_CIRCUIT_MAX_TERMS: int = 4
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,32 @@
+from fastapi import Request, Response
+import hashlib
+from app.core.config import settings
+
+
+def cache_control() -> str:
+    return f"public, max-age={settings.MENU_CACHE_MAX_AGE}, stale-while-revalidate={settings.MENU_CACHE_STALE_WHILE_REVALIDATE}"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def variant_etag(etag: str, variant: str) -> str:
+    if not variant:
+        return etag
+    return f'{etag[:-1]}-{hashlib.sha256(variant.encode()).hexdigest()[:8]}"'
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": cache_control()}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
+
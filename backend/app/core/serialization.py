@@ -0,0 +1,127 @@
+from decimal import Decimal
+from fastapi import Response
+from operator import attrgetter
+from pydantic import BaseModel
+from types import UnionType
+from typing import Optional, Union, get_args, get_origin
+import orjson
+from app.core.errors import BadRequestError
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value) -> bytes:
+    return orjson.dumps(value, default=_default)
+
+
+def _nested_schema(annotation):
+    origin = get_origin(annotation)
+    if origin in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _nested_schema(args[0]) if len(args) == 1 else (None, False)
+    if origin in (list, tuple, set):
+        schema, _ = _nested_schema(get_args(annotation)[0])
+        return schema, True
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel) and annotation.model_config.get("from_attributes"):
+        return annotation, False
+    return None, False
+
+
+# Turns ORM rows (or already-serialized dicts) straight into JSON-ready dicts for a
+# response schema, skipping per-row Pydantic validation. Field lookups are compiled
+# once per schema and fieldset; nested from_attributes schemas get their own
+# serializer. Computed fields are not read from the row and must be passed in as
+# overrides.
+class RowSerializer:
+    def __init__(self, schema, fields: tuple = None, computed: tuple = ()):
+        self.schema = schema
+        self.fields = fields or tuple(schema.model_fields)
+        self.nested = {}
+        for name in self.fields:
+            nested_schema, many = _nested_schema(schema.model_fields[name].annotation)
+            if nested_schema is not None:
+                self.nested[name] = (get_serializer(nested_schema), many)
+        self._attr_fields = tuple(name for name in self.fields if name not in computed)
+        self._getter = attrgetter(*self._attr_fields) if self._attr_fields else None
+
+    def _values(self, row):
+        if self._getter is None:
+            return ()
+        values = self._getter(row)
+        return values if len(self._attr_fields) > 1 else (values,)
+
+    def __call__(self, row, **overrides) -> dict:
+        if isinstance(row, dict):
+            data = {name: row.get(name) for name in self.fields}
+        else:
+            data = dict(zip(self._attr_fields, self._values(row)))
+        data.update(overrides)
+        for name, (serializer, many) in self.nested.items():
+            value = data.get(name)
+            if value is None:
+                continue
+            data[name] = [serializer(item) for item in value] if many else serializer(value)
+        return data
+
+
+_serializers = {}
+
+
+def get_serializer(schema, fields: tuple = None, computed: tuple = ()) -> RowSerializer:
+    key = (schema, fields, computed)
+    serializer = _serializers.get(key)
+    if serializer is None:
+        serializer = _serializers[key] = RowSerializer(schema, fields=fields, computed=computed)
+    return serializer
+
+
+def _item_schema(response_schema):
+    schema, _ = _nested_schema(response_schema.model_fields["data"].annotation)
+    return schema
+
+
+def parse_fields(response_schema, fields: Optional[str]) -> Optional[tuple]:
+    if not fields:
+        return None
+    schema = _item_schema(response_schema)
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = sorted(requested - set(schema.model_fields))
+    if unknown:
+        raise BadRequestError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(field for field in schema.model_fields if field in requested or field == "id")
+
+
+def encode_list(response_schema, rows, fields: tuple = None) -> bytes:
+    serializer = get_serializer(_item_schema(response_schema), fields)
+    return dumps([serializer(row) for row in rows])
+
+
+def list_body(response_schema, data: bytes) -> bytes:
+    message = response_schema.model_fields["message"].default
+    return b'{"data":' + data + b',"message":' + dumps(message) + b"}"
+
+
+def list_response(response_schema, rows, fields: tuple = None, headers: dict = None) -> Response:
+    return Response(
+        content=list_body(response_schema, encode_list(response_schema, rows, fields)),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def bulk_response(response_schema, rows, errors: list, status_code: int = 200) -> Response:
+    serializer = get_serializer(_item_schema(response_schema))
+    body = {
+        "data": [serializer(row) for row in rows],
+        "errors": errors,
+        "message": response_schema.model_fields["message"].default,
+    }
+    return Response(content=dumps(body), status_code=207 if errors else status_code, media_type="application/json")
+
+
+def encoded_list_response(response_schema, data: bytes, headers: dict = None) -> Response:
+    return Response(content=list_body(response_schema, data), media_type="application/json", headers=headers)
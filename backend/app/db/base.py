@@ -1,3 +1,10 @@
 from sqlalchemy.orm import declarative_base
 
-Base = declarative_base() 
\ No newline at end of file
+
+# Fetch server-generated columns (created_at, updated_at, ...) with RETURNING on
+# INSERT and UPDATE instead of expiring them and reloading with a SELECT.
+class _Base:
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = declarative_base(cls=_Base)
@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from itertools import combinations
+from sqlalchemy import ARRAY, Enum, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+import argparse
+import sys
+import uuid
+from app.db.session import SessionLocal
+from app.models import filters
+from app.repositories import repository
+
+# Every list filter path, as (repository, filterable fields). Run against a migrated
+# database: python -m app.db.explain_check, or as part of the test suite
+# (tests/test_explain_check.py), which skips it when no database is reachable.
+CHECKS = [
+    (repository.UserRepository, filters.GetUserFilters),
+    (repository.OrderRepository, filters.GetOrderFilters),
+    (repository.RestaurantRepository, filters.GetRestaurantFilters),
+    (repository.MenuItemRepository, filters.GetMenuItemFilters),
+    (repository.MenuItemAddonsRepository, filters.GetMenuItemAddonsFilters),
+    (repository.AddonsRepository, filters.GetAddonsFilters),
+    (repository.OrderAssignmentsRepository, filters.GetOrderAssignmentsFilters),
+    (repository.DeliveryPersonRepository, filters.GetDeliveryPersonFilters),
+    (repository.NotificationRepository, filters.GetNotificationFilters),
+    (repository.ReviewRepository, filters.GetReviewFilters),
+    (repository.PromotionRepository, filters.GetPromotionFilters),
+    (repository.PaymentRepository, filters.GetPaymentFilters),
+    (repository.FavoritesRepository, filters.GetFavoritesFilters),
+    (repository.FileRepository, filters.GetFileFilters),
+    (repository.UserPreferencesRepository, filters.GetUserPreferencesFilters),
+    (repository.RecommendationRepository, filters.GetRecommendationFilters),
+    (repository.QueriesRepository, filters.GetQueriesFilters),
+    (repository.MenuItemEmbeddingRepository, filters.GetMenuItemEmbeddingFilters),
+    (repository.AddressRepository, ("user_id", "restaurant_id")),
+]
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _sample_value(column):
+    column_type = column.type
+    if isinstance(column_type, ARRAY):
+        return ["sample"]
+    if isinstance(column_type, Enum):
+        return list(column_type.enum_class)[0] if column_type.enum_class else column_type.enums[0]
+    samples = {
+        uuid.UUID: uuid.uuid4(),
+        str: "sample",
+        int: 1,
+        float: 1.0,
+        Decimal: Decimal("1"),
+        bool: False,
+        datetime: datetime.now(timezone.utc),
+    }
+    return samples[column_type.python_type]
+
+
+def _seq_scans(plan: dict) -> list:
+    scans = [plan["Relation Name"]] if plan.get("Node Type") == "Seq Scan" else []
+    for child in plan.get("Plans", []):
+        scans.extend(_seq_scans(child))
+    return scans
+
+
+def _filter_fields(repo, filter_fields) -> list:
+    if not isinstance(filter_fields, tuple):
+        filter_fields = tuple(filter_fields.model_fields)
+    columns = repo.model.__mapper__.column_attrs
+    return [field for field in filter_fields if field != "id" and field in columns]
+
+
+def run(max_size: int = None) -> list:
+    failures = []
+    db = SessionLocal()
+    try:
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        for repo_class, filter_fields in CHECKS:
+            repo = repo_class()
+            columns = repo.model.__mapper__.column_attrs
+            fields = _filter_fields(repo, filter_fields)
+            for size in range(1, min(max_size or len(fields), len(fields)) + 1):
+                for combination in combinations(fields, size):
+                    values = {field: _sample_value(columns[field].expression) for field in combination}
+                    query = repo.build_query(db, filters=values)
+                    plan = db.execute(Explain(query.statement)).scalar()[0]["Plan"]
+                    scans = _seq_scans(plan)
+                    label = f"{repo.model.__tablename__}({', '.join(combination)})"
+                    if scans:
+                        failures.append(label)
+                        print(f"SEQ SCAN {label}: {', '.join(scans)}")
+                    else:
+                        print(f"ok       {label}")
+    finally:
+        db.rollback()
+        db.close()
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that every list filter combination is served by an index")
+    parser.add_argument("--max-size", type=int, default=None, help="largest filter combination to check")
+    args = parser.parse_args()
+
+    failures = run(args.max_size)
+    if failures:
+        print(f"{len(failures)} filter combination(s) fall back to sequential scans")
+        sys.exit(1)
@@ -0,0 +1,89 @@
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+import logging
+import psycopg2
+import psycopg2.extensions
+import select
+import threading
+import uuid
+from app.core.config import settings
+from app.db.session import engine
+
+# Identifies this process so listeners can skip notifications they published themselves.
+PROCESS_ID = uuid.uuid4().hex
+
+
+def publish(channel: str, payload: str):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+        conn.commit()
+
+
+def publish_many(channel: str, payloads: list):
+    if not payloads:
+        return
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_notify(:channel, :payload)"), [{"channel": channel, "payload": payload} for payload in payloads])
+        conn.commit()
+
+
+class PgListener:
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self._callbacks = {}
+        self._thread = None
+        self._stop = threading.Event()
+
+    def subscribe(self, channel: str, callback):
+        self._callbacks.setdefault(channel, []).append(callback)
+
+    def start(self):
+        if self._thread is not None or not self._callbacks:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pg-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _listen(self):
+        conn = psycopg2.connect(self.dsn)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            for channel in self._callbacks:
+                cursor.execute(f'LISTEN "{channel}"')
+        logging.info(f"Listening for notifications on {', '.join(self._callbacks)}")
+        return conn
+
+    def _run(self):
+        backoff = 1
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._listen()
+                backoff = 1
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 5) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        for callback in self._callbacks.get(notify.channel, []):
+                            try:
+                                callback(notify.payload)
+                            except Exception as e:
+                                logging.error(f"Notification handler for {notify.channel} failed: {e}")
+            except Exception as e:
+                logging.error(f"Notification listener error, reconnecting in {backoff}s: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+listener = PgListener(make_url(settings.DATABASE_URL_NEON).set(drivername="postgresql").render_as_string(hide_password=False))
@@ -8,6 +8,7 @@ class Tables:
     FAVORITES = 'favorites'
     PROMOTIONS = 'promotions'
     ORDERS = 'orders'
+    ORDER_ITEMS = 'order_items'
     QUERIES = 'queries'
     DELIVERY_PERSONS = 'delivery_persons'
     ORDER_ASSIGNMENTS = 'order_assignments'
@@ -19,3 +20,6 @@ class Tables:
     PAYMENTS = 'payments'
     NOTIFICATIONS = 'notifications'
     ADDRESSES = 'addresses'
+    RIDER_LOCATIONS = 'rider_locations'
+    RESTAURANT_RATING_SUMMARIES = 'restaurant_rating_summaries'
+    MENU_ITEM_POPULARITY = 'menu_item_popularity'
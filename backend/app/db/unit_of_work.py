@@ -0,0 +1,61 @@
+from contextlib import contextmanager
+from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.errors import DatabaseIntegrityError, DatabaseOperationalError, DatabaseError
+
+# Repositories only flush while a unit of work is open on the session; the single
+# commit happens when the outermost block exits. Hooks such as cache invalidation
+# are queued until that commit so readers never see state that was rolled back.
+
+
+def in_unit_of_work(db: Session) -> bool:
+    return db.info.get("unit_of_work", 0) > 0
+
+
+def after_commit(db: Session, callback):
+    if in_unit_of_work(db):
+        db.info.setdefault("after_commit", []).append(callback)
+    else:
+        callback()
+
+
+def translate_error(e: SQLAlchemyError):
+    if isinstance(e, IntegrityError):
+        return DatabaseIntegrityError(str(e))
+    if isinstance(e, OperationalError):
+        return DatabaseOperationalError(str(e))
+    return DatabaseError(str(e))
+
+
+def commit(db: Session):
+    try:
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise translate_error(e)
+
+
+@contextmanager
+def unit_of_work(db: Session):
+    if in_unit_of_work(db):
+        yield db
+        return
+
+    db.info["unit_of_work"] = 1
+    db.info["after_commit"] = []
+    try:
+        yield db
+        db.info["unit_of_work"] = 0
+        commit(db)
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise translate_error(e)
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        db.info["unit_of_work"] = 0
+        callbacks = db.info.pop("after_commit", [])
+
+    for callback in callbacks:
+        callback()
@@ -5,6 +5,16 @@ from app.api.menu.handler import router as menu_router
 from app.api.orders.handler import router as orders_router
 from app.api.files.handler import router as file_router
 from app.api.queries.handler import router as queries_router
+from app.api.exports.handler import router as exports_router
+from app.utils.tesseract import shutdown_ocr_pool
+from app.utils.promotion_fanout import shutdown_fanout_pool
+from app.utils.catalogue import register_catalogue_listener
+from app.utils.notifications import register_notification_listener
+from app.db.notify import listener
+from app.utils.dispatch import dispatcher
+from app.utils.locations import location_store
+from app.utils.popularity import popularity, register_popularity_listener
+from app.core.config import settings
 
 app = FastAPI()
 
@@ -15,11 +25,32 @@ ROUTERS = [
     orders_router,
     file_router,
     queries_router,
+    exports_router,
 ]
 
 for router in ROUTERS:
     app.include_router(router, prefix="/v1/api")
 
+@app.on_event("startup")
+def on_startup():
+    register_catalogue_listener()
+    register_notification_listener()
+    register_popularity_listener()
+    listener.start()
+    location_store.start()
+    popularity.start()
+    if settings.DISPATCH_ENABLED:
+        dispatcher.start()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    dispatcher.stop()
+    location_store.stop()
+    popularity.stop()
+    listener.stop()
+    shutdown_ocr_pool()
+    shutdown_fanout_pool()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=4001, reload=True)
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, JSON, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 from app.db.tables import Tables
 from app.core.errors import errors
@@ -11,10 +11,10 @@ class Addons(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
-    options = Column(JSON, nullable=False)
+    options = Column(JSONB, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, nullable=True, default={})
+    meta = Column(JSONB, nullable=True, default={})
 
 
 def validate_addons(addons: Addons):
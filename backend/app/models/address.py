@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, Double, Text, JSON, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, Double, Text, DateTime
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
@@ -24,7 +24,7 @@ class Address(Base):
     longitude = Column(Double, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, default=dict)
+    meta = Column(JSONB, default=dict)
 
     user = relationship('User', back_populates='addresses', foreign_keys=[user_id])
     restaurant = relationship('Restaurant', back_populates='addresses', foreign_keys=[restaurant_id]) 
\ No newline at end of file
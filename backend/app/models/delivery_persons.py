@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Enum, DateTime, JSON, func, UniqueConstraint, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Enum, DateTime, func, UniqueConstraint, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 from .enums import VehicleType
 import uuid
@@ -19,7 +19,7 @@ class DeliveryPerson(Base):
     vehicle_type = Column(Enum(VehicleType, name='vehicle_type'), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, nullable=True, default={})
+    meta = Column(JSONB, nullable=True, default={})
 
 
 def validate_delivery_person(delivery_person: DeliveryPerson):
@@ -28,3 +28,7 @@ class SpiceTolerance(str, Enum):
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, ForeignKey, DateTime, JSON, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, ForeignKey, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 import uuid
 from app.db.tables import Tables
@@ -13,7 +13,7 @@ class Favorites(Base):
     menu_item_id = Column(UUID(as_uuid=True), ForeignKey('menu_items.id'), primary_key=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, nullable=True, default={})
+    meta = Column(JSONB, nullable=True, default={})
 
 
 def validate_favorites(favorites: Favorites):
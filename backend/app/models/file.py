@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Enum, DateTime, JSON, func, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Enum, DateTime, func, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 import uuid
 from .enums import FileTypes
@@ -16,7 +16,7 @@ class File(Base):
     uploaded_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, nullable=True, default={})
+    meta = Column(JSONB, nullable=True, default={})
 
 
 def validate_file(file: File):
@@ -31,6 +31,8 @@ class GetMenuItemFilters(BaseModel):
     name: Optional[str] = None
     tags: Optional[List[str]] = None
     allergens: Optional[List[str]] = None
+    cuisine: Optional[str] = None
+    spice_level: Optional[str] = None
 
 # ** OrderAssignments Filters **
 class GetOrderAssignmentsFilters(BaseModel):
@@ -124,6 +126,7 @@ class GetMenuItemAddonsFilters(BaseModel):
 # ** Addons Filters **
 class GetAddonsFilters(BaseModel):
     id: Optional[UUID] = None
+    restaurant_id: Optional[UUID] = None
     name: Optional[str] = None
     price: Optional[Decimal] = None
 
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, ForeignKey, DateTime, JSON, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, ForeignKey, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 from app.db.tables import Tables
 from app.core.errors import errors
@@ -14,7 +14,7 @@ class MenuItemAddons(Base):
     addon_id = Column(UUID(as_uuid=True), ForeignKey('addons.id'), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, nullable=True, default={})
+    meta = Column(JSONB, nullable=True, default={})
 
 
 def validate_menu_item_addons(menu_item_addons: MenuItemAddons):
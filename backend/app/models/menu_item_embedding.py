@@ -1,6 +1,6 @@
-from sqlalchemy import Column, ForeignKey, DateTime, JSON, func
+from sqlalchemy import Column, ForeignKey, DateTime, func
 from pgvector.sqlalchemy import Vector
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 from app.db.tables import Tables
 from app.core.errors import errors
@@ -13,7 +13,7 @@ class MenuItemEmbedding(Base):
     embedding = Column(Vector(768), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, nullable=True, default={})
+    meta = Column(JSONB, nullable=True, default={})
 
 
 def validate_menu_item_embedding(menu_item_embedding: MenuItemEmbedding):
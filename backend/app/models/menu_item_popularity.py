@@ -0,0 +1,15 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+from app.db.tables import Tables
+
+
+# Order and favorite counts per menu item in fixed time buckets; workers add
+# their own deltas and reload the last week on startup.
+class MenuItemPopularity(Base):
+    __tablename__ = Tables.MENU_ITEM_POPULARITY
+
+    menu_item_id = Column(UUID(as_uuid=True), ForeignKey('menu_items.id', ondelete='CASCADE'), primary_key=True)
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    orders = Column(Integer, nullable=False, default=0)
+    favorites = Column(Integer, nullable=False, default=0)
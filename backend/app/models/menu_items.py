@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, DateTime, ARRAY, JSON, func, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, ARRAY, Text, func, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, column_property, deferred
 from app.db.base import Base
 import uuid
 from app.db.tables import Tables
@@ -14,12 +14,19 @@ class MenuItem(Base):
     restaurant_id = Column(UUID(as_uuid=True), ForeignKey('restaurants.id'), nullable=False)
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
-    options = Column(JSON, nullable=True)
-    tags = Column(ARRAY(String), nullable=True)
-    allergens = Column(ARRAY(String), nullable=True)
+    options = Column(JSONB, nullable=True)
+    tags = Column(ARRAY(Text), nullable=True)
+    allergens = Column(ARRAY(Text), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, nullable=True, default={})
+    meta = Column(JSONB, nullable=True, default={})
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    # Maintained by trg_menu_items_search_vector; only read by search queries.
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
+    # Hot meta keys, backed by expression indexes so filters on them run in SQL.
+    cuisine = column_property(meta["cuisine"].astext, deferred=True)
+    spice_level = column_property(meta["spice_level"].astext, deferred=True)
 
     addons = relationship("MenuItemAddons", backref="menu_item", lazy="dynamic")
 
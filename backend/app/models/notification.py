@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, Boolean, JSON, func, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Boolean, func, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 import uuid
 from app.db.tables import Tables
@@ -16,7 +16,7 @@ class Notification(Base):
     seen = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, nullable=True, default={})
+    meta = Column(JSONB, nullable=True, default={})
 
 
 def validate_notification(notification: Notification):
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, DateTime, JSON, func, ForeignKey, Numeric
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, func, ForeignKey, Numeric
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
 from app.db.base import Base
 import uuid
 from app.db.tables import Tables
@@ -15,7 +16,9 @@ class Order(Base):
     total_price = Column(Numeric(10, 2), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, nullable=True, default={})
+    meta = Column(JSONB, nullable=True, default={})
+
+    items = relationship("OrderItem", lazy="selectin", passive_deletes=True)
 
 
 def validate_order(order: Order):
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, ForeignKey, DateTime, JSON, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, ForeignKey, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 import uuid
 from app.db.tables import Tables
 from app.core.errors import errors
 
+# Assignments whose meta status is one of these no longer count towards the
+# rider's load.
+FINISHED_STATUSES = ("delivered", "cancelled")
+
 
 class OrderAssignments(Base):
     __tablename__ = Tables.ORDER_ASSIGNMENTS
@@ -14,7 +18,7 @@ class OrderAssignments(Base):
     delivery_person_id = Column(UUID(as_uuid=True), ForeignKey('delivery_persons.id'), nullable=False)
     assigned_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, nullable=True, default={})
+    meta = Column(JSONB, nullable=True, default={})
 
 
 def validate_order_assignments(order_assignments: OrderAssignments):
@@ -25,3 +29,7 @@ def validate_order_assignments(order_assignments: OrderAssignments):
         raise errors.BadRequestError("Delivery person ID must be provided")
 
     return order_assignments
+
+
+def is_active_assignment(order_assignments: OrderAssignments) -> bool:
+    return (order_assignments.meta or {}).get("status") not in FINISHED_STATUSES
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, Integer, DateTime, func, ForeignKey, Numeric
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from app.db.base import Base
+import uuid
+from app.db.tables import Tables
+from app.core.errors import errors
+
+
+class OrderItem(Base):
+    __tablename__ = Tables.ORDER_ITEMS
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    order_id = Column(UUID(as_uuid=True), ForeignKey('orders.id', ondelete='CASCADE'), nullable=False)
+    menu_item_id = Column(UUID(as_uuid=True), ForeignKey('menu_items.id'), nullable=False)
+    name = Column(String, nullable=False)
+    option_name = Column(String, nullable=True)
+    quantity = Column(Integer, nullable=False, default=1)
+    unit_price = Column(Numeric(10, 2), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    meta = Column(JSONB, nullable=True, default={})
+
+
+def validate_order_item(order_item: OrderItem):
+    if order_item.menu_item_id is None:
+        raise errors.BadRequestError("Menu item ID must be provided")
+
+    if order_item.quantity is None or order_item.quantity <= 0:
+        raise errors.BadRequestError("Quantity must be greater than 0")
+
+    return order_item
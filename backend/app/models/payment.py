@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Enum, DateTime, JSON, func, ForeignKey, Numeric
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Enum, DateTime, func, ForeignKey, Numeric
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 import uuid
 from .enums import PaymentStatus
@@ -16,7 +16,7 @@ class Payment(Base):
     status = Column(Enum(PaymentStatus, name='payment_status'), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, nullable=True, default={})
+    meta = Column(JSONB, nullable=True, default={})
 
 
 def validate_payment(payment: Payment):
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, JSON, func, ForeignKey, Numeric
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, func, ForeignKey, Numeric
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 import uuid
 from app.db.tables import Tables
@@ -14,11 +14,11 @@ class Promotion(Base):
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
     discount_percent = Column(Numeric(5, 2), nullable=False)
-    valid_from = Column(DateTime, nullable=False)
-    valid_to = Column(DateTime, nullable=False)
+    valid_from = Column(DateTime(timezone=True), nullable=False)
+    valid_to = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, nullable=True, default={})
+    meta = Column(JSONB, nullable=True, default={})
 
 
 def validate_promotion(promotion: Promotion):
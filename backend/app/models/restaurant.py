@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, JSON, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 import uuid
 from app.core.errors import errors
@@ -14,9 +14,10 @@ class Restaurant(Base):
     owner_id = Column(UUID(as_uuid=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, default=dict)
+    meta = Column(JSONB, default=dict)
 
     addresses = relationship('Address', back_populates='restaurant', cascade='all, delete-orphan')
+    rating = relationship('RestaurantRatingSummary', uselist=False, lazy='selectin', viewonly=True)
 
 
 def validate_restaurant(restaurant: Restaurant):
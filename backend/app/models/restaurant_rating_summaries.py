@@ -0,0 +1,30 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+from app.db.tables import Tables
+
+RATINGS = (1, 2, 3, 4, 5)
+
+
+# One row per reviewed restaurant, adjusted by ReviewRepository in the same
+# transaction as each review write.
+class RestaurantRatingSummary(Base):
+    __tablename__ = Tables.RESTAURANT_RATING_SUMMARIES
+
+    restaurant_id = Column(UUID(as_uuid=True), ForeignKey('restaurants.id', ondelete='CASCADE'), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(BigInteger, nullable=False, default=0)
+    rating_1 = Column(Integer, nullable=False, default=0)
+    rating_2 = Column(Integer, nullable=False, default=0)
+    rating_3 = Column(Integer, nullable=False, default=0)
+    rating_4 = Column(Integer, nullable=False, default=0)
+    rating_5 = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def average_rating(self):
+        return round(self.rating_sum / self.review_count, 2) if self.review_count else None
+
+    @property
+    def histogram(self) -> dict:
+        return {str(rating): getattr(self, f"rating_{rating}") for rating in RATINGS}
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, DateTime, Double, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+import uuid
+from app.db.tables import Tables
+
+
+class RiderLocation(Base):
+    __tablename__ = Tables.RIDER_LOCATIONS
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    delivery_person_id = Column(UUID(as_uuid=True), ForeignKey('delivery_persons.id', ondelete='CASCADE'), nullable=False)
+    latitude = Column(Double, nullable=False)
+    longitude = Column(Double, nullable=False)
+    recorded_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Enum, DateTime, JSON, func, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Enum, DateTime, func, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 from .enums import AuthProvider
 import uuid
@@ -15,10 +15,10 @@ class User(Base):
     name = Column(String, nullable=False)
     email = Column(String, nullable=False, unique=True)
     provider = Column(Enum(AuthProvider, name='auth_provider'), nullable=False)
-    session_location = Column(JSON, nullable=True, default={})
+    session_location = Column(JSONB, nullable=True, default={})
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, nullable=True, default={})
+    meta = Column(JSONB, nullable=True, default={})
 
     addresses = relationship('Address', back_populates='user', cascade='all, delete-orphan')
 
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, ForeignKey, DateTime, JSON, func, Enum, ARRAY, String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, ForeignKey, DateTime, func, Enum, ARRAY, Text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 from .enums import SpiceTolerance
 from app.db.tables import Tables
@@ -10,13 +10,13 @@ class UserPreferences(Base):
     __tablename__ = Tables.USER_PREFERENCES
 
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), primary_key=True, nullable=False)
-    preferred_cuisines = Column(ARRAY(String), nullable=False)
-    dietary_restrictions = Column(ARRAY(String), nullable=False)
+    preferred_cuisines = Column(ARRAY(Text), nullable=False)
+    dietary_restrictions = Column(ARRAY(Text), nullable=False)
     spice_tolerance = Column(Enum(SpiceTolerance), nullable=False)
-    allergies = Column(ARRAY(String), nullable=False)
+    allergies = Column(ARRAY(Text), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    meta = Column(JSON, nullable=True, default={})
+    meta = Column(JSONB, nullable=True, default={})
 
 
 def validate_user_preferences(user_preferences: UserPreferences):
@@ -1,8 +1,12 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import ARRAY, cast, delete, insert, literal, select, union_all, update
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.util import identity_key
 from typing import Any, Optional, TypeVar, Generic
 from pydantic import BaseModel
 from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
-from app.core.errors import DatabaseIntegrityError, DatabaseOperationalError, DatabaseError
+from app.core.errors import DatabaseIntegrityError, DatabaseOperationalError, DatabaseError, NotFoundError
+from app.db.unit_of_work import after_commit, commit, in_unit_of_work, translate_error
+import uuid
 
 T = TypeVar('T')
 
@@ -10,10 +14,26 @@ class BaseRepository(Generic[T]):
     def __init__(self, model):
         self.model = model
 
-    def get(self, db: Session, id: Any = None, filters: Optional[BaseModel] = None) -> Optional[T]:
-        query = db.query(self.model)
-        if id is not None:
-            return query.get(id)
+    def _query(self, db: Session):
+        return db.query(self.model)
+
+    def _after_write(self, db: Session, obj: Any):
+        pass
+
+    # Sparse fieldsets select only the requested columns as plain rows, which also
+    # skips the identity map. When relationships are requested too, entities are
+    # loaded with just those columns so the relationships can still be resolved.
+    def _project(self, query, fields):
+        mapper = self.model.__mapper__
+        columns = [getattr(self.model, field) for field in fields if field in mapper.column_attrs]
+        if any(field in mapper.relationships for field in fields):
+            return query.options(load_only(*columns))
+        return query.with_entities(*columns)
+
+    def build_query(self, db: Session, filters: Optional[BaseModel] = None, fields: Optional[tuple] = None):
+        query = self._query(db)
+        if fields:
+            query = self._project(query, fields)
         if filters:
             if hasattr(filters, 'dict'):
                 items = filters.dict(exclude_unset=True).items()
@@ -22,28 +42,82 @@ class BaseRepository(Generic[T]):
             for field, value in items:
                 if value is not None:
                     column = getattr(self.model, field)
-                    if isinstance(value, (list, tuple)):
+                    if isinstance(column.type, ARRAY):
+                        # Bind with the column's element type; Postgres has no
+                        # text[] && character varying[] operator.
+                        query = query.filter(column.op("&&")(cast(list(value), column.type)))
+                    elif isinstance(value, (list, tuple)):
                         query = query.filter(column.in_(value))
                     else:
                         query = query.filter(column == value)
-            return query.all()
-        return query.all()
+        return query
+
+    def _coerce(self, column, value):
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return value
+        if python_type is uuid.UUID and not isinstance(value, uuid.UUID):
+            return uuid.UUID(str(value))
+        return value
+
+    # Primary keys arrive as strings from path and query params. Coercing them to
+    # the column type lets lookups hit rows already in the session's identity map;
+    # a key that can't be coerced can't match any row.
+    def _identity(self, id: Any):
+        primary_key = self.model.__mapper__.primary_key
+        try:
+            if isinstance(id, dict):
+                return {column.key: self._coerce(column, id[column.key]) for column in primary_key}
+            return self._coerce(primary_key[0], id)
+        except (KeyError, ValueError):
+            return None
+
+    def _identity_key(self, identity):
+        if isinstance(identity, dict):
+            identity = tuple(identity[column.key] for column in self.model.__mapper__.primary_key)
+        return identity_key(self.model, identity)
+
+    def get(self, db: Session, id: Any = None, filters: Optional[BaseModel] = None, fields: Optional[tuple] = None) -> Optional[T]:
+        if id is not None:
+            identity = self._identity(id)
+            return db.get(self.model, identity) if identity is not None else None
+        return self.build_query(db, filters=filters, fields=fields).all()
+
+    def get_many(self, db: Session, ids: list) -> list:
+        identities = [identity for identity in map(self._identity, ids) if identity is not None]
+        found = {}
+        for identity in identities:
+            obj = db.identity_map.get(self._identity_key(identity))
+            if obj is not None:
+                found[identity] = obj
+        missing = [identity for identity in dict.fromkeys(identities) if identity not in found]
+        if missing:
+            column = self.model.__mapper__.primary_key[0]
+            for obj in db.query(self.model).filter(column.in_(missing)):
+                found[getattr(obj, column.key)] = obj
+        return [found[identity] for identity in identities if identity in found]
+
+    def exists(self, db: Session, id: Any = None, filters: Optional[BaseModel] = None) -> bool:
+        if id is None:
+            query = self.build_query(db, filters=filters)
+        else:
+            identity = self._identity(id)
+            if identity is None:
+                return False
+            if self._identity_key(identity) in db.identity_map:
+                return True
+            if isinstance(identity, dict):
+                query = db.query(self.model).filter_by(**identity)
+            else:
+                query = db.query(self.model).filter(self.model.__mapper__.primary_key[0] == identity)
+        return db.query(query.exists()).scalar()
 
     def create(self, db: Session, obj_in: Any) -> T:
         db_obj = self.model(**obj_in.dict())
         db.add(db_obj)
-        try:
-            db.commit()
-            db.refresh(db_obj)
-        except IntegrityError as e:
-            db.rollback()
-            raise DatabaseIntegrityError(str(e))
-        except OperationalError as e:
-            db.rollback()
-            raise DatabaseOperationalError(str(e))
-        except SQLAlchemyError as e:
-            db.rollback()
-            raise DatabaseError(str(e))
+        self._save(db)
+        after_commit(db, lambda: self._after_write(db, db_obj))
         return db_obj
 
     def update(self, db: Session, db_obj: T, obj_in: Any) -> T:
@@ -53,9 +127,53 @@ class BaseRepository(Generic[T]):
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db.add(db_obj)
+        self._save(db)
+        after_commit(db, lambda: self._after_write(db, db_obj))
+        return db_obj
+
+    def delete(self, db: Session, id: Any = None, db_obj: Optional[T] = None) -> Optional[T]:
+        obj = db_obj if db_obj is not None else self.get(db, id=id)
+        if obj:
+            db.delete(obj)
+            self._save(db)
+            after_commit(db, lambda: self._after_write(db, obj))
+        return obj
+
+    # Server defaults come back through RETURNING (eager_defaults on Base), so a
+    # write is a single round trip with no follow-up refresh. Inside a unit of
+    # work the write is only flushed and the caller's block commits once.
+    def _save(self, db: Session):
+        if not in_unit_of_work(db):
+            return commit(db)
         try:
-            db.commit()
-            db.refresh(db_obj)
+            db.flush()
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise translate_error(e)
+
+    # Bulk writes run as one multi-row statement. In atomic mode any failure aborts
+    # the whole batch; otherwise the batch is tried under a savepoint first and, if
+    # that fails, replayed row by row so only the offending rows are reported.
+    def _write_rows(self, db: Session, write, rows: list, atomic: bool):
+        if atomic:
+            return write(rows), []
+        try:
+            with db.begin_nested():
+                return write(rows), []
+        except SQLAlchemyError:
+            pass
+        results, errors = [], []
+        for index, row in enumerate(rows):
+            try:
+                with db.begin_nested():
+                    results.extend(write([row]))
+            except SQLAlchemyError as e:
+                errors.append({"index": index, "id": row.get("id") if isinstance(row, dict) else row, "detail": str(getattr(e, "orig", None) or e)})
+        return results, errors
+
+    def _run_bulk(self, db: Session, write, rows: list, atomic: bool, ids: list = None):
+        try:
+            results, errors = self._write_rows(db, write, rows, atomic)
         except IntegrityError as e:
             db.rollback()
             raise DatabaseIntegrityError(str(e))
@@ -65,21 +183,60 @@ class BaseRepository(Generic[T]):
         except SQLAlchemyError as e:
             db.rollback()
             raise DatabaseError(str(e))
-        return db_obj
 
-    def delete(self, db: Session, id: Any) -> Optional[T]:
-        obj = db.query(self.model).get(id)
-        if obj:
-            db.delete(obj)
-            try:
-                db.commit()
-            except IntegrityError as e:
-                db.rollback()
-                raise DatabaseIntegrityError(str(e))
-            except OperationalError as e:
+        if ids is not None:
+            found = {obj.id for obj in results}
+            failed = {error["id"] for error in errors}
+            missing = [(index, id) for index, id in enumerate(ids) if id not in found and id not in failed]
+            if missing and atomic:
                 db.rollback()
-                raise DatabaseOperationalError(str(e))
-            except SQLAlchemyError as e:
-                db.rollback()
-                raise DatabaseError(str(e))
-        return obj
+                raise NotFoundError(f"{self.model.__tablename__} not found: {', '.join(str(id) for _, id in missing)}")
+            errors.extend({"index": index, "id": id, "detail": "Not found"} for index, id in missing)
+
+        self._save(db)
+
+        def written():
+            for obj in results:
+                self._after_write(db, obj)
+        after_commit(db, written)
+        return results, sorted(errors, key=lambda error: error["index"])
+
+    def create_many(self, db: Session, objs_in: list, atomic: bool = True):
+        rows = [obj_in.dict() for obj_in in objs_in]
+        def write(batch):
+            return db.scalars(insert(self.model).returning(self.model), batch).all()
+        return self._run_bulk(db, write, rows, atomic)
+
+    def _update_rows(self, rows: list):
+        table = self.model.__table__
+        groups = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(key for key in row if key != "id")), []).append(row)
+        statements = []
+        for keys, group in groups.items():
+            if not keys:
+                statements.append(select(self.model).where(self.model.id.in_([row["id"] for row in group])))
+                continue
+            columns = ("id",) + keys
+            data = union_all(*[
+                select(*[cast(literal(row[key], table.c[key].type), table.c[key].type).label(key) for key in columns])
+                for row in group
+            ]).subquery("data")
+            statements.append(
+                update(self.model)
+                .where(self.model.id == data.c.id)
+                .values({key: data.c[key] for key in keys})
+                .returning(self.model)
+            )
+        return statements
+
+    def update_many(self, db: Session, objs_in: list, atomic: bool = True):
+        rows = [obj_in.dict(exclude_unset=True) | {"id": obj_in.id} for obj_in in objs_in]
+        def write(batch):
+            return [obj for statement in self._update_rows(batch) for obj in db.scalars(statement).all()]
+        return self._run_bulk(db, write, rows, atomic, ids=[row["id"] for row in rows])
+
+    def delete_many(self, db: Session, ids: list, atomic: bool = True):
+        def write(batch):
+            return db.scalars(delete(self.model).where(self.model.id.in_(batch)).returning(self.model)).all()
+        return self._run_bulk(db, write, list(ids), atomic, ids=list(ids))
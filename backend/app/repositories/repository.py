@@ -1,6 +1,7 @@
 from app.repositories.base import BaseRepository
 from app.models.user import User
 from app.models.order import Order
+from app.models.order_items import OrderItem
 from app.models.restaurant import Restaurant
 from app.models.reviews import Review
 from app.models.payment import Payment
@@ -9,7 +10,7 @@ from app.models.menu_items import MenuItem
 from app.models.menu_item_addons import MenuItemAddons
 from app.models.menu_item_embedding import MenuItemEmbedding
 from app.models.notification import Notification
-from app.models.order_assignments import OrderAssignments
+from app.models.order_assignments import FINISHED_STATUSES, OrderAssignments
 from app.models.promotions import Promotion
 from app.models.queries import Queries
 from app.models.recommendation import Recommendation
@@ -18,11 +19,45 @@ from app.models.addons import Addons
 from app.models.delivery_persons import DeliveryPerson
 from app.models.user_preferences import UserPreferences
 from app.models.address import Address
-from sqlalchemy import text
+from app.models.rider_locations import RiderLocation
+from app.models.restaurant_rating_summaries import RATINGS, RestaurantRatingSummary
+from app.utils.catalogue import invalidate_for, invalidate_previous_restaurant
+from app.utils.notifications import publish_notifications, publish_seen
+from app.utils.popularity import popularity
+from datetime import datetime, timezone
+from sqlalchemy import func, insert, or_, select, text, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import SQLAlchemyError
+from app.db.unit_of_work import after_commit, translate_error, unit_of_work
 from sqlalchemy.orm import Session
+import uuid
 
 
 
+class CatalogueRepository(BaseRepository):
+    def _after_write(self, db: Session, obj):
+        invalidate_for(db, obj)
+
+    # _after_write only sees the row as written, so a row moved to another
+    # restaurant also invalidates the restaurant it left.
+    def update(self, db: Session, db_obj, obj_in):
+        previous = getattr(db_obj, "restaurant_id", None)
+        updated = super().update(db, db_obj, obj_in)
+        if previous is not None and str(previous) != str(updated.restaurant_id):
+            after_commit(db, lambda: invalidate_previous_restaurant(self.model, previous))
+        return updated
+
+    def update_many(self, db: Session, objs_in: list, atomic: bool = True):
+        moved = [obj_in.id for obj_in in objs_in if "restaurant_id" in obj_in.model_fields_set]
+        previous = {}
+        if moved and hasattr(self.model, "restaurant_id"):
+            previous = dict(db.query(self.model.id, self.model.restaurant_id).filter(self.model.id.in_(moved)).all())
+        updated, errors = super().update_many(db, objs_in, atomic=atomic)
+        left = {previous[obj.id] for obj in updated if obj.id in previous and str(previous[obj.id]) != str(obj.restaurant_id)}
+        if left:
+            after_commit(db, lambda: [invalidate_previous_restaurant(self.model, restaurant_id) for restaurant_id in left])
+        return updated, errors
+
 class UserRepository(BaseRepository):
     def __init__(self):
         super().__init__(User)
@@ -31,13 +66,125 @@ class OrderRepository(BaseRepository):
     def __init__(self):
         super().__init__(Order)
 
-class RestaurantRepository(BaseRepository):
+    def create(self, db: Session, obj_in, items: list = None) -> Order:
+        db_obj = self.model(**obj_in.dict(exclude={"items"}))
+        db_obj.id = uuid.uuid4()
+        db.add(db_obj)
+        with unit_of_work(db):
+            if items:
+                self._save(db)
+                db.execute(insert(OrderItem), [{**item, "order_id": db_obj.id} for item in items])
+            self._save(db)
+            after_commit(db, lambda: self._after_write(db, db_obj))
+            if items:
+                after_commit(db, lambda: popularity.record_order_items(items))
+        return db_obj
+
+    def get_ordered_menu_item_ids(self, db: Session, user_id) -> set:
+        rows = (
+            db.query(OrderItem.menu_item_id)
+            .join(Order, Order.id == OrderItem.order_id)
+            .filter(Order.user_id == user_id)
+            .distinct()
+            .all()
+        )
+        return {str(row[0]) for row in rows}
+
+class OrderItemRepository(BaseRepository):
+    def __init__(self):
+        super().__init__(OrderItem)
+
+    def get_top_menu_items(self, db: Session, restaurant_id, limit: int = 10) -> list:
+        quantity = func.sum(OrderItem.quantity).label("quantity")
+        return (
+            db.query(OrderItem.menu_item_id, quantity)
+            .join(Order, Order.id == OrderItem.order_id)
+            .filter(Order.restaurant_id == restaurant_id)
+            .group_by(OrderItem.menu_item_id)
+            .order_by(quantity.desc())
+            .limit(limit)
+            .all()
+        )
+
+class RestaurantRepository(CatalogueRepository):
     def __init__(self):
         super().__init__(Restaurant)
 
-class ReviewRepository(BaseRepository):
+    # The earth_box containment check is what idx_addresses_restaurant_earth serves;
+    # it over-selects at the corners, so the exact distance is checked as well.
+    def get_nearby(self, db: Session, latitude: float, longitude: float, radius_km: float, limit: int = 20, offset: int = 0) -> list:
+        sql = text(
+            "SELECT a.restaurant_id, min(earth_distance(ll_to_earth(a.latitude, a.longitude), ll_to_earth(:latitude, :longitude))) AS distance "
+            "FROM addresses a WHERE a.restaurant_id IS NOT NULL AND a.latitude IS NOT NULL AND a.longitude IS NOT NULL "
+            "AND earth_box(ll_to_earth(:latitude, :longitude), :radius) @> ll_to_earth(a.latitude, a.longitude) "
+            "AND earth_distance(ll_to_earth(a.latitude, a.longitude), ll_to_earth(:latitude, :longitude)) <= :radius "
+            "GROUP BY a.restaurant_id ORDER BY distance ASC, a.restaurant_id LIMIT :limit OFFSET :offset"
+        )
+        params = {"latitude": latitude, "longitude": longitude, "radius": radius_km * 1000, "limit": limit, "offset": offset}
+        rows = db.execute(sql, params).fetchall()
+        restaurants = {restaurant.id: restaurant for restaurant in self.get_many(db, [row[0] for row in rows])}
+        return [(restaurants[row[0]], row[1] / 1000) for row in rows if row[0] in restaurants]
+
+class RestaurantRatingSummaryRepository(BaseRepository):
+    def __init__(self):
+        super().__init__(RestaurantRatingSummary)
+
+    # Applies (restaurant_id, rating, +1/-1) changes as additive upserts, one per
+    # restaurant, so concurrent review writes never recount or overwrite each other.
+    def adjust(self, db: Session, changes: list):
+        deltas = {}
+        for restaurant_id, rating, delta in changes:
+            if restaurant_id is None or rating not in RATINGS:
+                continue
+            row = deltas.setdefault(restaurant_id, dict.fromkeys(("review_count", "rating_sum") + tuple(f"rating_{r}" for r in RATINGS), 0))
+            row["review_count"] += delta
+            row["rating_sum"] += rating * delta
+            row[f"rating_{rating}"] += delta
+        table = self.model.__table__
+        for restaurant_id, row in deltas.items():
+            if not any(row.values()):
+                continue
+            statement = postgresql.insert(table).values(restaurant_id=restaurant_id, **row)
+            db.execute(statement.on_conflict_do_update(
+                index_elements=[table.c.restaurant_id],
+                set_={**{key: table.c[key] + statement.excluded[key] for key in row}, "updated_at": func.now()},
+            ))
+        self._save(db)
+
+class ReviewRepository(CatalogueRepository):
     def __init__(self):
         super().__init__(Review)
+        self.summaries = RestaurantRatingSummaryRepository()
+
+    def create(self, db: Session, obj_in) -> Review:
+        with unit_of_work(db):
+            review = super().create(db, obj_in)
+            self.summaries.adjust(db, [(review.restaurant_id, review.rating, 1)])
+        return review
+
+    def update(self, db: Session, db_obj: Review, obj_in) -> Review:
+        before = (db_obj.restaurant_id, db_obj.rating)
+        with unit_of_work(db):
+            review = super().update(db, db_obj, obj_in)
+            if (review.restaurant_id, review.rating) != before:
+                self.summaries.adjust(db, [(*before, -1), (review.restaurant_id, review.rating, 1)])
+        return review
+
+    def delete(self, db: Session, id=None, db_obj: Review = None):
+        with unit_of_work(db):
+            review = super().delete(db, id=id, db_obj=db_obj)
+            if review is not None:
+                self.summaries.adjust(db, [(review.restaurant_id, review.rating, -1)])
+        return review
+
+    def get_for_restaurant(self, db: Session, restaurant_id, rating: int = None, limit: int = 20, offset: int = 0, fields: tuple = None) -> list:
+        return (
+            self.build_query(db, filters={"restaurant_id": restaurant_id, "rating": rating}, fields=fields)
+            .order_by(Review.created_at.desc(), Review.id.desc())
+            .limit(limit)
+            .offset(offset)
+            .all()
+        )
 
 class PaymentRepository(BaseRepository):
     def __init__(self):
@@ -47,11 +194,79 @@ class FavoritesRepository(BaseRepository):
     def __init__(self):
         super().__init__(Favorites)
 
-class MenuItemRepository(BaseRepository):
+    def create(self, db: Session, obj_in) -> Favorites:
+        favorite = super().create(db, obj_in)
+        after_commit(db, lambda: popularity.record(favorite.menu_item_id, favorites=1))
+        return favorite
+
+def menu_item_exclusions(params: dict, exclude_allergens: list = None, exclude_tags: list = None) -> list:
+    conditions = ["m.deleted_at IS NULL"]
+    if exclude_allergens:
+        conditions.append("NOT (coalesce(m.allergens, '{}') && CAST(:exclude_allergens AS text[]))")
+        params["exclude_allergens"] = list(exclude_allergens)
+    if exclude_tags:
+        conditions.append("NOT (coalesce(m.tags, '{}') && CAST(:exclude_tags AS text[]))")
+        params["exclude_tags"] = list(exclude_tags)
+    return conditions
+
+class MenuItemRepository(CatalogueRepository):
     def __init__(self):
         super().__init__(MenuItem)
 
-class MenuItemAddonsRepository(BaseRepository):
+    def _query(self, db: Session):
+        return db.query(self.model).filter(self.model.deleted_at.is_(None))
+
+    # Lookups by id go through the identity map, which holds soft-deleted rows
+    # too, so they are filtered here the same way _query filters listings.
+    def get(self, db: Session, id=None, filters=None, fields: tuple = None):
+        obj = super().get(db, id=id, filters=filters, fields=fields)
+        if id is not None and obj is not None and obj.deleted_at is not None:
+            return None
+        return obj
+
+    def get_many(self, db: Session, ids: list) -> list:
+        return [obj for obj in super().get_many(db, ids) if obj.deleted_at is None]
+
+    def exists(self, db: Session, id=None, filters=None) -> bool:
+        if id is not None:
+            return self.get(db, id=id) is not None
+        return super().exists(db, filters=filters)
+
+    # Menu items are referenced by orders, favorites and embeddings, so deletes
+    # soft-delete like menu re-imports do.
+    def delete(self, db: Session, id=None, db_obj: MenuItem = None):
+        obj = db_obj if db_obj is not None else self.get(db, id=id)
+        if obj is None or obj.deleted_at is not None:
+            return None
+        obj.deleted_at = datetime.now(timezone.utc)
+        self._save(db)
+        after_commit(db, lambda: self._after_write(db, obj))
+        return obj
+
+    def delete_many(self, db: Session, ids: list, atomic: bool = True):
+        def write(batch):
+            return db.scalars(
+                update(self.model)
+                .where(self.model.id.in_(batch), self.model.deleted_at.is_(None))
+                .values(deleted_at=func.now())
+                .returning(self.model)
+            ).all()
+        return self._run_bulk(db, write, list(ids), atomic, ids=list(ids))
+
+    # Served by idx_menu_items_search_vector. Items whose name alone matches the
+    # query rank first; name_match tells callers the query named a dish.
+    def search(self, db: Session, query_text: str, k: int = 30, exclude_allergens: list = None, exclude_tags: list = None) -> list:
+        params = {"query": query_text, "k": k}
+        conditions = menu_item_exclusions(params, exclude_allergens, exclude_tags)
+        sql = text(
+            "SELECT m.id, ts_rank_cd(m.search_vector, q) AS rank, to_tsvector('english', m.name) @@ q AS name_match "
+            "FROM menu_items m, websearch_to_tsquery('english', :query) q "
+            f"WHERE m.search_vector @@ q AND {' AND '.join(conditions)} "
+            "ORDER BY name_match DESC, rank DESC, m.id LIMIT :k"
+        )
+        return [(row[0], row[1], row[2]) for row in db.execute(sql, params).fetchall()]
+
+class MenuItemAddonsRepository(CatalogueRepository):
     def __init__(self):
         super().__init__(MenuItemAddons)
 
@@ -59,23 +274,75 @@ class MenuItemEmbeddingRepository(BaseRepository):
     def __init__(self):
         super().__init__(MenuItemEmbedding)
 
-    def get_top_k_similar(self, db: Session, query_embedding: list, k: int = 5):
+    def get_top_k_similar(self, db: Session, query_embedding: list, k: int = 5, exclude_allergens: list = None, exclude_tags: list = None):
+        params = {"embedding": query_embedding, "k": k}
+        conditions = menu_item_exclusions(params, exclude_allergens, exclude_tags)
         sql = text(
-            "SELECT menu_item_id, (embedding <-> (:embedding)::vector) as distance FROM menu_item_embeddings "
+            "SELECT e.menu_item_id, (e.embedding <-> (:embedding)::vector) as distance FROM menu_item_embeddings e "
+            f"JOIN menu_items m ON m.id = e.menu_item_id WHERE {' AND '.join(conditions)} "
             "ORDER BY distance ASC LIMIT :k"
         )
-        result = db.execute(sql, {"embedding": query_embedding, "k": k})
+        result = db.execute(sql, params)
         return [(row[0], 1.0 / (1.0 + row[1])) for row in result.fetchall()]
 
 class NotificationRepository(BaseRepository):
     def __init__(self):
         super().__init__(Notification)
 
+    def create(self, db: Session, obj_in) -> Notification:
+        created = super().create(db, obj_in)
+        after_commit(db, lambda: publish_notifications([created]))
+        return created
+
+    def create_many(self, db: Session, objs_in: list, atomic: bool = True):
+        created, errors = super().create_many(db, objs_in, atomic=atomic)
+        after_commit(db, lambda: publish_notifications(created))
+        return created, errors
+
+    def mark_seen(self, db: Session, user_id, ids: list = None) -> list:
+        statement = update(self.model).where(self.model.user_id == user_id, self.model.seen.isnot(True))
+        if ids is not None:
+            statement = statement.where(self.model.id.in_(ids))
+        try:
+            seen = db.scalars(statement.values(seen=True).returning(self.model.id)).all()
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise translate_error(e)
+        self._save(db)
+        after_commit(db, lambda: publish_seen(user_id, seen))
+        return seen
+
 class OrderAssignmentsRepository(BaseRepository):
     def __init__(self):
         super().__init__(OrderAssignments)
 
-class PromotionRepository(BaseRepository):
+    def _active(self):
+        status = self.model.meta["status"].astext
+        return or_(status.is_(None), status.notin_(FINISHED_STATUSES))
+
+    def get_active_loads(self, db: Session, delivery_person_ids: list) -> dict:
+        if not delivery_person_ids:
+            return {}
+        rows = (
+            db.query(self.model.delivery_person_id, func.count())
+            .filter(self.model.delivery_person_id.in_([uuid.UUID(str(id)) for id in delivery_person_ids]), self._active())
+            .group_by(self.model.delivery_person_id)
+            .all()
+        )
+        return {str(delivery_person_id): count for delivery_person_id, count in rows}
+
+    def get_assigned_order_ids(self, db: Session, order_ids: list) -> set:
+        if not order_ids:
+            return set()
+        rows = (
+            db.query(self.model.order_id)
+            .filter(self.model.order_id.in_([uuid.UUID(str(id)) for id in order_ids]), self._active())
+            .distinct()
+            .all()
+        )
+        return {str(order_id) for order_id, in rows}
+
+class PromotionRepository(CatalogueRepository):
     def __init__(self):
         super().__init__(Promotion)
 
@@ -91,10 +358,27 @@ class FileRepository(BaseRepository):
     def __init__(self):
         super().__init__(File)
 
-class AddonsRepository(BaseRepository):
+class AddonsRepository(CatalogueRepository):
     def __init__(self):
         super().__init__(Addons)
 
+    # restaurant_id and price aren't addon columns: an addon belongs to the
+    # restaurants whose live menu items link it, and prices live in options.
+    def build_query(self, db: Session, filters=None, fields: tuple = None):
+        values = dict(filters.dict(exclude_unset=True) if hasattr(filters, "dict") else filters or {})
+        restaurant_id = values.pop("restaurant_id", None)
+        price = values.pop("price", None)
+        query = super().build_query(db, filters=values, fields=fields)
+        if restaurant_id is not None:
+            query = query.filter(self.model.id.in_(
+                select(MenuItemAddons.addon_id)
+                .join(MenuItem, MenuItem.id == MenuItemAddons.menu_item_id)
+                .where(MenuItem.restaurant_id == restaurant_id, MenuItem.deleted_at.is_(None))
+            ))
+        if price is not None:
+            query = query.filter(self.model.options.contains([{"price": float(price)}]))
+        return query
+
 class DeliveryPersonRepository(BaseRepository):
     def __init__(self):
         super().__init__(DeliveryPerson)
@@ -106,3 +390,31 @@ class UserPreferencesRepository(BaseRepository):
 class AddressRepository(BaseRepository):
     def __init__(self):
         super().__init__(Address)
+
+    def get_restaurant_locations(self, db: Session, restaurant_ids: list) -> dict:
+        rows = (
+            db.query(Address.restaurant_id, Address.latitude, Address.longitude)
+            .filter(
+                Address.restaurant_id.in_(restaurant_ids),
+                Address.latitude.isnot(None),
+                Address.longitude.isnot(None),
+            )
+            .order_by(Address.restaurant_id, Address.is_primary.desc())
+            .all()
+        )
+        locations = {}
+        for restaurant_id, latitude, longitude in rows:
+            locations.setdefault(restaurant_id, (latitude, longitude))
+        return locations
+
+class RiderLocationRepository(BaseRepository):
+    def __init__(self):
+        super().__init__(RiderLocation)
+
+    # Track samples are plain dicts straight from the location store; rows whose
+    # rider has since been deleted are reported instead of failing the batch.
+    def append(self, db: Session, rows: list):
+        def write(batch):
+            db.execute(insert(self.model), batch)
+            return []
+        return self._run_bulk(db, write, rows, atomic=False)
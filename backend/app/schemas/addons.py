@@ -1,12 +1,16 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict
 from uuid import UUID
+from .bulk import BulkError
 
 class AddonOption(BaseModel):
     name: str
     description: Optional[str] = None
     price: float
 
+class AddonOptionOut(AddonOption):
+    discounted_price: Optional[float] = None
+
 class AddonsCreate(BaseModel):
     name: str
     options: List[AddonOption]
@@ -17,10 +21,13 @@ class AddonsUpdate(BaseModel):
     options: Optional[List[AddonOption]] = None
     meta: Optional[dict] = None
 
+class AddonsBulkUpdate(AddonsUpdate):
+    id: UUID
+
 class AddonsOut(BaseModel):
     id: UUID
     name: str
-    options: List[AddonOption]
+    options: List[AddonOptionOut]
     meta: Optional[dict] = None
 
     model_config = {
@@ -33,4 +40,9 @@ class AddonsListResponse(BaseModel):
 
 class AddonsSingleResponse(BaseModel):
     data: AddonsOut
-    message: str = "Addon fetched successfully"
\ No newline at end of file
+    message: str = "Addon fetched successfully"
+
+class AddonsBulkResponse(BaseModel):
+    data: List[AddonsOut]
+    errors: List[BulkError] = []
+    message: str = "Addons processed successfully"
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Any, Optional, List
+from uuid import UUID
+
+class BulkError(BaseModel):
+    index: int
+    id: Optional[Any] = None
+    detail: str
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[UUID]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from uuid import UUID
 
@@ -17,6 +17,12 @@ class DeliveryPersonUpdate(BaseModel):
     vehicle_type: Optional[str] = None
     meta: Optional[dict] = None
 
+class DeliveryPersonAvailability(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    available: bool = True
+    active_orders: Optional[int] = Field(None, ge=0)
+
 class DeliveryPersonOut(BaseModel):
     id: UUID
     user_id: UUID
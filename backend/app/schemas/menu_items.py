@@ -2,12 +2,16 @@ from pydantic import BaseModel
 from typing import Optional, List
 from uuid import UUID
 from .menu_item_addons import MenuItemAddonsOut
+from .bulk import BulkError
 
 class MenuItemOption(BaseModel):
     name: str
     description: Optional[str] = None
     price: float
 
+class MenuItemOptionOut(MenuItemOption):
+    discounted_price: Optional[float] = None
+
 class MenuItemCreate(BaseModel):
     restaurant_id: UUID
     name: str
@@ -25,12 +29,15 @@ class MenuItemUpdate(BaseModel):
     allergens: Optional[List[str]] = None
     meta: Optional[dict] = None
 
+class MenuItemBulkUpdate(MenuItemUpdate):
+    id: UUID
+
 class MenuItemOut(BaseModel):
     id: UUID
     restaurant_id: UUID
     name: str
     description: Optional[str] = None
-    options: Optional[List[MenuItemOption]] = None
+    options: Optional[List[MenuItemOptionOut]] = None
     tags: Optional[List[str]] = None
     allergens: Optional[List[str]] = None
     meta: Optional[dict] = None
@@ -46,4 +53,9 @@ class MenuItemListResponse(BaseModel):
 
 class MenuItemSingleResponse(BaseModel):
     data: MenuItemOut
-    message: str = "Menu item fetched successfully"
\ No newline at end of file
+    message: str = "Menu item fetched successfully"
+
+class MenuItemBulkResponse(BaseModel):
+    data: List[MenuItemOut]
+    errors: List[BulkError] = []
+    message: str = "Menu items processed successfully"
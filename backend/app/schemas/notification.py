@@ -0,0 +1,51 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+from uuid import UUID
+from .bulk import BulkError
+
+class NotificationCreate(BaseModel):
+    user_id: UUID
+    title: str
+    body: str
+    seen: Optional[bool] = False
+    meta: Optional[dict] = None
+
+class NotificationUpdate(BaseModel):
+    title: Optional[str] = None
+    body: Optional[str] = None
+    seen: Optional[bool] = None
+    meta: Optional[dict] = None
+
+class NotificationBulkUpdate(NotificationUpdate):
+    id: UUID
+
+class NotificationSeenRequest(BaseModel):
+    user_id: UUID
+    ids: Optional[List[UUID]] = None
+
+class NotificationOut(BaseModel):
+    id: UUID
+    user_id: UUID
+    title: str
+    body: str
+    seen: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    meta: Optional[dict] = None
+
+    model_config = {
+        "from_attributes": True
+    }
+
+class NotificationListResponse(BaseModel):
+    data: List[NotificationOut]
+    message: str = "Notifications fetched successfully"
+
+class NotificationSingleResponse(BaseModel):
+    data: NotificationOut
+    message: str = "Notification fetched successfully"
+
+class NotificationBulkResponse(BaseModel):
+    data: List[NotificationOut]
+    errors: List[BulkError] = []
+    message: str = "Notifications processed successfully"
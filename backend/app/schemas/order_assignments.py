@@ -11,6 +11,7 @@ class OrderAssignmentUpdate(BaseModel):
     order_id: Optional[str] = None
     delivery_person_id: Optional[str] = None
     updated_at: Optional[datetime] = None
+    meta: Optional[dict] = None
 
 class OrderAssignmentOut(BaseModel):
     id: str
@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from uuid import UUID
+
+class OrderItemAddonCreate(BaseModel):
+    addon_id: UUID
+    option_name: Optional[str] = None
+
+class OrderItemCreate(BaseModel):
+    menu_item_id: UUID
+    option_name: Optional[str] = None
+    addons: Optional[List[OrderItemAddonCreate]] = None
+    quantity: int = 1
+    unit_price: Optional[float] = None
+    meta: Optional[dict] = None
+
+class OrderItemOut(BaseModel):
+    id: UUID
+    order_id: UUID
+    menu_item_id: UUID
+    name: str
+    option_name: Optional[str] = None
+    quantity: int
+    unit_price: float
+    meta: Optional[dict] = None
+
+    model_config = {
+        "from_attributes": True
+    }
+
+class OrderItemListResponse(BaseModel):
+    data: List[OrderItemOut]
+    message: str = "Order items fetched successfully"
@@ -1,12 +1,14 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from uuid import UUID
+from .order_items import OrderItemCreate, OrderItemOut
 
 class OrderCreate(BaseModel):
     user_id: str
     restaurant_id: str
-    total_price: float
+    total_price: Optional[float] = None
     meta: Optional[dict] = None
+    items: List[OrderItemCreate]
 
 class OrderUpdate(BaseModel):
     total_price: Optional[float] = None
@@ -18,6 +20,7 @@ class OrderOut(BaseModel):
     restaurant_id: UUID
     total_price: float
     meta: Optional[dict] = None
+    items: List[OrderItemOut] = []
 
     model_config = {
         "from_attributes": True
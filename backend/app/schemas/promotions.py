@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
+from .bulk import BulkError
 
 class PromotionCreate(BaseModel):
     restaurant_id: UUID
@@ -21,6 +22,9 @@ class PromotionUpdate(BaseModel):
     valid_to: Optional[datetime] = None
     meta: Optional[dict] = None
 
+class PromotionBulkUpdate(PromotionUpdate):
+    id: UUID
+
 class PromotionOut(BaseModel):
     id: UUID
     restaurant_id: UUID
@@ -41,4 +45,9 @@ class PromotionListResponse(BaseModel):
 
 class PromotionSingleResponse(BaseModel):
     data: PromotionOut
-    message: str = "Promotion fetched successfully"
\ No newline at end of file
+    message: str = "Promotion fetched successfully"
+
+class PromotionBulkResponse(BaseModel):
+    data: List[PromotionOut]
+    errors: List[BulkError] = []
+    message: str = "Promotions processed successfully"
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
 from uuid import UUID
 
 class RestaurantCreate(BaseModel):
@@ -12,11 +12,21 @@ class RestaurantUpdate(BaseModel):
     owner_id: Optional[UUID] = None
     meta: Optional[dict] = None
 
+class RestaurantRatingOut(BaseModel):
+    review_count: int
+    average_rating: Optional[float] = None
+    histogram: Dict[str, int]
+
+    model_config = {
+        "from_attributes": True
+    }
+
 class RestaurantOut(BaseModel):
     id: UUID
     name: str
     owner_id: Optional[UUID] = None
     meta: Optional[dict]
+    rating: Optional[RestaurantRatingOut] = None
 
     model_config = {
         "from_attributes": True
@@ -29,3 +39,10 @@ class RestaurantListResponse(BaseModel):
 class RestaurantSingleResponse(BaseModel):
     data: RestaurantOut
     message: str = "Restaurant fetched successfully"
+
+class NearbyRestaurantOut(RestaurantOut):
+    distance_km: float
+
+class NearbyRestaurantListResponse(BaseModel):
+    data: List[NearbyRestaurantOut]
+    message: str = "Nearby restaurants fetched successfully"
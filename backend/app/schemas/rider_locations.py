@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional, List
+from uuid import UUID
+
+class RiderLocationUpdate(BaseModel):
+    delivery_person_id: UUID
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    recorded_at: Optional[datetime] = None
+
+class RiderLocationBatch(BaseModel):
+    locations: List[RiderLocationUpdate]
+
+class RiderLocationOut(BaseModel):
+    delivery_person_id: UUID
+    latitude: float
+    longitude: float
+    recorded_at: datetime
+
+class RiderLocationSingleResponse(BaseModel):
+    data: RiderLocationOut
+    message: str = "Rider location fetched successfully"
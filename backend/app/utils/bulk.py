@@ -0,0 +1,9 @@
+from app.core.config import settings
+from app.core.errors import BadRequestError
+
+
+def check_bulk_size(rows: list):
+    if not rows:
+        raise BadRequestError("At least one row must be provided")
+    if len(rows) > settings.BULK_MAX_ROWS:
+        raise BadRequestError(f"At most {settings.BULK_MAX_ROWS} rows can be processed per request")
@@ -0,0 +1,357 @@
+from collections import OrderedDict
+from sqlalchemy.orm import Session
+from uuid import UUID
+import hashlib
+import json
+import logging
+import threading
+import time
+from app.core.config import settings
+from app.db.notify import PROCESS_ID, listener, publish
+from app.models.addons import Addons
+from app.models.menu_items import MenuItem
+from app.models.menu_item_addons import MenuItemAddons
+from app.models.promotions import Promotion
+from app.models.restaurant import Restaurant
+from app.models.reviews import Review
+from app.core.serialization import dumps, get_serializer
+from app.schemas.addons import AddonsOut
+from app.schemas.menu_items import MenuItemOut
+from app.schemas.restaurant import RestaurantOut
+from app.utils.pricing import PriceTable, PromotionIndex, price_options, pricing_now
+
+INVALIDATION_CHANNEL = "catalogue_invalidate"
+
+MENU = "menu"
+ADDONS = "addons"
+RESTAURANTS = "restaurants"
+PROMOTIONS = "promotions"
+
+
+class CacheEntry:
+    __slots__ = ("version", "value", "body", "size", "etag", "expires_at")
+
+    def __init__(self, version: tuple, value, expires_at: float = None):
+        # The encoded body is kept alongside the rows so hits are written out
+        # as-is; the strong ETag is derived from it, so every worker holding the
+        # same menu version hands out the same validator.
+        self.version = version
+        self.value = value
+        self.body = dumps(value)
+        self.size = len(self.body)
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        # Prices baked into the body change when a promotion starts or ends.
+        self.expires_at = expires_at
+
+
+# Versioned read-through cache: every key carries a version that is bumped on
+# invalidation, and an entry is only served while its version is current. An
+# entry also records the version of its prefix key, so a prefix invalidation
+# bumps one counter and covers loads already in flight for keys it has never
+# seen. Entries are evicted least-recently-used first once the memory budget is
+# exceeded.
+class CatalogueCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def version(self, key) -> int:
+        with self._lock:
+            return self._versions.get(key, 0)
+
+    def _current(self, key) -> tuple:
+        with self._lock:
+            if len(key) > 1:
+                return self._versions.get(key, 0), self._versions.get(key[:1], 0)
+            return (self._versions.get(key, 0),)
+
+    def peek(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != self._current(key):
+                return None
+            if entry.expires_at is not None and entry.expires_at <= time.time():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def get_or_load(self, key, loader, expires_at: float = None) -> CacheEntry:
+        entry = self.peek(key)
+        if entry is not None:
+            return entry
+
+        version = self._current(key)
+        value = loader()
+        entry = CacheEntry(version, value, expires_at)
+        self._store(key, entry)
+        return entry
+
+    def _store(self, key, entry: CacheEntry):
+        with self._lock:
+            if entry.version != self._current(key) or entry.size > self.max_bytes:
+                return
+            self._discard(key)
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def invalidate(self, keys, publish_change: bool = True):
+        with self._lock:
+            for key in keys:
+                self._versions[key] = self._versions.get(key, 0) + 1
+                self._discard(key)
+        if publish_change:
+            self._publish(keys)
+
+    def invalidate_prefix(self, prefix: str, publish_change: bool = True):
+        with self._lock:
+            self._versions[(prefix,)] = self._versions.get((prefix,), 0) + 1
+            for key in [key for key in self._entries if key[0] == prefix]:
+                self._discard(key)
+        if publish_change:
+            self._publish([(prefix,)])
+
+    def _publish(self, keys):
+        if not settings.CATALOGUE_CACHE_NOTIFY:
+            return
+        try:
+            payload = json.dumps({"origin": PROCESS_ID, "keys": [list(key) for key in keys]})
+            publish(INVALIDATION_CHANNEL, payload)
+        except Exception as e:
+            logging.error(f"Failed to publish catalogue invalidation: {e}")
+
+
+catalogue_cache = CatalogueCache(settings.CATALOGUE_CACHE_MAX_BYTES)
+
+
+def _on_invalidation(payload: str):
+    message = json.loads(payload)
+    if message.get("origin") == PROCESS_ID:
+        return
+    for key in message.get("keys", []):
+        key = tuple(key)
+        if len(key) == 1:
+            catalogue_cache.invalidate_prefix(key[0], publish_change=False)
+        else:
+            catalogue_cache.invalidate([key], publish_change=False)
+
+
+def register_catalogue_listener():
+    if settings.CATALOGUE_CACHE_NOTIFY:
+        listener.subscribe(INVALIDATION_CHANNEL, _on_invalidation)
+
+
+def invalidate_restaurant_menu(restaurant_id):
+    if restaurant_id is None:
+        return
+    restaurant_id = str(restaurant_id)
+    catalogue_cache.invalidate([(MENU, restaurant_id), (ADDONS, restaurant_id)])
+
+
+def invalidate_restaurant_promotions(restaurant_id):
+    if restaurant_id is None:
+        return
+    restaurant_id = str(restaurant_id)
+    catalogue_cache.invalidate([(PROMOTIONS, restaurant_id), (MENU, restaurant_id), (ADDONS, restaurant_id)])
+
+
+# What a restaurant served before one of its rows moved to another restaurant.
+def invalidate_previous_restaurant(model, restaurant_id):
+    if model is MenuItem:
+        invalidate_restaurant_menu(restaurant_id)
+    elif model is Promotion:
+        invalidate_restaurant_promotions(restaurant_id)
+
+
+def invalidate_for(db: Session, obj):
+    if isinstance(obj, MenuItem):
+        invalidate_restaurant_menu(obj.restaurant_id)
+    elif isinstance(obj, MenuItemAddons):
+        menu_item = db.get(MenuItem, obj.menu_item_id)
+        if menu_item is not None:
+            invalidate_restaurant_menu(menu_item.restaurant_id)
+        else:
+            catalogue_cache.invalidate_prefix(MENU)
+            catalogue_cache.invalidate_prefix(ADDONS)
+    elif isinstance(obj, Addons):
+        catalogue_cache.invalidate_prefix(ADDONS)
+    elif isinstance(obj, (Restaurant, Review)):
+        # Restaurant responses carry the rating summary.
+        catalogue_cache.invalidate([(RESTAURANTS,)])
+    elif isinstance(obj, Promotion):
+        invalidate_restaurant_promotions(obj.restaurant_id)
+
+
+# Derived per-restaurant structures (promotion indexes, price tables) are rebuilt
+# lazily: each is tagged with the versions of the catalogue keys it was built
+# from, which writes bump in every worker, and the least recently used are
+# dropped past settings.PRICING_CACHE_SIZE.
+class VersionedStore:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, sources: list, builder):
+        versions = tuple(catalogue_cache.version(source) for source in sources)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == versions:
+                self._entries.move_to_end(key)
+                return cached[1]
+        value = builder()
+        with self._lock:
+            self._entries[key] = (versions, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return value
+
+
+_promotion_indexes = VersionedStore(settings.PRICING_CACHE_SIZE)
+_price_tables = VersionedStore(settings.PRICING_CACHE_SIZE)
+
+
+def get_promotion_index(db: Session, restaurant_id) -> PromotionIndex:
+    restaurant_key = str(restaurant_id)
+    return _promotion_indexes.get_or_build(
+        restaurant_key,
+        [(PROMOTIONS, restaurant_key)],
+        lambda: PromotionIndex(
+            db.query(Promotion.id, Promotion.discount_percent, Promotion.valid_from, Promotion.valid_to)
+            .filter(Promotion.restaurant_id == restaurant_id, Promotion.valid_to > pricing_now())
+            .all()
+        ),
+    )
+
+
+def load_price_table(db: Session, restaurant_id) -> PriceTable:
+    menu_items = (
+        db.query(MenuItem.id, MenuItem.name, MenuItem.options)
+        .filter(MenuItem.restaurant_id == restaurant_id, MenuItem.deleted_at.is_(None))
+        .all()
+    )
+    links = (
+        db.query(MenuItemAddons.menu_item_id, MenuItemAddons.addon_id)
+        .filter(MenuItemAddons.menu_item_id.in_([menu_item.id for menu_item in menu_items]))
+        .all()
+        if menu_items else []
+    )
+    addon_ids = {addon_id for _, addon_id in links}
+    addons = db.query(Addons.id, Addons.options).filter(Addons.id.in_(addon_ids)).all() if addon_ids else []
+    return PriceTable(menu_items, addons, links)
+
+
+# Versioned with the restaurant's menu and addons, including the prefix keys that
+# catalogue-wide invalidations bump.
+def get_price_table(db: Session, restaurant_id) -> PriceTable:
+    restaurant_key = str(restaurant_id)
+    return _price_tables.get_or_build(
+        restaurant_key,
+        [(MENU, restaurant_key), (MENU,), (ADDONS, restaurant_key), (ADDONS,)],
+        lambda: load_price_table(db, restaurant_id),
+    )
+
+
+def active_promotion(db: Session, restaurant_id, at=None):
+    return get_promotion_index(db, restaurant_id).active(at or pricing_now())
+
+
+def promotion_expiry(db: Session, restaurant_id):
+    change = get_promotion_index(db, restaurant_id).next_change(pricing_now())
+    return change.timestamp() if change is not None else None
+
+
+def addons_for_menu_items(db: Session, menu_item_ids: list) -> dict:
+    addons = {}
+    if not menu_item_ids:
+        return addons
+    links = db.query(MenuItemAddons).filter(MenuItemAddons.menu_item_id.in_(menu_item_ids)).all()
+    for link in links:
+        addons.setdefault(link.menu_item_id, []).append(link)
+    return addons
+
+
+def serialize_menu_items(db: Session, menu_items: list, fields: tuple = None) -> list:
+    serializer = get_serializer(MenuItemOut, fields, computed=("addons", "options"))
+    with_addons = "addons" in serializer.fields
+    with_options = "options" in serializer.fields
+    addons = addons_for_menu_items(db, [menu_item.id for menu_item in menu_items]) if with_addons else {}
+    now = pricing_now()
+    promotions = {}
+    rows = []
+    for menu_item in menu_items:
+        overrides = {}
+        if with_addons:
+            overrides["addons"] = addons.get(menu_item.id, [])
+        if with_options:
+            restaurant_id = menu_item.restaurant_id
+            if restaurant_id not in promotions:
+                promotions[restaurant_id] = active_promotion(db, restaurant_id, now)
+            overrides["options"] = price_options(menu_item.options, promotions[restaurant_id])
+        rows.append(serializer(menu_item, **overrides))
+    return rows
+
+
+def load_restaurant_menu(db: Session, restaurant_id) -> list:
+    menu_items = (
+        db.query(MenuItem)
+        .filter(MenuItem.restaurant_id == restaurant_id, MenuItem.deleted_at.is_(None))
+        .all()
+    )
+    return serialize_menu_items(db, menu_items)
+
+
+def load_restaurant_addons(db: Session, restaurant_id) -> list:
+    addons = (
+        db.query(Addons)
+        .join(MenuItemAddons, MenuItemAddons.addon_id == Addons.id)
+        .join(MenuItem, MenuItem.id == MenuItemAddons.menu_item_id)
+        .filter(MenuItem.restaurant_id == restaurant_id, MenuItem.deleted_at.is_(None))
+        .distinct()
+        .all()
+    )
+    promotion = active_promotion(db, restaurant_id)
+    serializer = get_serializer(AddonsOut, computed=("options",))
+    return [serializer(addon, options=price_options(addon.options, promotion)) for addon in addons]
+
+
+def get_restaurant_menu(db: Session, restaurant_id: UUID) -> CacheEntry:
+    return catalogue_cache.get_or_load(
+        (MENU, str(restaurant_id)),
+        lambda: load_restaurant_menu(db, restaurant_id),
+        expires_at=promotion_expiry(db, restaurant_id),
+    )
+
+
+def get_restaurant_addons(db: Session, restaurant_id: UUID) -> CacheEntry:
+    return catalogue_cache.get_or_load(
+        (ADDONS, str(restaurant_id)),
+        lambda: load_restaurant_addons(db, restaurant_id),
+        expires_at=promotion_expiry(db, restaurant_id),
+    )
+
+
+def get_all_addons(db: Session) -> CacheEntry:
+    return catalogue_cache.get_or_load(
+        (ADDONS,),
+        lambda: [get_serializer(AddonsOut)(addon) for addon in db.query(Addons).all()],
+    )
+
+
+def get_all_restaurants(db: Session) -> CacheEntry:
+    return catalogue_cache.get_or_load(
+        (RESTAURANTS,),
+        lambda: [get_serializer(RestaurantOut)(restaurant) for restaurant in db.query(Restaurant).all()],
+    )
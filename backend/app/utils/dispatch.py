@@ -0,0 +1,212 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import logging
+import threading
+import time
+from sqlalchemy import text
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.unit_of_work import unit_of_work
+from app.repositories.repository import AddressRepository, OrderAssignmentsRepository
+from app.schemas.order_assignments import OrderAssignmentCreate
+from app.utils.geo import GridIndex
+
+address_repo = AddressRepository()
+order_assignment_repo = OrderAssignmentsRepository()
+
+# Held for the rest of a round's transaction, so rounds in other workers wait and
+# then read loads that include the assignments this round committed.
+DISPATCH_LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext('dispatch'))")
+
+
+@dataclass
+class PendingOrder:
+    order_id: str
+    latitude: float
+    longitude: float
+    submitted_at: float
+
+
+@dataclass
+class Match:
+    order: PendingOrder
+    delivery_person_id: str
+    distance_km: float
+
+
+# Riders report their position and load; orders wait in `pending` until a matching
+# round pairs them with a nearby rider. Each round scores every (order, rider)
+# candidate within DISPATCH_RADIUS_KM as distance plus a per-active-order penalty
+# and assigns greedily by score, at most one new order per rider per round.
+# Rider positions are per worker, but loads are re-read from the active
+# order_assignments at the start of every round.
+class Dispatcher:
+    def __init__(
+        self,
+        radius_km: float = settings.DISPATCH_RADIUS_KM,
+        max_load: int = settings.DISPATCH_MAX_LOAD,
+        load_penalty_km: float = settings.DISPATCH_LOAD_PENALTY_KM,
+        candidates: int = settings.DISPATCH_CANDIDATES,
+        interval: float = settings.DISPATCH_INTERVAL_SECONDS,
+    ):
+        self.radius_km = radius_km
+        self.max_load = max_load
+        self.load_penalty_km = load_penalty_km
+        self.candidates = candidates
+        self.interval = interval
+        self.riders = GridIndex()
+        self.loads = {}
+        self.pending = {}
+        self._assigned_callbacks = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    # Called with (order_id, delivery_person_id) for every assignment a round creates.
+    def on_assigned(self, callback):
+        self._assigned_callbacks.append(callback)
+
+    def set_available(self, delivery_person_id: str, latitude: float, longitude: float, active_orders: int = None):
+        with self._lock:
+            self.riders.upsert(str(delivery_person_id), latitude, longitude)
+            if active_orders is not None:
+                self.loads[str(delivery_person_id)] = active_orders
+
+    def move(self, delivery_person_id: str, latitude: float, longitude: float):
+        with self._lock:
+            if str(delivery_person_id) in self.riders:
+                self.riders.upsert(str(delivery_person_id), latitude, longitude)
+
+    def set_unavailable(self, delivery_person_id: str):
+        with self._lock:
+            self.riders.remove(str(delivery_person_id))
+            self.loads.pop(str(delivery_person_id), None)
+
+    def submit(self, order_id: str, latitude: float, longitude: float, submitted_at: float = None):
+        submitted_at = time.monotonic() if submitted_at is None else submitted_at
+        with self._lock:
+            self.pending[str(order_id)] = PendingOrder(str(order_id), latitude, longitude, submitted_at)
+
+    def withdraw(self, order_id: str):
+        with self._lock:
+            return self.pending.pop(str(order_id), None)
+
+    def submit_order(self, db, order) -> bool:
+        location = address_repo.get_restaurant_locations(db, [order.restaurant_id]).get(order.restaurant_id)
+        if location is None:
+            logging.warning(f"Order {order.id} not queued for dispatch: restaurant {order.restaurant_id} has no location")
+            return False
+        self.submit(order.id, *location)
+        return True
+
+    def match(self) -> list:
+        with self._lock:
+            pairs = []
+            for order in self.pending.values():
+                for rider_id, distance in self.riders.nearby(order.latitude, order.longitude, self.radius_km, limit=self.candidates):
+                    load = self.loads.get(rider_id, 0)
+                    if load < self.max_load:
+                        pairs.append((distance + load * self.load_penalty_km, distance, order.order_id, rider_id))
+            pairs.sort()
+
+            matches, busy = [], set()
+            for _, distance, order_id, rider_id in pairs:
+                if order_id not in self.pending or rider_id in busy:
+                    continue
+                busy.add(rider_id)
+                self.loads[rider_id] = self.loads.get(rider_id, 0) + 1
+                matches.append(Match(self.pending.pop(order_id), rider_id, distance))
+            return matches
+
+    # Orders assigned by hand, or by a round in another worker, leave the queue.
+    def drop_assigned(self, db):
+        with self._lock:
+            order_ids = list(self.pending)
+        for order_id in order_assignment_repo.get_assigned_order_ids(db, order_ids):
+            self.withdraw(order_id)
+
+    def refresh_loads(self, db):
+        with self._lock:
+            rider_ids = list(self.riders)
+        loads = order_assignment_repo.get_active_loads(db, rider_ids)
+        with self._lock:
+            for rider_id in rider_ids:
+                if rider_id in self.riders:
+                    self.loads[rider_id] = loads.get(rider_id, 0)
+
+    def complete(self, delivery_person_id: str):
+        with self._lock:
+            if self.loads.get(str(delivery_person_id)):
+                self.loads[str(delivery_person_id)] -= 1
+
+    def _release(self, matches: list, requeue: bool = True):
+        with self._lock:
+            for match in matches:
+                if requeue:
+                    self.pending.setdefault(match.order.order_id, match.order)
+                if self.loads.get(match.delivery_person_id):
+                    self.loads[match.delivery_person_id] -= 1
+
+    def run_round(self, db) -> list:
+        matches = []
+        try:
+            with unit_of_work(db):
+                db.execute(DISPATCH_LOCK_SQL)
+                self.drop_assigned(db)
+                self.refresh_loads(db)
+                matches = self.match()
+                if not matches:
+                    return []
+                assigned_at = datetime.now(timezone.utc)
+                rows = [
+                    OrderAssignmentCreate(
+                        order_id=match.order.order_id,
+                        delivery_person_id=match.delivery_person_id,
+                        assigned_at=assigned_at,
+                        meta={"dispatched": True, "distance_km": round(match.distance_km, 3)},
+                    )
+                    for match in matches
+                ]
+                created, errors = order_assignment_repo.create_many(db, rows, atomic=False)
+        except Exception as e:
+            logging.error(f"Dispatch round failed, requeueing {len(matches)} orders: {e}")
+            self._release(matches)
+            return []
+        for error in errors:
+            match = matches[error["index"]]
+            logging.warning(f"Dropping order {match.order.order_id} from dispatch: {error['detail']}")
+            self._release([match], requeue=False)
+        for assignment in created:
+            for callback in self._assigned_callbacks:
+                callback(assignment.order_id, assignment.delivery_person_id)
+        return created
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if not self.pending:
+                continue
+            db = SessionLocal()
+            try:
+                created = self.run_round(db)
+                if created:
+                    logging.info(f"Dispatched {len(created)} orders, {len(self.pending)} pending")
+            except Exception as e:
+                logging.error(f"Dispatcher error: {e}")
+            finally:
+                db.close()
+
+
+dispatcher = Dispatcher()
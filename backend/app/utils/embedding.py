@@ -8,6 +8,9 @@ import google.generativeai as genai
 import logging
 import numpy as np
 from app.schemas.menu_item_embedding import MenuItemEmbeddingCreate
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import func
+from app.db.unit_of_work import unit_of_work
 
 if hasattr(settings, 'GEMINI_API_KEY'):
     genai.configure(api_key=settings.GEMINI_API_KEY)
@@ -27,18 +30,22 @@ def get_menu_item_text(menu_item) -> str:
         parts.append(f"Allergens: {', '.join(menu_item.allergens)}")
     return " | ".join(parts)
 
+def generate_menu_item_embedding(menu_item) -> list:
+    text = get_menu_item_text(menu_item)
+    response = genai.embed_content(
+        model="models/embedding-001",
+        content=text,
+        task_type="RETRIEVAL_DOCUMENT"
+    )
+    embedding = response['embedding'] if isinstance(response, dict) and 'embedding' in response else response
+
+    if not isinstance(embedding, list) or len(embedding) != 768:
+        raise BadRequestError(f"Embedding returned is not 768-dim: got {len(embedding) if isinstance(embedding, list) else 'invalid'}")
+    return embedding
+
 def create_menu_item_embedding(db: Session, menu_item_id: UUID, menu_item) -> None:
     try:
-        text = get_menu_item_text(menu_item)
-        response = genai.embed_content(
-            model="models/embedding-001",
-            content=text,
-            task_type="RETRIEVAL_DOCUMENT"
-        )
-        embedding = response['embedding'] if isinstance(response, dict) and 'embedding' in response else response
-
-        if not isinstance(embedding, list) or len(embedding) != 768:
-            raise BadRequestError(f"Embedding returned is not 768-dim: got {len(embedding) if isinstance(embedding, list) else 'invalid'}")
+        embedding = generate_menu_item_embedding(menu_item)
         embedding_obj = MenuItemEmbeddingCreate(
             menu_item_id=menu_item_id,
             embedding=embedding,
@@ -48,4 +55,37 @@ def create_menu_item_embedding(db: Session, menu_item_id: UUID, menu_item) -> No
         repo.create(db, obj_in=embedding_obj)
     except Exception as e:
         logging.error(f"Failed to create embedding for menu item {menu_item_id}: {e}")
-        raise BadRequestError(f"Failed to create embedding: {e}") 
\ No newline at end of file
+        raise BadRequestError(f"Failed to create embedding: {e}") 
+
+EMBEDDING_FIELDS = ("name", "description", "options", "tags", "allergens")
+
+def generate_menu_item_embeddings(menu_items: list) -> list:
+    response = genai.embed_content(
+        model="models/embedding-001",
+        content=[get_menu_item_text(menu_item) for menu_item in menu_items],
+        task_type="RETRIEVAL_DOCUMENT"
+    )
+    embeddings = response['embedding']
+    if len(embeddings) != len(menu_items) or any(len(embedding) != 768 for embedding in embeddings):
+        raise BadRequestError("Embedding batch returned unexpected dimensions")
+    return embeddings
+
+def upsert_menu_item_embeddings(db: Session, menu_items: list) -> None:
+    if not menu_items:
+        return
+    # Joins the caller's unit of work when there is one, so the rows and their
+    # embeddings commit or roll back together.
+    try:
+        embeddings = generate_menu_item_embeddings(menu_items)
+        stmt = insert(MenuItemEmbedding).values([
+            {"menu_item_id": menu_item.id, "embedding": embedding, "meta": {}}
+            for menu_item, embedding in zip(menu_items, embeddings)
+        ])
+        with unit_of_work(db):
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[MenuItemEmbedding.menu_item_id],
+                set_={"embedding": stmt.excluded.embedding, "updated_at": func.now()},
+            ))
+    except Exception as e:
+        logging.error(f"Failed to create embeddings for {len(menu_items)} menu items: {e}")
+        raise BadRequestError(f"Failed to create embeddings: {e}")
@@ -0,0 +1,79 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from app.core.config import settings
+from app.core.errors import BadRequestError
+from app.core.serialization import dumps
+from app.db.session import SessionLocal
+from app.models.enums import ExportFormat
+from app.repositories.base import BaseRepository
+import csv
+import io
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode()
+    return value
+
+
+def export_statement(db, repo: BaseRepository, filters: Optional[BaseModel], created_from: Optional[datetime], created_to: Optional[datetime]):
+    model = repo.model
+    columns = tuple(model.__table__.columns.keys())
+    query = repo.build_query(db, filters=filters, fields=columns)
+    if created_from:
+        query = query.filter(model.created_at >= created_from)
+    if created_to:
+        query = query.filter(model.created_at < created_to)
+    return columns, query.order_by(model.created_at, model.id).statement
+
+
+# Rows are read through a server-side cursor in batches of EXPORT_BATCH_SIZE and
+# each batch is encoded and sent before the next is fetched. The export gets its
+# own session because the response body is produced after the request's
+# dependencies have been torn down.
+def stream_export(repo: BaseRepository, filters: Optional[BaseModel], created_from: Optional[datetime], created_to: Optional[datetime], format: ExportFormat):
+    db = SessionLocal()
+    try:
+        columns, statement = export_statement(db, repo, filters, created_from, created_to)
+        result = db.execute(statement, execution_options={"yield_per": settings.EXPORT_BATCH_SIZE})
+        if format == ExportFormat.CSV:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            for rows in result.partitions():
+                writer.writerows([_csv_value(value) for value in row] for row in rows)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.getvalue():
+                yield buffer.getvalue().encode()
+        else:
+            for rows in result.partitions():
+                yield b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+    finally:
+        db.rollback()
+        db.close()
+
+
+def export_response(name: str, repo: BaseRepository, filters: Optional[BaseModel], format: ExportFormat, created_from: Optional[datetime] = None, created_to: Optional[datetime] = None) -> StreamingResponse:
+    if created_from and created_to and created_from >= created_to:
+        raise BadRequestError("created_from must be earlier than created_to")
+    return StreamingResponse(
+        stream_export(repo, filters, created_from, created_to, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format.value}"'},
+    )
@@ -1,5 +1,6 @@
 from fastapi import UploadFile
 import os
+import pypdfium2 as pdfium
 import shutil
 import uuid
 import logging
@@ -22,4 +23,36 @@ def save_file(file: UploadFile) -> str:
     with open(file_path, "wb") as buffer:
         shutil.copyfileobj(file.file, buffer)
 
-    return file_path 
\ No newline at end of file
+    return file_path
+
+PDF_RENDER_DPI = 200
+
+def is_pdf(file_path: str) -> bool:
+    return file_path.lower().endswith(".pdf")
+
+def rasterize_pdf(file_path: str) -> list:
+    base_path = os.path.splitext(file_path)[0]
+    page_paths = []
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        for index in range(len(pdf)):
+            page = pdf[index]
+            image = page.render(scale=PDF_RENDER_DPI / 72).to_pil()
+            page_path = f"{base_path}_page{index + 1}.png"
+            image.save(page_path)
+            page_paths.append(page_path)
+            page.close()
+    finally:
+        pdf.close()
+
+    logging.info(f"Rasterized {len(page_paths)} pages from {file_path}")
+    return page_paths
+
+def rasterize_menu_files(file_paths: list) -> list:
+    page_paths = []
+    for file_path in file_paths:
+        if is_pdf(file_path):
+            page_paths.extend(rasterize_pdf(file_path))
+        else:
+            page_paths.append(file_path)
+    return page_paths
@@ -0,0 +1,72 @@
+from math import asin, cos, floor, radians, sin, sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    dlat = radians(lat2 - lat1)
+    dlng = radians(lng2 - lng1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(a))
+
+
+# Fixed-size lat/lng grid for moving points. Updates are O(1) and a radius search
+# only visits the cells overlapping the search box, then checks exact distances.
+class GridIndex:
+    def __init__(self, cell_deg: float = 0.02):
+        self.cell_deg = cell_deg
+        self._cells = {}
+        self._points = {}
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, key):
+        return key in self._points
+
+    def __iter__(self):
+        return iter(self._points)
+
+    def _cell(self, lat: float, lng: float) -> tuple:
+        return floor(lat / self.cell_deg), floor(lng / self.cell_deg)
+
+    def get(self, key):
+        point = self._points.get(key)
+        return point[:2] if point else None
+
+    def upsert(self, key, lat: float, lng: float):
+        cell = self._cell(lat, lng)
+        previous = self._points.get(key)
+        if previous and previous[2] != cell:
+            self._discard(key, previous[2])
+        self._cells.setdefault(cell, set()).add(key)
+        self._points[key] = (lat, lng, cell)
+
+    def remove(self, key):
+        previous = self._points.pop(key, None)
+        if previous:
+            self._discard(key, previous[2])
+
+    def _discard(self, key, cell):
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(key)
+            if not members:
+                del self._cells[cell]
+
+    def nearby(self, lat: float, lng: float, radius_km: float, limit: int = None) -> list:
+        dlat = radius_km / KM_PER_DEGREE
+        dlng = radius_km / (KM_PER_DEGREE * max(cos(radians(lat)), 1e-6))
+        min_row, min_col = self._cell(lat - dlat, lng - dlng)
+        max_row, max_col = self._cell(lat + dlat, lng + dlng)
+        found = []
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                for key in self._cells.get((row, col), ()):
+                    point_lat, point_lng, _ = self._points[key]
+                    distance = haversine_km(lat, lng, point_lat, point_lng)
+                    if distance <= radius_km:
+                        found.append((key, distance))
+        found.sort(key=lambda item: item[1])
+        return found[:limit] if limit else found
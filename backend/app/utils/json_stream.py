@@ -0,0 +1,60 @@
+import json
+
+
+# Emits each element of the given top-level arrays as soon as it closes, so callers
+# can act on a streamed JSON object before it is complete. Anything outside the
+# outermost object (e.g. markdown code fences) is ignored.
+class JSONArrayStreamParser:
+    def __init__(self, keys):
+        self.keys = set(keys)
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_chars = None
+        self._last_key = None
+        self._active_key = None
+        self._element = None
+        self._element_depth = 0
+
+    def feed(self, chunk: str) -> list:
+        events = []
+        for char in chunk:
+            if self._element is not None:
+                self._element.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_chars is not None:
+                        self._last_key = json.loads('"' + "".join(self._key_chars) + '"')
+                        self._key_chars = None
+                    continue
+                if self._key_chars is not None:
+                    self._key_chars.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    self._key_chars = []
+            elif char in "{[":
+                if self._depth == 1 and char == "[" and self._last_key in self.keys:
+                    self._active_key = self._last_key
+                elif self._depth == 2 and self._active_key is not None and self._element is None:
+                    self._element = [char]
+                    self._element_depth = self._depth
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._element is not None and self._depth == self._element_depth:
+                    events.append((self._active_key, json.loads("".join(self._element))))
+                    self._element = None
+                if self._depth == 1:
+                    self._active_key = None
+            elif char == "," and self._depth == 1:
+                self._last_key = None
+        return events
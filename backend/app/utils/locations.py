@@ -0,0 +1,228 @@
+from array import array
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+import logging
+import threading
+import time
+import uuid
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.repositories.repository import DeliveryPersonRepository, RiderLocationRepository
+from app.utils.dispatch import dispatcher
+from app.utils.geo import haversine_km
+
+rider_location_repo = RiderLocationRepository()
+delivery_person_repo = DeliveryPersonRepository()
+
+
+# Latest position per rider in parallel float arrays indexed by a slot per rider,
+# so thousands of riders cost a few dozen bytes each and a ping never touches
+# Postgres. A ping becomes a track sample only when TRACK_SAMPLE_SECONDS have
+# passed or the rider moved TRACK_SAMPLE_METERS since the last sample; samples
+# are buffered and written in bulk every TRACK_FLUSH_SECONDS.
+class LocationStore:
+    def __init__(
+        self,
+        sample_seconds: float = settings.TRACK_SAMPLE_SECONDS,
+        sample_meters: float = settings.TRACK_SAMPLE_METERS,
+        flush_interval: float = settings.TRACK_FLUSH_SECONDS,
+        buffer_max: int = settings.TRACK_BUFFER_MAX,
+        orders_max: int = 100000,
+    ):
+        self.sample_seconds = sample_seconds
+        self.sample_meters = sample_meters
+        self.flush_interval = flush_interval
+        self.orders_max = orders_max
+        self._slots = {}
+        self._latitude = array("d")
+        self._longitude = array("d")
+        self._recorded_at = array("d")
+        self._sample_latitude = array("d")
+        self._sample_longitude = array("d")
+        self._sample_at = array("d")
+        self._samples = deque(maxlen=buffer_max)
+        self._orders = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _slot(self, delivery_person_id: uuid.UUID) -> int:
+        slot = self._slots.get(delivery_person_id)
+        if slot is None:
+            slot = self._slots[delivery_person_id] = len(self._latitude)
+            for column in (self._latitude, self._longitude, self._recorded_at, self._sample_latitude, self._sample_longitude):
+                column.append(0.0)
+            self._sample_at.append(float("-inf"))
+        return slot
+
+    def update(self, delivery_person_id: uuid.UUID, latitude: float, longitude: float, recorded_at: float = None) -> bool:
+        # A clock running ahead would otherwise make every later real ping look stale.
+        now = time.time()
+        recorded_at = now if recorded_at is None else min(recorded_at, now)
+        with self._lock:
+            slot = self._slot(delivery_person_id)
+            if recorded_at < self._recorded_at[slot]:
+                return False
+            self._latitude[slot] = latitude
+            self._longitude[slot] = longitude
+            self._recorded_at[slot] = recorded_at
+
+            elapsed = recorded_at - self._sample_at[slot]
+            if elapsed < self.sample_seconds:
+                moved = haversine_km(self._sample_latitude[slot], self._sample_longitude[slot], latitude, longitude) * 1000
+                if moved < self.sample_meters:
+                    return True
+            self._sample_latitude[slot] = latitude
+            self._sample_longitude[slot] = longitude
+            self._sample_at[slot] = recorded_at
+            self._samples.append((delivery_person_id, latitude, longitude, recorded_at))
+        return True
+
+    def get(self, delivery_person_id: uuid.UUID):
+        with self._lock:
+            slot = self._slots.get(delivery_person_id)
+            if slot is None:
+                return None
+            return self._latitude[slot], self._longitude[slot], self._recorded_at[slot]
+
+    def rider_for_order(self, order_id: uuid.UUID):
+        with self._lock:
+            rider_id = self._orders.get(order_id)
+            if rider_id is not None:
+                self._orders.move_to_end(order_id)
+            return rider_id
+
+    def assign(self, order_id: uuid.UUID, delivery_person_id: uuid.UUID):
+        order_id = uuid.UUID(str(order_id))
+        with self._lock:
+            self._orders[order_id] = delivery_person_id
+            self._orders.move_to_end(order_id)
+            while len(self._orders) > self.orders_max:
+                self._orders.popitem(last=False)
+
+    def forget(self, order_id: uuid.UUID):
+        with self._lock:
+            self._orders.pop(uuid.UUID(str(order_id)), None)
+
+    def drain(self) -> list:
+        with self._lock:
+            samples = list(self._samples)
+            self._samples.clear()
+        return samples
+
+    def flush(self, db) -> int:
+        samples = self.drain()
+        if not samples:
+            return 0
+        rows = [
+            {
+                "delivery_person_id": delivery_person_id,
+                "latitude": latitude,
+                "longitude": longitude,
+                "recorded_at": datetime.fromtimestamp(recorded_at, timezone.utc),
+            }
+            for delivery_person_id, latitude, longitude, recorded_at in samples
+        ]
+        _, errors = rider_location_repo.append(db, rows)
+        if errors:
+            logging.warning(f"Dropped {len(errors)} of {len(rows)} rider track samples: {errors[0]['detail']}")
+        return len(rows) - len(errors)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="track-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._write()
+
+    def _write(self):
+        db = SessionLocal()
+        try:
+            self.flush(db)
+        except Exception as e:
+            logging.error(f"Failed to write rider track samples: {e}")
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self._write()
+
+
+location_store = LocationStore()
+dispatcher.on_assigned(location_store.assign)
+
+
+# Delivery person ids known to exist, so pings from unknown ids are dropped before
+# they take a slot or reach the track writer. Misses are looked up once per batch
+# and unknown ids are remembered for unknown_ttl seconds, so a misbehaving client
+# costs at most one query per id per interval.
+class KnownRiders:
+    def __init__(self, unknown_ttl: float = 60, unknown_max: int = 10000):
+        self.unknown_ttl = unknown_ttl
+        self.unknown_max = unknown_max
+        self._known = set()
+        self._unknown = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, delivery_person_id):
+        with self._lock:
+            self._known.add(uuid.UUID(str(delivery_person_id)))
+            self._unknown.pop(uuid.UUID(str(delivery_person_id)), None)
+
+    def discard(self, delivery_person_id):
+        with self._lock:
+            self._known.discard(uuid.UUID(str(delivery_person_id)))
+
+    def _lookup(self, ids: list) -> set:
+        db = SessionLocal()
+        try:
+            return {delivery_person.id for delivery_person in delivery_person_repo.get_many(db, ids)}
+        finally:
+            db.close()
+
+    def filter(self, ids) -> set:
+        ids = set(ids)
+        now = time.monotonic()
+        with self._lock:
+            missing = [id for id in ids if id not in self._known and self._unknown.get(id, float("-inf")) <= now - self.unknown_ttl]
+        if missing:
+            found = self._lookup(missing)
+            with self._lock:
+                self._known.update(found)
+                for id in missing:
+                    if id in found:
+                        self._unknown.pop(id, None)
+                    else:
+                        self._unknown[id] = now
+                        self._unknown.move_to_end(id)
+                while len(self._unknown) > self.unknown_max:
+                    self._unknown.popitem(last=False)
+        with self._lock:
+            return {id for id in ids if id in self._known}
+
+
+known_riders = KnownRiders()
+
+
+def record_locations(locations: list) -> int:
+    known = known_riders.filter(location.delivery_person_id for location in locations)
+    accepted = 0
+    for location in locations:
+        if location.delivery_person_id not in known:
+            continue
+        recorded_at = location.recorded_at.timestamp() if location.recorded_at else None
+        if location_store.update(location.delivery_person_id, location.latitude, location.longitude, recorded_at):
+            dispatcher.move(location.delivery_person_id, location.latitude, location.longitude)
+            accepted += 1
+    return accepted
@@ -0,0 +1,258 @@
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from uuid import UUID
+from datetime import datetime, timezone
+import logging
+import re
+import uuid
+from app.models.menu_items import MenuItem
+from app.models.addons import Addons
+from app.models.menu_item_addons import MenuItemAddons
+from app.models.menu_item_embedding import MenuItemEmbedding
+from app.schemas.menu_items import MenuItemCreate, MenuItemOption
+from app.schemas.addons import AddonsCreate
+from app.db.unit_of_work import after_commit, unit_of_work
+from app.utils.embedding import generate_menu_item_embedding, get_menu_item_text
+from app.utils.catalogue import ADDONS, RESTAURANTS, catalogue_cache, invalidate_restaurant_menu
+
+NON_WORD_PATTERN = re.compile(r"[^\w\s]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_name(name: str) -> str:
+    name = NON_WORD_PATTERN.sub(" ", (name or "").lower())
+    return WHITESPACE_PATTERN.sub(" ", name).strip()
+
+
+def build_menu_item_create(restaurant_id: UUID, item_data: dict) -> MenuItemCreate:
+    options_data = item_data.get("options") or []
+    if not options_data and "price" in item_data:
+        options_data = [{"name": "Regular", "price": item_data["price"]}]
+
+    options = [
+        MenuItemOption(
+            name=option["name"],
+            description=option.get("description"),
+            price=option["price"]
+        ) for option in options_data
+    ]
+
+    return MenuItemCreate(
+        restaurant_id=restaurant_id,
+        name=item_data["name"],
+        description=item_data.get("description", None),
+        options=options,
+        tags=item_data.get("tags") or [],
+        allergens=item_data.get("allergens") or []
+    )
+
+
+def build_addon_create(addon_data: dict) -> AddonsCreate:
+    return AddonsCreate(
+        name=addon_data["name"],
+        options=addon_data.get("options") or [{"name": "Regular", "price": addon_data.get("price", 0)}]
+    )
+
+
+def _merge_entry(existing: dict, entry: dict):
+    if not existing.get("description") and entry.get("description"):
+        existing["description"] = entry["description"]
+
+    option_names = {normalize_name(option.get("name")) for option in existing.get("options") or []}
+    for option in entry.get("options") or []:
+        if normalize_name(option.get("name")) not in option_names:
+            existing.setdefault("options", []).append(option)
+            option_names.add(normalize_name(option.get("name")))
+
+    for field in ("tags", "allergens"):
+        values = existing.get(field) or []
+        values.extend(value for value in entry.get(field) or [] if value not in values)
+        existing[field] = values
+
+
+def merge_menu_pages(pages: list) -> dict:
+    merged = {"menu_items": {}, "global_addons": {}}
+    for page in pages:
+        for key, entries in merged.items():
+            for entry in page.get(key, []):
+                name = normalize_name(entry.get("name"))
+                if not name:
+                    continue
+                if name in entries:
+                    _merge_entry(entries[name], entry)
+                else:
+                    entries[name] = dict(entry)
+    return {key: list(entries.values()) for key, entries in merged.items()}
+
+
+def _menu_item_fields(menu_item) -> dict:
+    return {
+        "name": menu_item.name,
+        "description": menu_item.description,
+        "options": [
+            {"name": option.get("name"), "description": option.get("description"), "price": float(option.get("price") or 0)}
+            for option in menu_item.options or []
+        ],
+        "tags": list(menu_item.tags or []),
+        "allergens": list(menu_item.allergens or []),
+    }
+
+
+def _addon_options(addon) -> list:
+    return [
+        {"name": option.get("name"), "description": option.get("description"), "price": float(option.get("price") or 0)}
+        for option in addon.options or []
+    ]
+
+
+# Re-imports are diffed against the restaurant's current catalogue by normalized
+# name: only changed items are written and only items whose embedding text
+# changed are re-embedded, so the cost follows the size of the change.
+class MenuImport:
+    def __init__(self, db: Session, restaurant):
+        self.db = db
+        self.restaurant = restaurant
+        self.version = int((restaurant.meta or {}).get("menu_version", 0)) + 1
+        self.stats = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0, "embedded": 0, "addons": 0, "links": 0}
+
+        self.existing_items = {}
+        existing = db.query(MenuItem).filter(MenuItem.restaurant_id == restaurant.id).all()
+        for menu_item in existing:
+            name = normalize_name(menu_item.name)
+            current = self.existing_items.get(name)
+            if current is None or (current.deleted_at is not None and menu_item.deleted_at is None):
+                self.existing_items[name] = menu_item
+
+        self.existing_links = set(
+            db.query(MenuItemAddons.menu_item_id, MenuItemAddons.addon_id)
+            .join(MenuItem, MenuItem.id == MenuItemAddons.menu_item_id)
+            .filter(MenuItem.restaurant_id == restaurant.id)
+            .all()
+        )
+        addon_ids = {addon_id for _, addon_id in self.existing_links}
+        self.existing_addons = {}
+        if addon_ids:
+            for addon in db.query(Addons).filter(Addons.id.in_(addon_ids)).all():
+                self.existing_addons.setdefault(normalize_name(addon.name), addon)
+
+        self.menu_items = {}
+        self.addons = {}
+
+    def _stamp(self, obj):
+        obj.meta = {**(obj.meta or {}), "menu_version": self.version}
+
+    def _embed(self, menu_item, is_new: bool):
+        embedding = generate_menu_item_embedding(menu_item)
+        embedding_obj = None if is_new else self.db.get(MenuItemEmbedding, menu_item.id)
+        if embedding_obj is None:
+            self.db.add(MenuItemEmbedding(menu_item_id=menu_item.id, embedding=embedding, meta={}))
+        else:
+            embedding_obj.embedding = embedding
+        self.stats["embedded"] += 1
+
+    def add_menu_item(self, item_data: dict) -> MenuItem:
+        item_in = build_menu_item_create(self.restaurant.id, item_data).dict()
+        name = normalize_name(item_in["name"])
+        menu_item = self.menu_items.get(name) or self.existing_items.get(name)
+
+        if menu_item is None:
+            menu_item = MenuItem(**item_in)
+            menu_item.id = uuid.uuid4()
+            self._stamp(menu_item)
+            self.db.add(menu_item)
+            self._embed(menu_item, is_new=True)
+            self.stats["inserted"] += 1
+            self.menu_items[name] = menu_item
+            return menu_item
+
+        changed = menu_item.deleted_at is not None
+        if changed:
+            menu_item.deleted_at = None
+
+        if _menu_item_fields(MenuItem(**item_in)) != _menu_item_fields(menu_item):
+            old_text = get_menu_item_text(menu_item)
+            for field in ("name", "description", "options", "tags", "allergens"):
+                setattr(menu_item, field, item_in[field])
+            if get_menu_item_text(menu_item) != old_text:
+                self._embed(menu_item, is_new=False)
+            changed = True
+
+        if changed:
+            self._stamp(menu_item)
+            self.stats["updated"] += 1
+        elif name not in self.menu_items:
+            self.stats["unchanged"] += 1
+        self.menu_items[name] = menu_item
+        return menu_item
+
+    def add_addon(self, addon_data: dict) -> Addons:
+        addon_in = build_addon_create(addon_data).dict()
+        name = normalize_name(addon_in["name"])
+        addon = self.addons.get(name) or self.existing_addons.get(name)
+
+        if addon is None:
+            addon = Addons(**addon_in)
+            addon.id = uuid.uuid4()
+            self._stamp(addon)
+            self.db.add(addon)
+            self.stats["addons"] += 1
+        elif addon.name != addon_in["name"] or _addon_options(addon) != _addon_options(Addons(**addon_in)):
+            addon.name = addon_in["name"]
+            addon.options = addon_in["options"]
+            self._stamp(addon)
+            self.stats["addons"] += 1
+        self.addons[name] = addon
+        return addon
+
+    def add(self, key: str, entry: dict):
+        if key == "menu_items":
+            return self.add_menu_item(entry)
+        return self.add_addon(entry)
+
+    def _apply_deletes_and_links(self):
+        now = datetime.now(timezone.utc)
+        active_ids = {menu_item.id for menu_item in self.menu_items.values()}
+        for menu_item in self.existing_items.values():
+            if menu_item.deleted_at is None and menu_item.id not in active_ids:
+                menu_item.deleted_at = now
+                self._stamp(menu_item)
+                self.stats["deleted"] += 1
+
+        addon_ids = {addon.id for addon in self.addons.values()}
+        wanted_links = {(menu_item_id, addon_id) for menu_item_id in active_ids for addon_id in addon_ids}
+        new_links = wanted_links - self.existing_links
+        self.db.add_all(
+            MenuItemAddons(menu_item_id=menu_item_id, addon_id=addon_id)
+            for menu_item_id, addon_id in new_links
+        )
+        stale_links = [(menu_item_id, addon_id) for menu_item_id, addon_id in self.existing_links - wanted_links if menu_item_id in active_ids]
+        self.stats["links"] += len(new_links) + len(stale_links)
+        if stale_links:
+            self.db.query(MenuItemAddons).filter(
+                tuple_(MenuItemAddons.menu_item_id, MenuItemAddons.addon_id).in_(stale_links)
+            ).delete(synchronize_session=False)
+
+    def _changed(self) -> bool:
+        return any(self.stats[key] for key in ("inserted", "updated", "deleted", "addons", "links"))
+
+    def _invalidate(self):
+        invalidate_restaurant_menu(self.restaurant.id)
+        catalogue_cache.invalidate([(RESTAURANTS,)])
+        if self.stats["addons"]:
+            catalogue_cache.invalidate_prefix(ADDONS)
+
+    # Joins the caller's unit of work when there is one, so the import commits or
+    # rolls back together with whatever the caller wrote alongside it.
+    def commit(self):
+        with unit_of_work(self.db):
+            self._apply_deletes_and_links()
+            if self._changed():
+                self.restaurant.meta = {
+                    **(self.restaurant.meta or {}),
+                    "menu_version": self.version,
+                    "menu_imported_at": datetime.now(timezone.utc).isoformat(),
+                }
+                self.db.add(self.restaurant)
+                after_commit(self.db, self._invalidate)
+
+        logging.info(f"Menu import for restaurant {self.restaurant.id} (version {self.version}): {self.stats}")
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import logging
+import threading
+from app.core.config import settings
+from app.core.serialization import dumps, get_serializer
+from app.db.notify import PROCESS_ID, listener, publish_many
+from app.db.session import SessionLocal
+from app.models.notification import Notification
+from app.schemas.notification import NotificationOut
+
+NOTIFICATION_CHANNEL = "notifications"
+# pg_notify payloads are capped at 8000 bytes; notifications that don't fit are
+# sent as a reference and loaded from the database by the receiving worker.
+PAYLOAD_MAX_BYTES = 7500
+SEEN_IDS_PER_EVENT = 100
+
+
+class Subscription:
+    def __init__(self, user_id: str, loop, maxsize: int):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+
+    def _put(self, event: dict):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    def put(self, event: dict):
+        self.loop.call_soon_threadsafe(self._put, event)
+
+
+# Per-user fan-out to the open streams in this worker. Events can be delivered
+# from any thread; each subscription hands them to its own event loop. A slow
+# client loses its oldest queued events rather than holding memory.
+class NotificationHub:
+    def __init__(self, queue_size: int = settings.NOTIFICATION_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id) -> Subscription:
+        subscription = Subscription(str(user_id), asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(subscription.user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[subscription.user_id]
+
+    def has_subscribers(self, user_id) -> bool:
+        return str(user_id) in self._subscribers
+
+    def deliver(self, user_id, event: dict):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(str(user_id), ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+
+notification_hub = NotificationHub()
+
+
+def _deliver(events: list):
+    for user_id, event in events:
+        notification_hub.deliver(user_id, event)
+
+
+def _payloads(events: list):
+    batch, size = [], 0
+    for user_id, event in events:
+        encoded = dumps({"user_id": user_id, **event})
+        if len(encoded) > PAYLOAD_MAX_BYTES:
+            encoded = dumps({"user_id": user_id, "event": event["event"], "ref": event["data"]["id"]})
+        if batch and size + len(encoded) > PAYLOAD_MAX_BYTES:
+            yield _payload(batch)
+            batch, size = [], 0
+        batch.append(encoded)
+        size += len(encoded) + 1
+    if batch:
+        yield _payload(batch)
+
+
+def _payload(batch: list) -> str:
+    return (b'{"origin":' + dumps(PROCESS_ID) + b',"events":[' + b",".join(batch) + b"]}").decode()
+
+
+def _publish(events: list):
+    _deliver(events)
+    if not settings.NOTIFICATIONS_NOTIFY or not events:
+        return
+    try:
+        publish_many(NOTIFICATION_CHANNEL, list(_payloads(events)))
+    except Exception as e:
+        logging.error(f"Failed to publish notifications: {e}")
+
+
+def notification_event(notification) -> dict:
+    return {"event": "notification", "data": get_serializer(NotificationOut)(notification)}
+
+
+def publish_notifications(notifications: list):
+    events = [notification_event(notification) for notification in notifications]
+    _publish([(str(event["data"]["user_id"]), event) for event in events])
+
+
+def _fanout_event(template: dict, notification_id, user_id) -> dict:
+    return notification_event({**template, "id": notification_id, "user_id": user_id})
+
+
+# Fan-out notifications share everything but (id, user_id), so other workers get
+# the template once per payload plus the pairs, and expand only the pairs whose
+# user has an open stream there.
+def publish_fanout(template: dict, pairs: list):
+    _deliver([
+        (str(user_id), _fanout_event(template, notification_id, user_id))
+        for notification_id, user_id in pairs
+        if notification_hub.has_subscribers(user_id)
+    ])
+    if not settings.NOTIFICATIONS_NOTIFY or not pairs:
+        return
+    head = b'{"origin":' + dumps(PROCESS_ID) + b',"template":' + dumps(template) + b',"pairs":['
+    payloads, batch, size = [], [], len(head)
+    for pair in pairs:
+        encoded = dumps([str(pair[0]), str(pair[1])])
+        if batch and size + len(encoded) > PAYLOAD_MAX_BYTES:
+            payloads.append((head + b",".join(batch) + b"]}").decode())
+            batch, size = [], len(head)
+        batch.append(encoded)
+        size += len(encoded) + 1
+    if batch:
+        payloads.append((head + b",".join(batch) + b"]}").decode())
+    try:
+        publish_many(NOTIFICATION_CHANNEL, payloads)
+    except Exception as e:
+        logging.error(f"Failed to publish notifications: {e}")
+
+
+def publish_seen(user_id, ids: list):
+    ids = [str(id) for id in ids]
+    _publish([
+        (str(user_id), {"event": "seen", "data": {"ids": ids[start:start + SEEN_IDS_PER_EVENT]}})
+        for start in range(0, len(ids), SEEN_IDS_PER_EVENT)
+    ])
+
+
+def sse_message(event: dict) -> bytes:
+    return b"event: " + event["event"].encode() + b"\ndata: " + dumps(event["data"]) + b"\n\n"
+
+
+def _load_events(refs: list) -> list:
+    db = SessionLocal()
+    try:
+        notifications = db.query(Notification).filter(Notification.id.in_(refs)).all()
+        return [(str(notification.user_id), notification_event(notification)) for notification in notifications]
+    finally:
+        db.close()
+
+
+def _on_notification(payload: str):
+    message = json.loads(payload)
+    if message.get("origin") == PROCESS_ID:
+        return
+    if "template" in message:
+        _deliver([
+            (user_id, _fanout_event(message["template"], notification_id, user_id))
+            for notification_id, user_id in message["pairs"]
+            if notification_hub.has_subscribers(user_id)
+        ])
+        return
+    events, refs = [], []
+    for event in message.get("events", []):
+        user_id = event.pop("user_id")
+        if not notification_hub.has_subscribers(user_id):
+            continue
+        if "ref" in event:
+            refs.append(event["ref"])
+        else:
+            events.append((user_id, event))
+    if refs:
+        events.extend(_load_events(refs))
+    _deliver(events)
+
+
+def register_notification_listener():
+    if settings.NOTIFICATIONS_NOTIFY:
+        listener.subscribe(NOTIFICATION_CHANNEL, _on_notification)
@@ -1,26 +1,22 @@
 from sqlalchemy.orm import Session
 from uuid import UUID
 from PIL import Image
-from app.repositories.repository import (
-    MenuItemRepository,
-    AddonsRepository,
-    MenuItemAddonsRepository,
-    RestaurantRepository,
-)
-from app.schemas.menu_items import MenuItemCreate, MenuItemOption
-from app.schemas.addons import AddonsCreate
-from app.schemas.menu_item_addons import MenuItemAddonsCreate
+from concurrent.futures import ThreadPoolExecutor
+from app.repositories.repository import RestaurantRepository
 from app.core.errors import NotFoundError, BadRequestError
 import logging
 from app.core.config import settings
 import google.generativeai as genai
-import json
-from app.models.filters import GetMenuItemFilters
-from app.utils.embedding import create_menu_item_embedding
+from app.utils.file import rasterize_menu_files
+from app.utils.json_stream import JSONArrayStreamParser
+from app.utils.menu_import import MenuImport, merge_menu_pages
+from app.utils.tesseract import ocr_menu_image
 
 genai.configure(api_key=settings.GEMINI_API_KEY)
 
-def extract_menu_data_from_image(file_path: str) -> dict:
+MENU_DATA_KEYS = ("menu_items", "global_addons")
+
+def stream_menu_data_from_image(file_path: str):
     try:
         img = Image.open(file_path)
         
@@ -105,20 +101,63 @@ def extract_menu_data_from_image(file_path: str) -> dict:
 
         model = genai.GenerativeModel('gemini-1.5-flash')
         response = model.generate_content([prompt, img], stream=True)
-        response.resolve()
-        
-        raw_json = response.text.strip().replace('```json', '').replace('```', '')
-        return json.loads(raw_json)
+
+        parser = JSONArrayStreamParser(MENU_DATA_KEYS)
+        for chunk in response:
+            for key, entry in parser.feed(chunk.text):
+                yield key, entry
 
     except Exception as e:
         logging.error(f"Error with Gemini API: {e}")
         raise BadRequestError(f"Failed to extract menu data from image: {e}")
 
 
-def process_menu_image(db: Session, file_path: str, restaurant_id: UUID):
-    menu_item_repo = MenuItemRepository()
-    addon_repo = AddonsRepository()
-    menu_item_addon_repo = MenuItemAddonsRepository()
+def extract_menu_data_from_image(file_path: str) -> dict:
+    menu_data = {key: [] for key in MENU_DATA_KEYS}
+    for key, entry in stream_menu_data_from_image(file_path):
+        menu_data[key].append(entry)
+    return menu_data
+
+
+def stream_menu_data(file_path: str):
+    mode = settings.OCR_MODE
+    if mode in ("local", "hybrid"):
+        try:
+            menu_data, confidence = ocr_menu_image(file_path)
+        except Exception as e:
+            if mode == "local":
+                logging.error(f"Error with local OCR: {e}")
+                raise BadRequestError(f"Failed to extract menu data with local OCR: {e}")
+            logging.warning(f"Local OCR failed for {file_path}, falling back to vision model: {e}")
+        else:
+            if mode == "local" or confidence >= settings.OCR_MIN_CONFIDENCE:
+                logging.info(f"Extracted {len(menu_data['menu_items'])} menu items from {file_path} with local OCR (confidence {confidence:.1f})")
+                yield from iter_menu_data(menu_data)
+                return
+            logging.info(f"Local OCR confidence {confidence:.1f} below {settings.OCR_MIN_CONFIDENCE} for {file_path}, falling back to vision model")
+    yield from stream_menu_data_from_image(file_path)
+
+
+def extract_menu_data(file_path: str) -> dict:
+    menu_data = {key: [] for key in MENU_DATA_KEYS}
+    for key, entry in stream_menu_data(file_path):
+        menu_data[key].append(entry)
+    return menu_data
+
+
+def extract_menu_pages(page_paths: list) -> list:
+    workers = max(1, min(settings.MENU_PAGE_WORKERS, len(page_paths)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(extract_menu_data, page_paths))
+
+
+def iter_menu_data(menu_data: dict):
+    for key in MENU_DATA_KEYS:
+        for entry in menu_data.get(key, []):
+            yield key, entry
+
+
+def process_menu_files(db: Session, file_paths: list, restaurant_id: UUID):
     restaurant_repo = RestaurantRepository()
 
     restaurant = restaurant_repo.get(db, id=restaurant_id)
@@ -126,49 +165,28 @@ def process_menu_image(db: Session, file_path: str, restaurant_id: UUID):
         raise NotFoundError(f"Restaurant with id {restaurant_id} not found.")
 
     try:
-        menu_data = extract_menu_data_from_image(file_path)
-
-        for item_data in menu_data.get("menu_items", []):
-            options_data = item_data.get("options", [])
-            if not options_data and "price" in item_data:
-                options_data = [{"name": "Regular", "price": item_data["price"]}]
-            
-            options = [
-                MenuItemOption(
-                    name=option["name"],
-                    description=option.get("description"),
-                    price=option["price"]
-                ) for option in options_data
-            ]
-
-            menu_item_create = MenuItemCreate(
-                restaurant_id=restaurant_id,
-                name=item_data["name"],
-                description=item_data.get("description", None),
-                options=options,
-                tags=item_data.get("tags", []),
-                allergens=item_data.get("allergens", [])
-            )
-            menu_item = menu_item_repo.create(db, obj_in=menu_item_create)
-            create_menu_item_embedding(db, menu_item.id, menu_item)
-
-        for addon_data in menu_data.get("global_addons", []):
-            addon_create = AddonsCreate(
-                name=addon_data["name"],
-                options=addon_data.get("options", [{"name": "Regular", "price": addon_data.get("price", 0)}])
-            )
-            addon = addon_repo.create(db, obj_in=addon_create)
-
-            filters = GetMenuItemFilters(restaurant_id=restaurant_id)
-            menu_items = menu_item_repo.get(db, filters=filters)
-            for menu_item in menu_items:
-                menu_item_addon_create = MenuItemAddonsCreate(
-                    menu_item_id=menu_item.id,
-                    addon_id=addon.id
-                )
-                menu_item_addon_repo.create(db, obj_in=menu_item_addon_create)
-
-        logging.info(f"Successfully processed menu for restaurant {restaurant_id} from file {file_path}")
+        page_paths = rasterize_menu_files(file_paths)
+        if not page_paths:
+            raise BadRequestError("No menu pages found in uploaded files")
+
+        if len(page_paths) == 1:
+            # Items are staged and embedded as they arrive from the stream, so
+            # ingestion overlaps with the model still generating the rest of the menu.
+            menu_data = stream_menu_data(page_paths[0])
+        else:
+            menu_data = iter_menu_data(merge_menu_pages(extract_menu_pages(page_paths)))
+
+        menu_import = MenuImport(db, restaurant)
+        for key, entry in menu_data:
+            menu_import.add(key, entry)
+        menu_import.commit()
+
+        logging.info(f"Successfully processed menu for restaurant {restaurant_id} from {len(page_paths)} pages")
     except Exception as e:
+        db.rollback()
         logging.error(f"Failed to process menu for restaurant {restaurant_id}: {e}")
-        raise BadRequestError(f"Error processing menu file: {e}") 
\ No newline at end of file
+        raise BadRequestError(f"Error processing menu file: {e}")
+
+
+def process_menu_image(db: Session, file_path: str, restaurant_id: UUID):
+    process_menu_files(db, [file_path], restaurant_id)
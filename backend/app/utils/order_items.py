@@ -0,0 +1,100 @@
+from decimal import Decimal
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from uuid import UUID
+import argparse
+import logging
+import uuid
+from app.core.errors import BadRequestError
+from app.utils.catalogue import active_promotion, get_price_table
+from app.utils.pricing import to_cents
+
+# Turns the legacy order.meta['items'] entries into order_items rows, matching each
+# entry to the order's restaurant by menu_item_id or, failing that, by name.
+BACKFILL_SQL = text(
+    "INSERT INTO order_items (order_id, menu_item_id, name, option_name, quantity, unit_price, meta) "
+    "SELECT o.id, m.id, m.name, item->>'option', "
+    "CASE WHEN item->>'quantity' ~ '^[1-9][0-9]*$' THEN (item->>'quantity')::int ELSE 1 END, "
+    "CASE WHEN item->>'price' ~ '^[0-9]+(\\.[0-9]+)?$' THEN (item->>'price')::numeric "
+    "WHEN m.options->0->>'price' ~ '^[0-9]+(\\.[0-9]+)?$' THEN (m.options->0->>'price')::numeric ELSE 0 END, "
+    "jsonb_build_object('backfilled', true) "
+    "FROM orders o "
+    "CROSS JOIN LATERAL jsonb_array_elements(o.meta->'items') AS item "
+    "JOIN LATERAL ("
+    "SELECT mi.id, mi.name, mi.options FROM menu_items mi "
+    "WHERE mi.restaurant_id = o.restaurant_id "
+    "AND (mi.id::text = item->>'menu_item_id' OR lower(mi.name) = lower(item->>'name')) "
+    "ORDER BY (mi.id::text = item->>'menu_item_id') DESC NULLS LAST, mi.deleted_at IS NOT NULL "
+    "LIMIT 1"
+    ") m ON true "
+    "WHERE o.id = ANY(CAST(:order_ids AS uuid[]))"
+)
+
+PENDING_ORDERS_SQL = text(
+    "SELECT o.id FROM orders o "
+    "WHERE jsonb_typeof(o.meta->'items') = 'array' "
+    "AND (CAST(:last_id AS uuid) IS NULL OR o.id > CAST(:last_id AS uuid)) "
+    "AND NOT EXISTS (SELECT 1 FROM order_items oi WHERE oi.order_id = o.id) "
+    "ORDER BY o.id LIMIT :limit"
+)
+
+
+# Prices the order from the restaurant's cached price table and active promotion.
+# Client-supplied unit prices are only accepted when they match the server's.
+def build_order_items(db: Session, restaurant_id, items: list) -> tuple:
+    restaurant_id = UUID(str(restaurant_id))
+    table = get_price_table(db, restaurant_id)
+    promotion = active_promotion(db, restaurant_id)
+    rows, total_cents = [], 0
+    for item in items:
+        if item.quantity <= 0:
+            raise BadRequestError("Quantity must be greater than 0")
+        name, unit_cents, addons = table.quote(item.menu_item_id, item.option_name, item.addons or (), promotion)
+        if item.unit_price is not None and to_cents(item.unit_price) != unit_cents:
+            raise BadRequestError(f"Unit price {item.unit_price} for menu item {item.menu_item_id} does not match {unit_cents / 100}")
+        meta = dict(item.meta or {})
+        if addons:
+            meta["addons"] = addons
+        if promotion is not None:
+            meta["promotion_id"] = str(promotion.id)
+        rows.append({
+            "id": uuid.uuid4(),
+            "menu_item_id": item.menu_item_id,
+            "name": name,
+            "option_name": item.option_name,
+            "quantity": item.quantity,
+            "unit_price": Decimal(unit_cents) / 100,
+            "meta": meta,
+        })
+        total_cents += unit_cents * item.quantity
+    return rows, Decimal(total_cents) / 100
+
+
+def backfill_order_items(db: Session, batch_size: int = 500) -> int:
+    inserted = 0
+    last_id = None
+    while True:
+        order_ids = db.execute(PENDING_ORDERS_SQL, {"last_id": last_id, "limit": batch_size}).scalars().all()
+        if not order_ids:
+            break
+        result = db.execute(BACKFILL_SQL, {"order_ids": [str(order_id) for order_id in order_ids]})
+        db.commit()
+        inserted += result.rowcount
+        last_id = str(order_ids[-1])
+        logging.info(f"Backfilled {result.rowcount} order items for {len(order_ids)} orders")
+    return inserted
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Backfill order_items from orders.meta['items']")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        print(f"Inserted {backfill_order_items(db, batch_size=args.batch_size)} order items")
+    finally:
+        db.close()
@@ -0,0 +1,276 @@
+from array import array
+from datetime import datetime, timezone
+from sqlalchemy import delete, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert
+import json
+import logging
+import math
+import threading
+import time
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.db.notify import PROCESS_ID, listener, publish_many
+from app.db.session import SessionLocal
+from app.models.menu_item_popularity import MenuItemPopularity
+from app.models.menu_items import MenuItem
+
+POPULARITY_CHANNEL = "popularity"
+PAYLOAD_MAX_BYTES = 7500
+
+BUCKET_SECONDS = 300
+WINDOWS = (("1h", 3600, 0.5), ("24h", 86400, 0.3), ("7d", 604800, 0.2))
+# A favorite is a stronger signal of intent than a single ordered portion.
+FAVORITE_WEIGHT = 2.0
+ORDERS, FAVORITES = 0, 1
+
+
+# Order and favorite counts per menu item over sliding windows. Events land in
+# BUCKET_SECONDS buckets; each window keeps running totals in float arrays
+# indexed by a slot per menu item, and a bucket is subtracted from a window's
+# totals once time moves past it, so reads are array lookups and expiry only
+# touches the items that had events in the expiring bucket. Deltas are written
+# to menu_item_popularity every flush_interval (and broadcast to other workers
+# when POPULARITY_NOTIFY is on); the last week is reloaded on startup.
+class PopularityCounters:
+    def __init__(self, bucket_seconds: int = BUCKET_SECONDS, windows: tuple = WINDOWS, flush_interval: float = settings.POPULARITY_FLUSH_SECONDS):
+        self.bucket_seconds = bucket_seconds
+        self.windows = windows
+        self.spans = [max(1, span // bucket_seconds) for _, span, _ in windows]
+        self.flush_interval = flush_interval
+        self._slots = {}
+        self._totals = [(array("d"), array("d")) for _ in windows]
+        self._buckets = {}
+        self._current = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _bucket(self, at: float = None) -> int:
+        return int((time.time() if at is None else at) // self.bucket_seconds)
+
+    def _slot(self, menu_item_id: str) -> int:
+        slot = self._slots.get(menu_item_id)
+        if slot is None:
+            slot = self._slots[menu_item_id] = len(self._slots)
+            for totals in self._totals:
+                for column in totals:
+                    column.append(0.0)
+        return slot
+
+    def _advance(self, bucket: int):
+        if self._current is None:
+            self._current = bucket
+            return
+        if bucket <= self._current:
+            return
+        for totals, span in zip(self._totals, self.spans):
+            for b in [b for b in self._buckets if self._current - span < b <= bucket - span]:
+                for slot, counts in self._buckets[b].items():
+                    totals[ORDERS][slot] -= counts[ORDERS]
+                    totals[FAVORITES][slot] -= counts[FAVORITES]
+        oldest = bucket - max(self.spans)
+        for b in [b for b in self._buckets if b <= oldest]:
+            del self._buckets[b]
+        self._current = bucket
+
+    def _add(self, menu_item_id: str, bucket: int, orders: int, favorites: int):
+        self._advance(bucket)
+        if bucket <= self._current - max(self.spans):
+            return
+        slot = self._slot(menu_item_id)
+        counts = self._buckets.setdefault(bucket, {}).setdefault(slot, [0, 0])
+        counts[ORDERS] += orders
+        counts[FAVORITES] += favorites
+        for totals, span in zip(self._totals, self.spans):
+            if bucket > self._current - span:
+                totals[ORDERS][slot] += orders
+                totals[FAVORITES][slot] += favorites
+
+    def record(self, menu_item_id, orders: int = 0, favorites: int = 0, at: float = None):
+        menu_item_id = str(menu_item_id)
+        bucket = self._bucket(at)
+        with self._lock:
+            self._add(menu_item_id, bucket, orders, favorites)
+            pending = self._pending.setdefault((menu_item_id, bucket), [0, 0])
+            pending[ORDERS] += orders
+            pending[FAVORITES] += favorites
+
+    def record_order_items(self, items: list, at: float = None):
+        for item in items:
+            self.record(item["menu_item_id"], orders=item.get("quantity") or 1, at=at)
+
+    def counts(self, menu_item_id) -> dict:
+        with self._lock:
+            self._advance(self._bucket())
+            slot = self._slots.get(str(menu_item_id))
+            return {
+                name: {
+                    "orders": int(totals[ORDERS][slot]) if slot is not None else 0,
+                    "favorites": int(totals[FAVORITES][slot]) if slot is not None else 0,
+                }
+                for (name, _, _), totals in zip(self.windows, self._totals)
+            }
+
+    def score(self, menu_item_id) -> float:
+        with self._lock:
+            self._advance(self._bucket())
+            slot = self._slots.get(str(menu_item_id))
+            if slot is None:
+                return 0.0
+            return sum(
+                weight * math.log1p(max(totals[ORDERS][slot] + FAVORITE_WEIGHT * totals[FAVORITES][slot], 0.0))
+                for (_, _, weight), totals in zip(self.windows, self._totals)
+            )
+
+    def boost(self, menu_item_id) -> float:
+        return min(settings.POPULARITY_MAX_BOOST, settings.POPULARITY_WEIGHT * self.score(menu_item_id))
+
+    def _bucket_start(self, bucket: int) -> datetime:
+        return datetime.fromtimestamp(bucket * self.bucket_seconds, timezone.utc)
+
+    def drain(self) -> list:
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+        return [(menu_item_id, bucket, counts[ORDERS], counts[FAVORITES]) for (menu_item_id, bucket), counts in pending.items()]
+
+    def _requeue(self, deltas: list):
+        with self._lock:
+            for menu_item_id, bucket, orders, favorites in deltas:
+                pending = self._pending.setdefault((menu_item_id, bucket), [0, 0])
+                pending[ORDERS] += orders
+                pending[FAVORITES] += favorites
+
+    def flush(self, db) -> int:
+        deltas = self.drain()
+        if not deltas:
+            return 0
+        try:
+            try:
+                self._write_deltas(db, deltas)
+            except IntegrityError:
+                # A menu item was deleted since its events were recorded; the
+                # deltas for items that still exist are written without it.
+                db.rollback()
+                deltas = self._existing(db, deltas)
+                if deltas:
+                    self._write_deltas(db, deltas)
+        except Exception:
+            db.rollback()
+            self._requeue(deltas)
+            raise
+        self._publish(deltas)
+        return len(deltas)
+
+    def _existing(self, db, deltas: list) -> list:
+        ids = {menu_item_id for menu_item_id, _, _, _ in deltas}
+        existing = {str(menu_item_id) for menu_item_id, in db.query(MenuItem.id).filter(MenuItem.id.in_(ids))}
+        return [delta for delta in deltas if delta[0] in existing]
+
+    def _write_deltas(self, db, deltas: list):
+        table = MenuItemPopularity.__table__
+        statement = insert(table)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[table.c.menu_item_id, table.c.bucket_start],
+                set_={
+                    "orders": table.c.orders + statement.excluded.orders,
+                    "favorites": table.c.favorites + statement.excluded.favorites,
+                },
+            ),
+            [
+                {"menu_item_id": menu_item_id, "bucket_start": self._bucket_start(bucket), "orders": orders, "favorites": favorites}
+                for menu_item_id, bucket, orders, favorites in deltas
+            ],
+        )
+        cutoff = self._bucket_start(self._bucket() - max(self.spans))
+        db.execute(delete(MenuItemPopularity).where(MenuItemPopularity.bucket_start < cutoff))
+        db.commit()
+
+    def load(self, db) -> int:
+        cutoff = self._bucket_start(self._bucket() - max(self.spans) + 1)
+        rows = (
+            db.query(MenuItemPopularity.menu_item_id, func.extract("epoch", MenuItemPopularity.bucket_start), MenuItemPopularity.orders, MenuItemPopularity.favorites)
+            .filter(MenuItemPopularity.bucket_start >= cutoff)
+            .all()
+        )
+        self.apply([(menu_item_id, self._bucket(float(started)), orders, favorites) for menu_item_id, started, orders, favorites in rows])
+        return len(rows)
+
+    def apply(self, deltas: list):
+        with self._lock:
+            for menu_item_id, bucket, orders, favorites in deltas:
+                self._add(str(menu_item_id), bucket, orders, favorites)
+
+    def _publish(self, deltas: list):
+        if not settings.POPULARITY_NOTIFY:
+            return
+        head = b'{"origin":' + dumps(PROCESS_ID) + b',"deltas":['
+        payloads, batch, size = [], [], len(head)
+        for delta in deltas:
+            encoded = dumps(delta)
+            if batch and size + len(encoded) > PAYLOAD_MAX_BYTES:
+                payloads.append((head + b",".join(batch) + b"]}").decode())
+                batch, size = [], len(head)
+            batch.append(encoded)
+            size += len(encoded) + 1
+        if batch:
+            payloads.append((head + b",".join(batch) + b"]}").decode())
+        try:
+            publish_many(POPULARITY_CHANNEL, payloads)
+        except Exception as e:
+            logging.error(f"Failed to publish popularity deltas: {e}")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="popularity-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._write()
+
+    def _write(self):
+        db = SessionLocal()
+        try:
+            self.flush(db)
+        except Exception as e:
+            logging.error(f"Failed to write popularity counters: {e}")
+        finally:
+            db.close()
+
+    def _run(self):
+        db = SessionLocal()
+        try:
+            logging.info(f"Loaded {self.load(db)} popularity buckets")
+        except Exception as e:
+            logging.error(f"Failed to load popularity counters: {e}")
+        finally:
+            db.close()
+        while not self._stop.wait(self.flush_interval):
+            self._write()
+
+
+popularity = PopularityCounters()
+
+
+def _on_popularity(payload: str):
+    message = json.loads(payload)
+    if message.get("origin") == PROCESS_ID:
+        return
+    popularity.apply(message.get("deltas", []))
+
+
+def register_popularity_listener():
+    if settings.POPULARITY_NOTIFY:
+        listener.subscribe(POPULARITY_CHANNEL, _on_popularity)
@@ -0,0 +1,139 @@
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from app.core.errors import BadRequestError
+
+ActivePromotion = namedtuple("ActivePromotion", ["id", "discount_percent", "valid_from", "valid_to"])
+
+CENTS = Decimal("0.01")
+
+
+def pricing_now() -> datetime:
+    # Promotion windows are timestamptz, which psycopg2 returns timezone-aware.
+    return datetime.now(timezone.utc)
+
+
+# A restaurant's promotion windows flattened into consecutive segments between
+# window boundaries, each holding the best discount active throughout it, so the
+# promotion in force at any instant is a single bisect.
+class PromotionIndex:
+    def __init__(self, promotions):
+        promotions = [ActivePromotion(*promotion) for promotion in promotions if promotion[2] < promotion[3]]
+        self._starts = sorted({promotion.valid_from for promotion in promotions} | {promotion.valid_to for promotion in promotions})
+        self._active = [
+            max(
+                (promotion for promotion in promotions if promotion.valid_from <= start < promotion.valid_to),
+                key=lambda promotion: promotion.discount_percent,
+                default=None,
+            )
+            for start in self._starts
+        ]
+
+    def __len__(self):
+        return len(self._starts)
+
+    def active(self, at: datetime):
+        position = bisect_right(self._starts, at) - 1
+        return self._active[position] if position >= 0 else None
+
+    def next_change(self, at: datetime):
+        position = bisect_right(self._starts, at)
+        return self._starts[position] if position < len(self._starts) else None
+
+
+def discounted_price(price, promotion):
+    if promotion is None or price is None:
+        return price
+    try:
+        amount = Decimal(str(price)) * (100 - Decimal(str(promotion.discount_percent))) / 100
+    except InvalidOperation:
+        return price
+    return float(max(amount, Decimal(0)).quantize(CENTS, rounding=ROUND_HALF_UP))
+
+
+def price_options(options, promotion):
+    if not options or promotion is None:
+        return options
+    return [
+        {**option, "discounted_price": discounted_price(option.get("price"), promotion)}
+        for option in options
+    ]
+
+
+def to_cents(price) -> int:
+    try:
+        return int((Decimal(str(price)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, TypeError):
+        return 0
+
+
+def discounted_cents(cents: int, promotion) -> int:
+    if promotion is None:
+        return cents
+    basis_points = to_cents(promotion.discount_percent)
+    return max(cents * (10000 - basis_points) + 5000, 0) // 10000
+
+
+def _option_slots(options) -> tuple:
+    names = {}
+    for position, option in enumerate(options or []):
+        names.setdefault((option.get("name") or "").strip().lower(), position)
+    return names, array("q", (to_cents(option.get("price")) for option in options or []))
+
+
+class PricedItem:
+    __slots__ = ("name", "options", "cents", "addons")
+
+    def __init__(self, name: str, options, addons):
+        self.name = name
+        self.options, self.cents = _option_slots(options)
+        self.addons = frozenset(addons)
+
+
+# A restaurant's menu compiled for pricing: option names resolve to a position in
+# an integer-cents array per menu item and per linked addon, so quoting an order
+# is dictionary and array lookups with no queries. Discounts are applied per
+# component exactly as the menu responses show them.
+class PriceTable:
+    def __init__(self, menu_items, addons, links):
+        linked = {}
+        for menu_item_id, addon_id in links:
+            linked.setdefault(menu_item_id, []).append(addon_id)
+        self.items = {
+            menu_item_id: PricedItem(name, options, linked.get(menu_item_id, ()))
+            for menu_item_id, name, options in menu_items
+        }
+        self.addons = {addon_id: _option_slots(options) for addon_id, options in addons}
+
+    def __len__(self):
+        return len(self.items)
+
+    @staticmethod
+    def _position(names: dict, option_name, label) -> int:
+        if option_name is None:
+            return 0
+        position = names.get(option_name.strip().lower())
+        if position is None:
+            raise BadRequestError(f"Option {option_name} not found for {label}")
+        return position
+
+    def quote(self, menu_item_id, option_name=None, addons=(), promotion=None) -> tuple:
+        item = self.items.get(menu_item_id)
+        if item is None:
+            raise BadRequestError(f"Menu item {menu_item_id} not found")
+        if not item.cents:
+            raise BadRequestError(f"Menu item {menu_item_id} has no priced options")
+        unit_cents = discounted_cents(item.cents[self._position(item.options, option_name, f"menu item {menu_item_id}")], promotion)
+        chosen = []
+        for addon in addons:
+            if addon.addon_id not in item.addons or addon.addon_id not in self.addons:
+                raise BadRequestError(f"Addon {addon.addon_id} is not available for menu item {menu_item_id}")
+            names, cents = self.addons[addon.addon_id]
+            if not cents:
+                raise BadRequestError(f"Addon {addon.addon_id} has no priced options")
+            addon_cents = discounted_cents(cents[self._position(names, addon.option_name, f"addon {addon.addon_id}")], promotion)
+            unit_cents += addon_cents
+            chosen.append({"addon_id": str(addon.addon_id), "option_name": addon.option_name, "price": addon_cents / 100})
+        return item.name, unit_cents, chosen
@@ -0,0 +1,126 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from sqlalchemy import text
+import argparse
+import csv
+import io
+import logging
+import threading
+import time
+import uuid
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.db.session import SessionLocal
+from app.db.unit_of_work import commit
+from app.models.promotions import Promotion
+from app.utils.notifications import publish_fanout
+
+# Everyone who favourited a live item of the restaurant, read once through a
+# server-side cursor and written back in COPY chunks that commit independently.
+AUDIENCE_SQL = text(
+    "SELECT DISTINCT f.user_id FROM favorites f "
+    "JOIN menu_items m ON m.id = f.menu_item_id "
+    "WHERE m.restaurant_id = :restaurant_id AND m.deleted_at IS NULL"
+)
+COPY_SQL = "COPY notifications (id, user_id, title, body, seen, created_at, meta) FROM STDIN WITH (FORMAT csv)"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def promotion_template(promotion: Promotion) -> dict:
+    body = promotion.description or f"{float(promotion.discount_percent):g}% off until {promotion.valid_to:%d %b}"
+    return {
+        "title": promotion.title,
+        "body": body,
+        "seen": False,
+        "created_at": datetime.now(timezone.utc),
+        "meta": {"promotion_id": str(promotion.id), "restaurant_id": str(promotion.restaurant_id)},
+    }
+
+
+def _copy_chunk(db, template: dict, pairs: list):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    created_at = template["created_at"].isoformat()
+    meta = dumps(template["meta"]).decode()
+    for notification_id, user_id in pairs:
+        writer.writerow((notification_id, user_id, template["title"], template["body"], "f", created_at, meta))
+    buffer.seek(0)
+    with db.connection().connection.cursor() as cursor:
+        cursor.copy_expert(COPY_SQL, buffer)
+
+
+def fan_out_promotion(promotion_id, chunk_size: int = None, events_per_second: int = None) -> int:
+    chunk_size = chunk_size or settings.PROMOTION_FANOUT_CHUNK_SIZE
+    events_per_second = events_per_second or settings.PROMOTION_FANOUT_EVENTS_PER_SECOND
+    reader = SessionLocal()
+    writer = SessionLocal()
+    try:
+        promotion = writer.get(Promotion, promotion_id)
+        if promotion is None:
+            logging.warning(f"Promotion {promotion_id} not found, skipping fan-out")
+            return 0
+        template = promotion_template(promotion)
+        result = reader.execute(
+            AUDIENCE_SQL,
+            {"restaurant_id": promotion.restaurant_id},
+            execution_options={"yield_per": chunk_size},
+        )
+        total = 0
+        started = time.monotonic()
+        for rows in result.partitions():
+            pairs = [(uuid.uuid4(), row[0]) for row in rows]
+            _copy_chunk(writer, template, pairs)
+            commit(writer)
+            publish_fanout(template, pairs)
+            total += len(pairs)
+            # Throttle delivery so a large audience doesn't flood streams and pg_notify.
+            delay = total / events_per_second - (time.monotonic() - started)
+            if delay > 0:
+                time.sleep(delay)
+        logging.info(f"Promotion {promotion_id} fanned out to {total} users in {time.monotonic() - started:.1f}s")
+        return total
+    except Exception:
+        writer.rollback()
+        raise
+    finally:
+        reader.close()
+        writer.close()
+
+
+def _run(promotion_id):
+    try:
+        fan_out_promotion(promotion_id)
+    except Exception as e:
+        logging.error(f"Promotion {promotion_id} fan-out failed: {e}")
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="promotion-fanout")
+        return _pool
+
+
+def submit_fanout(promotion_id):
+    _get_pool().submit(_run, promotion_id)
+
+
+def shutdown_fanout_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Notify everyone who favourited a restaurant's items about a promotion")
+    parser.add_argument("promotion_id")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(f"notified {fan_out_promotion(uuid.UUID(args.promotion_id), chunk_size=args.chunk_size)} users")
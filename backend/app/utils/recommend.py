@@ -8,7 +8,8 @@ from app.repositories.repository import (
 )
 import google.generativeai as genai
 from app.core.config import settings
-from app.models.filters import GetMenuItemFilters, GetUserPreferencesFilters, GetFavoritesFilters, GetOrderFilters
+from app.models.filters import GetMenuItemFilters, GetUserPreferencesFilters, GetFavoritesFilters
+from app.utils.popularity import popularity
 
 if hasattr(settings, 'GEMINI_API_KEY'):
     genai.configure(api_key=settings.GEMINI_API_KEY)
@@ -19,7 +20,6 @@ def get_user_profile(db: Session, user_id: str):
     prefs_repo = UserPreferencesRepository()
     fav_repo = FavoritesRepository()
     order_repo = OrderRepository()
-    menu_repo = MenuItemRepository()
 
     prefs_filters = GetUserPreferencesFilters(user_id=user_id)
     prefs_list = prefs_repo.get(db, filters=prefs_filters)
@@ -28,24 +28,7 @@ def get_user_profile(db: Session, user_id: str):
     fav_filters = GetFavoritesFilters(user_id=user_id)
     favorites = fav_repo.get(db, filters=fav_filters)
 
-    order_filters = GetOrderFilters(user_id=user_id)
-    orders = order_repo.get(db, filters=order_filters)
-
-    ordered_names = set()
-    for order in orders:
-        meta = getattr(order, 'meta', {}) or {}
-        items = meta.get('items', [])
-        for item in items:
-            name = item.get('name')
-            if name:
-                ordered_names.add(name.lower())
-
-    ordered_menu_item_ids = set()
-    if ordered_names:
-        menu_items = menu_repo.get(db)
-        for mi in menu_items:
-            if mi.name and mi.name.lower() in ordered_names:
-                ordered_menu_item_ids.add(str(mi.id))
+    ordered_menu_item_ids = order_repo.get_ordered_menu_item_ids(db, user_id)
 
     return {
         "preferences": prefs,
@@ -57,17 +40,18 @@ def get_menu_item_details(db: Session, menu_item_ids):
     menu_repo = MenuItemRepository()
     filters = GetMenuItemFilters()
     filters.id = menu_item_ids
-    items = menu_repo.get(db, filters=filters)
+    items = menu_repo.get(db, filters=filters, fields=("id", "tags", "cuisine", "spice_level"))
     return {str(item.id): item for item in items}
 
 def compute_boost(menu_item, user_profile):
-    boost = 0.0
+    # Global trend signal: recent orders and favorites over sliding windows.
+    boost = popularity.boost(menu_item.id)
     prefs = user_profile["preferences"]
     if not prefs:
         return boost
 
     cuisines = getattr(prefs, 'preferred_cuisines', [])
-    if cuisines and menu_item.meta and menu_item.meta.get("cuisine") in cuisines:
+    if cuisines and menu_item.cuisine in cuisines:
         boost += 0.2
 
     restrictions = getattr(prefs, 'dietary_restrictions', [])
@@ -76,7 +60,7 @@ def compute_boost(menu_item, user_profile):
             boost += 0.1
 
     spice = getattr(prefs, 'spice_tolerance', None)
-    if spice and menu_item.meta and menu_item.meta.get("spice_level") == spice:
+    if spice and menu_item.spice_level == getattr(spice, "value", spice):
         boost += 0.1
 
     if str(menu_item.id) in user_profile["favorite_menu_item_ids"]:
@@ -86,43 +70,67 @@ def compute_boost(menu_item, user_profile):
         boost += 0.1
     return boost
 
-def is_suitable(menu_item, user_profile):
+# Unsuitable items are excluded by the similarity query itself rather than
+# fetched and discarded.
+def get_exclusions(user_profile):
     prefs = user_profile["preferences"]
     if not prefs:
-        return True
-
-    allergies = getattr(prefs, 'allergies', [])
-    if allergies and menu_item.allergens:
-        if any(allergy in menu_item.allergens for allergy in allergies):
-            return False
-
-    restrictions = getattr(prefs, 'dietary_restrictions', [])
-    if restrictions and menu_item.tags:
-        if any(dr in menu_item.tags for dr in restrictions):
-            return False
-    return True
+        return {}
+    return {
+        "exclude_allergens": getattr(prefs, 'allergies', None) or [],
+        "exclude_tags": getattr(prefs, 'dietary_restrictions', None) or [],
+    }
 
-def resolve_query_gemini_top_k(db: Session, user_id: str, query_text: str, k: int = 5):
+def embed_query(query_text: str) -> list:
     response = genai.embed_content(
         model="models/embedding-001",
         content=query_text,
         task_type="RETRIEVAL_QUERY"
     )
-    query_embedding = response['embedding']
+    return response['embedding']
 
-    embedding_repo = MenuItemEmbeddingRepository()
-    top_n = embedding_repo.get_top_k_similar(db, query_embedding, k=30)
-    menu_item_ids = [mid for mid, _ in top_n]
-    menu_items = get_menu_item_details(db, menu_item_ids)
+# Reciprocal-rank fusion: each ranking contributes 1 / (RRF_K + rank) per item,
+# so items near the top of either list surface without calibrating the
+# embedding distances against text-search ranks.
+RRF_K = 60
+
+def reciprocal_rank_fusion(rankings: list, k: int = RRF_K) -> dict:
+    scores = {}
+    for ranking in rankings:
+        for rank, mid in enumerate(ranking, start=1):
+            scores[str(mid)] = scores.get(str(mid), 0.0) + 1.0 / (k + rank)
+    return scores
+
+# A short query whose best text match is a dish name ("chicken 65") is answered
+# from the text index alone, skipping the embedding call.
+def is_lexical_query(query_text: str, lexical: list) -> bool:
+    return bool(lexical) and lexical[0][2] and len(query_text.split()) <= settings.LEXICAL_SHORT_CIRCUIT_MAX_TERMS
+
+def resolve_query_gemini_top_k(db: Session, user_id: str, query_text: str, k: int = 5):
     user_profile = get_user_profile(db, user_id)
+    exclusions = get_exclusions(user_profile)
+    lexical = MenuItemRepository().search(db, query_text, k=30, **exclusions)
+    rankings = [[mid for mid, _, _ in lexical]]
+    if is_lexical_query(query_text, lexical):
+        method = "lexical+personalization"
+    else:
+        embedding_repo = MenuItemEmbeddingRepository()
+        top_n = embedding_repo.get_top_k_similar(db, embed_query(query_text), k=30, **exclusions)
+        rankings.insert(0, [mid for mid, _ in top_n])
+        method = "hybrid_rrf+personalization"
+
+    # Normalised so an item ranked first in every list scores 1.0.
+    fused = reciprocal_rank_fusion(rankings)
+    best = len(rankings) / (RRF_K + 1)
+    menu_items = get_menu_item_details(db, list(fused))
 
     scored_items = []
-    for mid, sim_score in top_n:
-        item = menu_items.get(str(mid))
-        if not item or not is_suitable(item, user_profile):
+    for mid, fused_score in fused.items():
+        item = menu_items.get(mid)
+        if not item:
             continue
         boost = compute_boost(item, user_profile)
-        final_score = sim_score + boost
+        final_score = fused_score / best + boost
         scored_items.append((mid, final_score))
 
     scored_items.sort(key=lambda x: x[1], reverse=True)
@@ -130,26 +138,21 @@ def resolve_query_gemini_top_k(db: Session, user_id: str, query_text: str, k: in
     confidences = {str(mid): float(score) for mid, score in top_k}
     menu_item_ids = [str(mid) for mid, _ in top_k]
 
-    return menu_item_ids, {"confidences": confidences, "method": "embedding_similarity+personalization"}
+    return menu_item_ids, {"confidences": confidences, "method": method}
 
 def resolve_query_gemini_threshold(db: Session, user_id: str, query_text: str, threshold: float = 0.5):
-    response = genai.embed_content(
-        model="models/embedding-001",
-        content=query_text,
-        task_type="RETRIEVAL_QUERY"
-    )
-    query_embedding = response['embedding']
+    query_embedding = embed_query(query_text)
 
+    user_profile = get_user_profile(db, user_id)
     embedding_repo = MenuItemEmbeddingRepository()
-    top_n = embedding_repo.get_top_k_similar(db, query_embedding, k=30)
+    top_n = embedding_repo.get_top_k_similar(db, query_embedding, k=30, **get_exclusions(user_profile))
     menu_item_ids = [mid for mid, _ in top_n]
     menu_items = get_menu_item_details(db, menu_item_ids)
-    user_profile = get_user_profile(db, user_id)
 
     scored_items = []
     for mid, sim_score in top_n:
         item = menu_items.get(str(mid))
-        if not item or not is_suitable(item, user_profile):
+        if not item:
             continue
         boost = compute_boost(item, user_profile)
         final_score = sim_score + boost
@@ -0,0 +1,165 @@
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+import pytesseract
+from pytesseract import Output
+import multiprocessing
+import re
+import threading
+from app.core.config import settings
+
+PRICE_LINE_PATTERN = re.compile(
+    r"^(?P<name>.*?[A-Za-z].*?)[\s.\-_:…|]*"
+    r"(?P<prices>(?:(?:₹|rs\.?|inr|\$|€|£)?\s*\d{1,5}(?:\.\d{1,2})?\s*(?:/-)?[\s|/]*)+)$",
+    re.IGNORECASE,
+)
+PRICE_PATTERN = re.compile(r"\d{1,5}(?:\.\d{1,2})?")
+LEGEND_PATTERN = re.compile(r"\b([A-Z]{1,2})\s*[=:\-]\s*([A-Za-z]+)")
+PARENTHESES_PATTERN = re.compile(r"[(\[](.+?)[)\]]")
+
+SIZE_WORDS = {
+    "small", "medium", "large", "regular", "half", "full", "single", "double",
+    "quarter", "mini", "personal", "family", "glass", "bottle", "cup", "jug",
+}
+ADDON_PREFIXES = ("extra ", "add ", "add-on", "addon", "upgrade", "make it", "convert", "with extra")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn so workers don't inherit the API process's DB connections and threads
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.OCR_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_ocr_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _ocr_image(file_path: str):
+    img = Image.open(file_path)
+    if img.mode != "L":
+        img = img.convert("L")
+    data = pytesseract.image_to_data(img, output_type=Output.DICT, config="--psm 4")
+
+    lines = {}
+    order = []
+    confidences = []
+    for i, word in enumerate(data["text"]):
+        word = word.strip()
+        conf = float(data["conf"][i])
+        if not word or conf < 0:
+            continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        if key not in lines:
+            lines[key] = []
+            order.append(key)
+        lines[key].append(word)
+        confidences.append(conf)
+
+    mean_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    return [" ".join(lines[key]) for key in order], mean_confidence
+
+
+def _parse_size_header(line: str, legend: dict):
+    tokens = [token.strip(".,:/|") for token in line.split()]
+    tokens = [token for token in tokens if token]
+    if len(tokens) < 2:
+        return None
+    names = []
+    for token in tokens:
+        if token.upper() in legend:
+            names.append(legend[token.upper()])
+        elif token.lower() in SIZE_WORDS:
+            names.append(token.capitalize())
+        else:
+            return None
+    return names
+
+
+def _split_name(raw_name: str):
+    description = None
+    match = PARENTHESES_PATTERN.search(raw_name)
+    if match:
+        description = match.group(1).strip()
+        raw_name = PARENTHESES_PATTERN.sub("", raw_name)
+    return raw_name.strip(" .-_:|"), description
+
+
+def parse_menu_text(lines: list) -> dict:
+    legend = {}
+    for line in lines:
+        for short, full in LEGEND_PATTERN.findall(line):
+            if full.lower() in SIZE_WORDS:
+                legend[short.upper()] = full.capitalize()
+
+    menu_items = []
+    global_addons = []
+    size_header = None
+    last_entry = None
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        match = PRICE_LINE_PATTERN.match(line)
+        if not match:
+            header = _parse_size_header(line, legend)
+            if header:
+                size_header = header
+                continue
+            if LEGEND_PATTERN.search(line) and all(f.lower() in SIZE_WORDS for _, f in LEGEND_PATTERN.findall(line)):
+                continue
+            if last_entry is not None and (
+                line[0] in "([" or line[0].islower() or ("," in line and not last_entry.get("description"))
+            ):
+                text = line.strip("()[] ")
+                existing = last_entry.get("description")
+                last_entry["description"] = f"{existing} {text}" if existing else text
+                continue
+            last_entry = None
+            continue
+
+        name, description = _split_name(match.group("name"))
+        if not name:
+            continue
+        prices = [float(p) for p in PRICE_PATTERN.findall(match.group("prices"))]
+        if not prices:
+            continue
+
+        if len(prices) == 1:
+            option_names = ["Regular"]
+        elif size_header and len(size_header) == len(prices):
+            option_names = size_header
+        else:
+            option_names = [f"Option {i + 1}" for i in range(len(prices))]
+        options = [{"name": option_name, "price": price} for option_name, price in zip(option_names, prices)]
+
+        entry = {"name": name, "description": description, "options": options}
+        if name.lower().startswith(ADDON_PREFIXES):
+            global_addons.append(entry)
+        else:
+            entry.update({"price": prices[0], "addons": [], "tags": [], "allergens": []})
+            menu_items.append(entry)
+        last_entry = entry
+
+    return {"menu_items": menu_items, "global_addons": global_addons}
+
+
+def ocr_menu_image(file_path: str):
+    lines, confidence = _get_pool().submit(_ocr_image, file_path).result()
+    menu_data = parse_menu_text(lines)
+    if not menu_data["menu_items"]:
+        confidence = 0.0
+    return menu_data, confidence
@@ -0,0 +1,88 @@
+from app.utils.dispatch import Dispatcher
+import argparse
+import heapq
+import random
+import statistics
+import time
+
+# Simulates peak-hour dispatch entirely in memory: orders arrive as a Poisson
+# process, riders deliver for a random duration and reappear at the drop-off.
+# Reports matching-round latency, assignment throughput and order wait times.
+# python -m benchmarks.dispatch --riders 2000 --rate 50 --duration 1800
+
+CENTER = (12.9716, 77.5946)
+SPREAD = 0.2
+
+
+def random_point():
+    return CENTER[0] + random.uniform(-SPREAD, SPREAD), CENTER[1] + random.uniform(-SPREAD, SPREAD)
+
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[max(0, int(len(values) * fraction) - 1)] if values else 0.0
+
+
+def simulate(riders: int, rate: float, duration: float, interval: float, delivery_minutes: tuple) -> dict:
+    dispatcher = Dispatcher(interval=interval)
+    for rider in range(riders):
+        dispatcher.set_available(f"rider-{rider}", *random_point(), active_orders=0)
+
+    deliveries = []
+    round_ms, waits = [], []
+    next_arrival = random.expovariate(rate)
+    orders = assigned = 0
+    now = 0.0
+    while now < duration:
+        now += interval
+        while next_arrival <= now:
+            dispatcher.submit(f"order-{orders}", *random_point(), submitted_at=next_arrival)
+            orders += 1
+            next_arrival += random.expovariate(rate)
+        while deliveries and deliveries[0][0] <= now:
+            _, rider_id = heapq.heappop(deliveries)
+            dispatcher.complete(rider_id)
+            dispatcher.set_available(rider_id, *random_point())
+
+        started = time.perf_counter()
+        matches = dispatcher.match()
+        round_ms.append((time.perf_counter() - started) * 1000)
+
+        for match in matches:
+            waits.append(now - match.order.submitted_at)
+            done_at = now + random.uniform(*delivery_minutes) * 60
+            heapq.heappush(deliveries, (done_at, match.delivery_person_id))
+        assigned += len(matches)
+
+    return {
+        "orders": orders,
+        "assigned": assigned,
+        "pending": len(dispatcher.pending),
+        "rounds": len(round_ms),
+        "round_ms": round_ms,
+        "waits": waits,
+        "duration": duration,
+    }
+
+
+def report(result: dict):
+    round_ms, waits = result["round_ms"], result["waits"]
+    print(f"orders={result['orders']} assigned={result['assigned']} pending={result['pending']} rounds={result['rounds']}")
+    print(f"throughput={result['assigned'] / result['duration']:.1f} assignments/s")
+    print(f"round latency p50={statistics.median(round_ms):.2f}ms p95={percentile(round_ms, 0.95):.2f}ms max={max(round_ms):.2f}ms")
+    if waits:
+        print(f"order wait p50={statistics.median(waits):.1f}s p95={percentile(waits, 0.95):.1f}s max={max(waits):.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate dispatch rounds at peak order rates")
+    parser.add_argument("--riders", type=int, default=2000, help="available delivery persons")
+    parser.add_argument("--rate", type=float, default=50, help="orders per second")
+    parser.add_argument("--duration", type=float, default=1800, help="simulated seconds")
+    parser.add_argument("--interval", type=float, default=5, help="seconds between matching rounds")
+    parser.add_argument("--delivery-minutes", type=float, nargs=2, default=(15, 35), help="min and max delivery time")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    report(simulate(args.riders, args.rate, args.duration, args.interval, tuple(args.delivery_minutes)))
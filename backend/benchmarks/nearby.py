@@ -0,0 +1,78 @@
+from sqlalchemy import insert, text
+from app.db.session import SessionLocal
+from app.models.address import Address
+from app.models.restaurant import Restaurant
+from app.repositories.repository import RestaurantRepository
+import argparse
+import random
+import statistics
+import time
+import uuid
+
+# Seeds restaurant addresses inside a transaction that is rolled back at the end,
+# then times nearby searches with the GiST index and with index scans disabled.
+# Run against a migrated database: python -m benchmarks.nearby --count 100000
+
+CENTER = (12.9716, 77.5946)
+SPREAD = 0.5
+
+
+def seed(db, count: int, batch_size: int = 10000):
+    for start in range(0, count, batch_size):
+        size = min(batch_size, count - start)
+        restaurants = [{"id": uuid.uuid4(), "name": f"bench-{start + i}", "meta": {}} for i in range(size)]
+        db.execute(insert(Restaurant), restaurants)
+        db.execute(insert(Address), [
+            {
+                "id": uuid.uuid4(),
+                "restaurant_id": restaurant["id"],
+                "latitude": CENTER[0] + random.uniform(-SPREAD, SPREAD),
+                "longitude": CENTER[1] + random.uniform(-SPREAD, SPREAD),
+                "meta": {},
+            }
+            for restaurant in restaurants
+        ])
+    db.execute(text("ANALYZE restaurants"))
+    db.execute(text("ANALYZE addresses"))
+
+
+def measure(db, repo, queries: int, radius_km: float) -> list:
+    timings = []
+    for _ in range(queries):
+        latitude = CENTER[0] + random.uniform(-SPREAD, SPREAD)
+        longitude = CENTER[1] + random.uniform(-SPREAD, SPREAD)
+        started = time.perf_counter()
+        repo.get_nearby(db, latitude, longitude, radius_km)
+        timings.append((time.perf_counter() - started) * 1000)
+        db.expunge_all()
+    return timings
+
+
+def report(label: str, timings: list):
+    timings = sorted(timings)
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print(f"{label:<10} p50={statistics.median(timings):.2f}ms p95={p95:.2f}ms max={timings[-1]:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark nearby-restaurant search")
+    parser.add_argument("--count", type=int, default=100000, help="restaurant addresses to seed")
+    parser.add_argument("--queries", type=int, default=200, help="searches per run")
+    parser.add_argument("--radius-km", type=float, default=5, help="search radius")
+    args = parser.parse_args()
+
+    repo = RestaurantRepository()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        seed(db, args.count)
+        print(f"seeded {args.count} restaurant addresses in {time.perf_counter() - started:.1f}s")
+
+        report("indexed", measure(db, repo, args.queries, args.radius_km))
+
+        db.execute(text("SET LOCAL enable_indexscan = off"))
+        db.execute(text("SET LOCAL enable_bitmapscan = off"))
+        report("seq scan", measure(db, repo, args.queries, args.radius_km))
+    finally:
+        db.rollback()
+        db.close()
@@ -0,0 +1 @@
+alter table menu_items drop column if exists deleted_at;
@@ -0,0 +1 @@
+alter table menu_items add column if not exists deleted_at timestamptz;
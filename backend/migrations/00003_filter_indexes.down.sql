@@ -0,0 +1,49 @@
+drop index if exists idx_addresses_restaurant_id;
+drop index if exists idx_addresses_user_id;
+drop index if exists idx_notifications_seen;
+drop index if exists idx_notifications_title;
+drop index if exists idx_notifications_user_id;
+drop index if exists idx_payments_amount;
+drop index if exists idx_payments_status;
+drop index if exists idx_payments_order_id;
+drop index if exists idx_user_preferences_allergies;
+drop index if exists idx_user_preferences_dietary_restrictions;
+drop index if exists idx_user_preferences_preferred_cuisines;
+drop index if exists idx_user_preferences_spice_tolerance;
+drop index if exists idx_recommendations_confidence_score;
+drop index if exists idx_recommendations_menu_item_id;
+drop index if exists idx_recommendations_query_id;
+drop index if exists idx_files_file_url;
+drop index if exists idx_files_file_type;
+drop index if exists idx_files_uploaded_by;
+drop index if exists idx_reviews_rating;
+drop index if exists idx_reviews_user_id;
+drop index if exists idx_reviews_restaurant_id;
+drop index if exists idx_order_assignments_delivery_person_id;
+drop index if exists idx_order_assignments_order_id;
+drop index if exists idx_delivery_persons_vehicle_type;
+drop index if exists idx_delivery_persons_name;
+drop index if exists idx_delivery_persons_user_id;
+drop index if exists idx_queries_feedback;
+drop index if exists idx_queries_query_text;
+drop index if exists idx_queries_user_id;
+drop index if exists idx_orders_total_price;
+drop index if exists idx_orders_restaurant_id;
+drop index if exists idx_orders_user_id;
+drop index if exists idx_promotions_valid_to;
+drop index if exists idx_promotions_validity;
+drop index if exists idx_promotions_discount_percent;
+drop index if exists idx_promotions_title;
+drop index if exists idx_promotions_restaurant_id;
+drop index if exists idx_favorites_menu_item_id;
+drop index if exists idx_menu_item_addons_addon_id;
+drop index if exists idx_menu_item_addons_menu_item_id;
+drop index if exists idx_addons_name;
+drop index if exists idx_menu_items_allergens;
+drop index if exists idx_menu_items_tags;
+drop index if exists idx_menu_items_name;
+drop index if exists idx_menu_items_restaurant_id;
+drop index if exists idx_restaurants_name;
+drop index if exists idx_restaurants_owner_id;
+drop index if exists idx_users_provider;
+drop index if exists idx_users_name;
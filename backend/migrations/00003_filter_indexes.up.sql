@@ -0,0 +1,68 @@
+-- Indexes backing the list filters in app/models/filters.py.
+
+create index if not exists idx_users_name on users (name);
+create index if not exists idx_users_provider on users (provider);
+
+create index if not exists idx_restaurants_owner_id on restaurants (owner_id);
+create index if not exists idx_restaurants_name on restaurants (name);
+
+create index if not exists idx_menu_items_restaurant_id on menu_items (restaurant_id);
+create index if not exists idx_menu_items_name on menu_items (name);
+create index if not exists idx_menu_items_tags on menu_items using gin (tags);
+create index if not exists idx_menu_items_allergens on menu_items using gin (allergens);
+
+create index if not exists idx_addons_name on addons (name);
+
+create index if not exists idx_menu_item_addons_menu_item_id on menu_item_addons (menu_item_id, addon_id);
+create index if not exists idx_menu_item_addons_addon_id on menu_item_addons (addon_id);
+
+create index if not exists idx_favorites_menu_item_id on favorites (menu_item_id);
+
+create index if not exists idx_promotions_restaurant_id on promotions (restaurant_id);
+create index if not exists idx_promotions_title on promotions (title);
+create index if not exists idx_promotions_discount_percent on promotions (discount_percent);
+create index if not exists idx_promotions_validity on promotions (valid_from, valid_to);
+create index if not exists idx_promotions_valid_to on promotions (valid_to);
+
+create index if not exists idx_orders_user_id on orders (user_id, created_at desc);
+create index if not exists idx_orders_restaurant_id on orders (restaurant_id, created_at desc);
+create index if not exists idx_orders_total_price on orders (total_price);
+
+create index if not exists idx_queries_user_id on queries (user_id);
+create index if not exists idx_queries_query_text on queries using hash (query_text);
+create index if not exists idx_queries_feedback on queries using hash (feedback);
+
+create index if not exists idx_delivery_persons_user_id on delivery_persons (user_id);
+create index if not exists idx_delivery_persons_name on delivery_persons (name);
+create index if not exists idx_delivery_persons_vehicle_type on delivery_persons (vehicle_type);
+
+create index if not exists idx_order_assignments_order_id on order_assignments (order_id);
+create index if not exists idx_order_assignments_delivery_person_id on order_assignments (delivery_person_id);
+
+create index if not exists idx_reviews_restaurant_id on reviews (restaurant_id, created_at desc);
+create index if not exists idx_reviews_user_id on reviews (user_id);
+create index if not exists idx_reviews_rating on reviews (rating);
+
+create index if not exists idx_files_uploaded_by on files (uploaded_by);
+create index if not exists idx_files_file_type on files (file_type);
+create index if not exists idx_files_file_url on files using hash (file_url);
+
+create index if not exists idx_recommendations_query_id on recommendations (query_id);
+create index if not exists idx_recommendations_menu_item_id on recommendations (menu_item_id);
+create index if not exists idx_recommendations_confidence_score on recommendations (confidence_score);
+
+create index if not exists idx_user_preferences_spice_tolerance on user_preferences (spice_tolerance);
+create index if not exists idx_user_preferences_preferred_cuisines on user_preferences using gin (preferred_cuisines);
+create index if not exists idx_user_preferences_dietary_restrictions on user_preferences using gin (dietary_restrictions);
+create index if not exists idx_user_preferences_allergies on user_preferences using gin (allergies);
+
+create index if not exists idx_payments_order_id on payments (order_id);
+create index if not exists idx_payments_status on payments (status);
+create index if not exists idx_payments_amount on payments (amount);
+
+create index if not exists idx_notifications_user_id on notifications (user_id, seen, created_at desc);
+create index if not exists idx_notifications_title on notifications (title);
+create index if not exists idx_notifications_seen on notifications (seen);
+
+create index if not exists idx_addresses_user_id on addresses (user_id);
+create index if not exists idx_addresses_restaurant_id on addresses (restaurant_id);
@@ -0,0 +1,5 @@
+drop index if exists idx_menu_items_lower_name;
+drop index if exists idx_orders_meta_items;
+drop index if exists idx_menu_items_meta;
+drop index if exists idx_menu_items_spice_level;
+drop index if exists idx_menu_items_cuisine;
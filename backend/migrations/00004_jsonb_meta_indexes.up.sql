@@ -0,0 +1,9 @@
+-- Columns are already jsonb (00001); these index the keys read by filters and recommendations.
+
+create index if not exists idx_menu_items_cuisine on menu_items ((meta->>'cuisine'));
+create index if not exists idx_menu_items_spice_level on menu_items ((meta->>'spice_level'));
+create index if not exists idx_menu_items_meta on menu_items using gin (meta jsonb_path_ops);
+
+create index if not exists idx_orders_meta_items on orders using gin ((meta->'items') jsonb_path_ops);
+
+create index if not exists idx_menu_items_lower_name on menu_items (lower(name)) where deleted_at is null;
@@ -0,0 +1,3 @@
+create index if not exists idx_orders_meta_items on orders using gin ((meta->'items') jsonb_path_ops);
+
+drop table if exists order_items;
@@ -0,0 +1,19 @@
+create table if not exists order_items (
+  id uuid primary key default gen_random_uuid(),
+  order_id uuid not null references orders (id) on delete cascade,
+  menu_item_id uuid not null references menu_items (id),
+  name text not null,
+  option_name text,
+  quantity int not null default 1 check (quantity > 0),
+  unit_price numeric(10, 2) not null,
+  created_at timestamptz default now(),
+  updated_at timestamptz default now(),
+  meta jsonb default '{}'
+);
+
+create index if not exists idx_order_items_order_id on order_items (order_id);
+create index if not exists idx_order_items_menu_item_id on order_items (menu_item_id, order_id);
+
+-- Items are read from order_items from here on; the legacy meta->'items' index
+-- from 00004 would only add write overhead to every order insert.
+drop index if exists idx_orders_meta_items;
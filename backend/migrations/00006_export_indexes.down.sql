@@ -0,0 +1,3 @@
+drop index if exists idx_reviews_created_at;
+drop index if exists idx_payments_created_at;
+drop index if exists idx_orders_created_at;
@@ -0,0 +1,5 @@
+-- Exports walk these tables in (created_at, id) order within a time range.
+
+create index if not exists idx_orders_created_at on orders (created_at, id);
+create index if not exists idx_payments_created_at on payments (created_at, id);
+create index if not exists idx_reviews_created_at on reviews (created_at, id);
@@ -0,0 +1 @@
+drop index if exists idx_addresses_restaurant_earth;
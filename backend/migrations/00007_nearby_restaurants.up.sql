@@ -0,0 +1,9 @@
+-- Nearby-restaurant search: earth_box() prefilter served by a GiST index over
+-- restaurant address coordinates, then an exact earth_distance() check.
+
+create extension if not exists cube;
+create extension if not exists earthdistance;
+
+create index if not exists idx_addresses_restaurant_earth on addresses
+  using gist (ll_to_earth(latitude, longitude))
+  where restaurant_id is not null and latitude is not null and longitude is not null;
@@ -0,0 +1,12 @@
+-- Downsampled rider tracks; the latest position per rider is kept in memory.
+
+create table if not exists rider_locations (
+  id uuid primary key default gen_random_uuid(),
+  delivery_person_id uuid not null references delivery_persons (id) on delete cascade,
+  latitude double precision not null,
+  longitude double precision not null,
+  recorded_at timestamptz not null,
+  created_at timestamptz default now()
+);
+
+create index if not exists idx_rider_locations_delivery_person_id on rider_locations (delivery_person_id, recorded_at);
@@ -0,0 +1 @@
+drop table if exists restaurant_rating_summaries;
@@ -0,0 +1,28 @@
+-- Review count, rating sum and histogram per restaurant, maintained on review writes.
+
+create table if not exists restaurant_rating_summaries (
+  restaurant_id uuid primary key references restaurants (id) on delete cascade,
+  review_count int not null default 0,
+  rating_sum bigint not null default 0,
+  rating_1 int not null default 0,
+  rating_2 int not null default 0,
+  rating_3 int not null default 0,
+  rating_4 int not null default 0,
+  rating_5 int not null default 0,
+  updated_at timestamptz default now()
+);
+
+insert into restaurant_rating_summaries (restaurant_id, review_count, rating_sum, rating_1, rating_2, rating_3, rating_4, rating_5)
+select
+  restaurant_id,
+  count(*),
+  sum(rating),
+  count(*) filter (where rating = 1),
+  count(*) filter (where rating = 2),
+  count(*) filter (where rating = 3),
+  count(*) filter (where rating = 4),
+  count(*) filter (where rating = 5)
+from reviews
+where restaurant_id is not null and rating between 1 and 5
+group by restaurant_id
+on conflict (restaurant_id) do nothing;
@@ -0,0 +1 @@
+drop table if exists menu_item_popularity;
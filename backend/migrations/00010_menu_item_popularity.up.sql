@@ -0,0 +1,11 @@
+-- Bucketed order and favorite counts backing the in-memory popularity windows.
+
+create table if not exists menu_item_popularity (
+  menu_item_id uuid not null references menu_items (id) on delete cascade,
+  bucket_start timestamptz not null,
+  orders int not null default 0,
+  favorites int not null default 0,
+  primary key (menu_item_id, bucket_start)
+);
+
+create index if not exists idx_menu_item_popularity_bucket_start on menu_item_popularity (bucket_start);
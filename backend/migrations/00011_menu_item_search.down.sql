@@ -0,0 +1,5 @@
+drop index if exists idx_menu_items_search_vector;
+drop trigger if exists trg_menu_items_search_vector on menu_items;
+drop function if exists menu_items_search_vector_trigger();
+drop function if exists menu_items_search_vector(text, text[], text);
+alter table menu_items drop column if exists search_vector;
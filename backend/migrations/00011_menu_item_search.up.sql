@@ -0,0 +1,26 @@
+-- Full-text search over menu item names, tags and descriptions, kept current by a trigger.
+
+alter table menu_items add column if not exists search_vector tsvector;
+
+create or replace function menu_items_search_vector(name text, tags text[], description text) returns tsvector as $$
+  select
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', array_to_string(coalesce(tags, '{}'), ' ')), 'B') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'C')
+$$ language sql immutable;
+
+create or replace function menu_items_search_vector_trigger() returns trigger as $$
+begin
+  new.search_vector := menu_items_search_vector(new.name, new.tags, new.description);
+  return new;
+end
+$$ language plpgsql;
+
+drop trigger if exists trg_menu_items_search_vector on menu_items;
+create trigger trg_menu_items_search_vector
+  before insert or update of name, tags, description on menu_items
+  for each row execute function menu_items_search_vector_trigger();
+
+update menu_items set search_vector = menu_items_search_vector(name, tags, description);
+
+create index if not exists idx_menu_items_search_vector on menu_items using gin (search_vector) where deleted_at is null;
@@ -0,0 +1,51 @@
+import uuid
+from pydantic import BaseModel
+from app.models.menu_items import MenuItem
+from app.repositories.repository import MenuItemRepository
+from app.utils.catalogue import MENU, CatalogueCache, catalogue_cache
+
+
+def test_prefix_invalidation_during_load_is_not_cached():
+    cache = CatalogueCache(max_bytes=1 << 20)
+
+    def loader():
+        # The key has never been seen, so only the prefix version can catch this.
+        cache.invalidate_prefix("menu", publish_change=False)
+        return ["stale"]
+
+    assert cache.get_or_load(("menu", "r1"), loader).value == ["stale"]
+    assert cache.peek(("menu", "r1")) is None
+    assert cache.get_or_load(("menu", "r1"), lambda: ["fresh"]).value == ["fresh"]
+    assert cache.peek(("menu", "r1")).value == ["fresh"]
+
+
+def test_prefix_invalidation_drops_cached_keys():
+    cache = CatalogueCache(max_bytes=1 << 20)
+    cache.get_or_load(("addons", "r1"), lambda: ["a"])
+    cache.get_or_load(("addons",), lambda: ["all"])
+    cache.invalidate_prefix("addons", publish_change=False)
+    assert cache.peek(("addons", "r1")) is None
+    assert cache.peek(("addons",)) is None
+
+
+def test_moving_a_menu_item_invalidates_both_restaurants():
+    class FakeSession:
+        info = {}
+
+        def add(self, obj):
+            pass
+
+        def commit(self):
+            pass
+
+    class Move(BaseModel):
+        restaurant_id: uuid.UUID
+
+    old, new = uuid.uuid4(), uuid.uuid4()
+    for restaurant_id in (old, new):
+        catalogue_cache.get_or_load((MENU, str(restaurant_id)), lambda: ["menu"])
+    menu_item = MenuItem(id=uuid.uuid4(), restaurant_id=old, name="Dosa")
+
+    MenuItemRepository().update(FakeSession(), menu_item, Move(restaurant_id=new))
+    assert catalogue_cache.peek((MENU, str(old))) is None
+    assert catalogue_cache.peek((MENU, str(new))) is None
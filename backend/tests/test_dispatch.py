@@ -0,0 +1,78 @@
+from app.utils import dispatch
+from app.utils.dispatch import Dispatcher
+
+
+def test_refresh_loads_replaces_worker_local_counts(monkeypatch):
+    # Another worker assigned rider-a an order this one never saw.
+    monkeypatch.setattr(dispatch.order_assignment_repo, "get_active_loads", lambda db, ids: {"rider-a": 2})
+    dispatcher = Dispatcher(max_load=2)
+    dispatcher.set_available("rider-a", 12.97, 77.59, active_orders=0)
+    dispatcher.set_available("rider-b", 12.97, 77.60, active_orders=1)
+    dispatcher.refresh_loads(db=None)
+    assert dispatcher.loads == {"rider-a": 2, "rider-b": 0}
+
+    dispatcher.submit("order-1", 12.97, 77.59)
+    assert [match.delivery_person_id for match in dispatcher.match()] == ["rider-b"]
+
+
+def test_complete_frees_a_slot():
+    dispatcher = Dispatcher(max_load=1)
+    dispatcher.set_available("rider-a", 12.97, 77.59, active_orders=1)
+    dispatcher.submit("order-1", 12.97, 77.59)
+    assert dispatcher.match() == []
+    dispatcher.complete("rider-a")
+    assert [match.delivery_person_id for match in dispatcher.match()] == ["rider-a"]
+
+
+class FakeSession:
+    def __init__(self):
+        self.info = {}
+        self.statements = []
+
+    def execute(self, statement, *args):
+        self.statements.append(statement)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def test_run_round_skips_orders_that_are_already_assigned(monkeypatch):
+    rows = []
+
+    def create_many(db, objs_in, atomic=True):
+        rows.extend(objs_in)
+        return objs_in, []
+
+    monkeypatch.setattr(dispatch.order_assignment_repo, "get_assigned_order_ids", lambda db, ids: {"order-1"})
+    monkeypatch.setattr(dispatch.order_assignment_repo, "get_active_loads", lambda db, ids: {})
+    monkeypatch.setattr(dispatch.order_assignment_repo, "create_many", create_many)
+    dispatcher = Dispatcher()
+    dispatcher.set_available("rider-a", 12.97, 77.59)
+    dispatcher.submit("order-1", 12.97, 77.59)
+
+    assert dispatcher.run_round(FakeSession()) == []
+    assert rows == []
+    assert dispatcher.pending == {}
+    assert dispatcher.loads == {"rider-a": 0}
+
+
+def test_run_round_reports_created_assignments(monkeypatch):
+    class Assignment:
+        def __init__(self, row):
+            self.order_id = row.order_id
+            self.delivery_person_id = row.delivery_person_id
+
+    monkeypatch.setattr(dispatch.order_assignment_repo, "get_assigned_order_ids", lambda db, ids: set())
+    monkeypatch.setattr(dispatch.order_assignment_repo, "get_active_loads", lambda db, ids: {})
+    monkeypatch.setattr(dispatch.order_assignment_repo, "create_many", lambda db, objs_in, atomic=True: ([Assignment(row) for row in objs_in], []))
+    assigned = []
+    dispatcher = Dispatcher()
+    dispatcher.on_assigned(lambda order_id, rider_id: assigned.append((order_id, rider_id)))
+    dispatcher.set_available("rider-a", 12.97, 77.59)
+    dispatcher.submit("order-1", 12.97, 77.59)
+
+    assert len(dispatcher.run_round(FakeSession())) == 1
+    assert assigned == [("order-1", "rider-a")]
@@ -0,0 +1,26 @@
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+import pytest
+from app.db import explain_check
+from app.db.session import SessionLocal
+from app.repositories.repository import MenuItemRepository, UserPreferencesRepository
+
+
+@pytest.mark.parametrize(
+    "repo, field",
+    [(MenuItemRepository(), "tags"), (MenuItemRepository(), "allergens"), (UserPreferencesRepository(), "allergies")],
+)
+def test_array_filters_bind_as_text_arrays(repo, field):
+    query = repo.build_query(SessionLocal(), filters={field: ["nuts"]})
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+    assert "&& CAST(" in sql and "AS TEXT[])" in sql
+
+
+# Needs a migrated database (DATABASE_URL_NEON); skipped when none is reachable.
+def test_list_filters_use_indexes():
+    try:
+        with SessionLocal() as db:
+            db.connection()
+    except OperationalError:
+        pytest.skip("no database available")
+    assert explain_check.run() == []
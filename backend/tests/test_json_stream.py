@@ -0,0 +1,43 @@
+import json
+from app.utils.json_stream import JSONArrayStreamParser
+
+KEYS = ("menu_items", "global_addons")
+
+DOCUMENT = json.dumps({
+    "restaurant": "Cafe {\"Brace\"} [1]",
+    "menu_items": [
+        {"name": "Pizza \"Special\" {large}", "options": [{"name": "S", "price": 10}]},
+        {"name": "Back\\slash ]", "tags": ["a", "b"]},
+    ],
+    "global_addons": [{"name": "Extra Cheese", "options": []}],
+})
+
+
+def _feed(parser, chunks):
+    return [event for chunk in chunks for event in parser.feed(chunk)]
+
+
+def test_elements_are_emitted_as_they_close():
+    parser = JSONArrayStreamParser(KEYS)
+    events = _feed(parser, [DOCUMENT])
+    expected = json.loads(DOCUMENT)
+    assert events == [("menu_items", item) for item in expected["menu_items"]] + [("global_addons", expected["global_addons"][0])]
+
+
+def test_chunks_split_inside_tokens_and_escapes():
+    expected = _feed(JSONArrayStreamParser(KEYS), [DOCUMENT])
+    for size in (1, 2, 3, 7):
+        chunks = [DOCUMENT[start:start + size] for start in range(0, len(DOCUMENT), size)]
+        assert _feed(JSONArrayStreamParser(KEYS), chunks) == expected
+
+
+def test_code_fences_and_other_keys_are_ignored():
+    parser = JSONArrayStreamParser(KEYS)
+    events = parser.feed('```json\n{"other": [{"name": "x"}], "menu_items": [{"name": "y"}]}\n```')
+    assert events == [("menu_items", {"name": "y"})]
+
+
+def test_truncated_input_only_emits_complete_elements():
+    parser = JSONArrayStreamParser(KEYS)
+    truncated = DOCUMENT[:DOCUMENT.index("Back")]
+    assert _feed(parser, [truncated]) == [("menu_items", json.loads(DOCUMENT)["menu_items"][0])]
@@ -0,0 +1,63 @@
+import time
+import uuid
+from app.utils.locations import KnownRiders, LocationStore
+
+
+def test_forget_drops_the_cached_rider_for_an_order():
+    store = LocationStore()
+    order_id, rider_id = uuid.uuid4(), uuid.uuid4()
+    store.assign(str(order_id), rider_id)
+    assert store.rider_for_order(order_id) == rider_id
+    store.forget(str(order_id))
+    assert store.rider_for_order(order_id) is None
+
+
+def _store():
+    return LocationStore(sample_seconds=30, sample_meters=100)
+
+
+def test_out_of_order_samples_are_ignored():
+    store, rider_id = _store(), uuid.uuid4()
+    now = time.time()
+    assert store.update(rider_id, 12.97, 77.59, now - 10)
+    assert not store.update(rider_id, 12.98, 77.60, now - 20)
+    assert store.get(rider_id) == (12.97, 77.59, now - 10)
+
+
+def test_future_timestamps_are_clamped_to_now():
+    store, rider_id = _store(), uuid.uuid4()
+    assert store.update(rider_id, 12.97, 77.59, time.time() + 3600)
+    assert store.get(rider_id)[2] <= time.time()
+    assert store.update(rider_id, 12.98, 77.60)
+    assert store.get(rider_id)[:2] == (12.98, 77.60)
+
+
+def test_samples_are_kept_on_elapsed_time_or_distance():
+    store, rider_id = _store(), uuid.uuid4()
+    start = float(int(time.time()) - 120)
+    store.update(rider_id, 12.9700, 77.5900, start)
+    # About 11 m and 10 s later: position updated, no new sample.
+    store.update(rider_id, 12.9701, 77.5900, start + 10)
+    # About 220 m later: sampled on distance.
+    store.update(rider_id, 12.9721, 77.5900, start + 20)
+    # Stationary but 30 s after the last sample: sampled on time.
+    store.update(rider_id, 12.9721, 77.5900, start + 50)
+    assert [recorded_at - start for _, _, _, recorded_at in store.drain()] == [0, 20, 50]
+    assert store.get(rider_id)[2] == start + 50
+
+
+def test_known_riders_drop_unknown_ids_and_remember_misses():
+    riders = KnownRiders(unknown_ttl=60)
+    known, bogus = uuid.uuid4(), uuid.uuid4()
+    lookups = []
+
+    def lookup(ids):
+        lookups.append(set(ids))
+        return {id for id in ids if id == known}
+
+    riders._lookup = lookup
+    assert riders.filter([known, bogus]) == {known}
+    assert riders.filter([known, bogus]) == {known}
+    assert lookups == [{known, bogus}]
+    riders.add(bogus)
+    assert riders.filter([bogus]) == {bogus}
@@ -0,0 +1,86 @@
+import uuid
+from app.models.menu_items import MenuItem
+from app.models.restaurant import Restaurant
+from app.utils import menu_import
+from app.utils.menu_import import MenuImport
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def filter(self, *args):
+        return self
+
+    def join(self, *args):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, menu_items):
+        self.info = {}
+        self.menu_items = menu_items
+        self.added = []
+        self.commits = 0
+
+    def query(self, *entities):
+        return FakeQuery(self.menu_items if entities == (MenuItem,) else [])
+
+    def get(self, model, id):
+        return None
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def add_all(self, objs):
+        self.added.extend(objs)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+def _menu_item(restaurant_id, name, price):
+    return MenuItem(
+        id=uuid.uuid4(),
+        restaurant_id=restaurant_id,
+        name=name,
+        description=None,
+        options=[{"name": "Regular", "description": None, "price": price}],
+        tags=[],
+        allergens=[],
+        meta={},
+    )
+
+
+def test_reimport_diffs_by_name_and_only_embeds_changed_items(monkeypatch):
+    embedded = []
+    monkeypatch.setattr(menu_import, "generate_menu_item_embedding", lambda menu_item: embedded.append(menu_item.name) or [0.0] * 768)
+
+    restaurant = Restaurant(id=uuid.uuid4(), name="Udupi", meta={"menu_version": 3})
+    dosa = _menu_item(restaurant.id, "Masala Dosa", 60.0)
+    idli = _menu_item(restaurant.id, "Idli", 40.0)
+    vada = _menu_item(restaurant.id, "Vada", 30.0)
+    db = FakeSession([dosa, idli, vada])
+
+    job = MenuImport(db, restaurant)
+    job.add("menu_items", {"name": "Masala Dosa", "options": [{"name": "Regular", "price": 60}]})
+    job.add("menu_items", {"name": "idli!", "options": [{"name": "Regular", "price": 45}]})
+    job.add("menu_items", {"name": "Upma", "options": [{"name": "Regular", "price": 50}]})
+    job.commit()
+
+    assert sorted(embedded) == ["Upma", "idli!"]
+    assert job.stats["inserted"] == 1
+    assert job.stats["updated"] == 1
+    assert job.stats["unchanged"] == 1
+    assert job.stats["deleted"] == 1
+    assert vada.deleted_at is not None
+    assert dosa.deleted_at is None and idli.deleted_at is None
+    assert idli.options[0]["price"] == 45
+    assert restaurant.meta["menu_version"] == 4
+    assert db.commits == 1
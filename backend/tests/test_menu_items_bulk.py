@@ -0,0 +1,63 @@
+import json
+import uuid
+import pytest
+from app.api.menu import menu_items
+from app.core.errors import BadRequestError
+from app.schemas.menu_items import MenuItemCreate
+
+
+class FakeSession:
+    def __init__(self):
+        self.info = {}
+        self.rolled_back = False
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+class Created:
+    def __init__(self, obj_in):
+        self.id = uuid.uuid4()
+        self.name = obj_in.name
+
+
+def _create_many(db, objs_in, atomic=True):
+    # The second row fails to insert; the others are written.
+    created = [Created(obj_in) for index, obj_in in enumerate(objs_in) if index != 1]
+    return created, [{"index": 1, "id": None, "detail": "duplicate"}]
+
+
+def _failing_embeddings(db, rows):
+    if rows:
+        raise BadRequestError("Failed to create embeddings: quota")
+
+
+def _menu_items():
+    restaurant_id = uuid.uuid4()
+    return [MenuItemCreate(restaurant_id=restaurant_id, name=name) for name in ("Dosa", "Idli", "Vada")]
+
+
+@pytest.fixture(autouse=True)
+def _patch(monkeypatch):
+    monkeypatch.setattr(menu_items.menu_item_repo, "create_many", _create_many)
+    monkeypatch.setattr(menu_items, "upsert_menu_item_embeddings", _failing_embeddings)
+    monkeypatch.setattr(menu_items, "serialize_menu_items", lambda db, rows: [])
+
+
+def test_non_atomic_embedding_failure_is_reported_per_row():
+    response = menu_items.create_menu_items(_menu_items(), atomic=False, db=FakeSession())
+    assert response.status_code == 207
+    errors = json.loads(response.body)["errors"]
+    assert [error["index"] for error in errors] == [0, 1, 2]
+    assert errors[1]["detail"] == "duplicate"
+    assert "quota" in errors[0]["detail"] and "quota" in errors[2]["detail"]
+
+
+def test_atomic_embedding_failure_rolls_back_the_rows():
+    db = FakeSession()
+    with pytest.raises(BadRequestError):
+        menu_items.create_menu_items(_menu_items(), atomic=True, db=db)
+    assert db.rolled_back
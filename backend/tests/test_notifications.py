@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import uuid
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.user import notification
+from app.db.session import get_db
+from app.repositories import repository
+from app.utils import notifications
+from app.utils.notifications import NotificationHub
+
+
+def test_hub_delivers_to_the_users_streams_from_any_thread():
+    async def run():
+        hub = NotificationHub(queue_size=2)
+        mine, other = hub.subscribe("user-1"), hub.subscribe("user-2")
+        thread = threading.Thread(target=hub.deliver, args=("user-1", {"event": "notification", "data": {"id": 1}}))
+        thread.start()
+        thread.join()
+        assert await asyncio.wait_for(mine.queue.get(), 1) == {"event": "notification", "data": {"id": 1}}
+        assert other.queue.empty()
+
+        # A slow client keeps only the newest queue_size events.
+        for id in (2, 3, 4):
+            hub.deliver("user-1", {"event": "notification", "data": {"id": id}})
+        await asyncio.sleep(0)
+        assert [mine.queue.get_nowait()["data"]["id"] for _ in range(2)] == [3, 4]
+
+        hub.unsubscribe(mine)
+        assert not hub.has_subscribers("user-1")
+        assert hub.has_subscribers("user-2")
+
+    asyncio.run(run())
+
+
+def test_publish_seen_chunks_ids_per_event(monkeypatch):
+    delivered = []
+    monkeypatch.setattr(notifications.settings, "NOTIFICATIONS_NOTIFY", False)
+    monkeypatch.setattr(notifications.notification_hub, "deliver", lambda user_id, event: delivered.append((user_id, event)))
+    ids = [uuid.uuid4() for _ in range(notifications.SEEN_IDS_PER_EVENT + 1)]
+    notifications.publish_seen("user-1", ids)
+    assert [len(event["data"]["ids"]) for _, event in delivered] == [notifications.SEEN_IDS_PER_EVENT, 1]
+    assert all(user_id == "user-1" and event["event"] == "seen" for user_id, event in delivered)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, seen):
+        self.info = {}
+        self.seen = seen
+
+    def scalars(self, statement):
+        return FakeResult(self.seen)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def test_seen_marks_notifications_and_publishes_after_commit(monkeypatch):
+    seen = [uuid.uuid4(), uuid.uuid4()]
+    published = []
+    monkeypatch.setattr(repository, "publish_seen", lambda user_id, ids: published.append((user_id, ids)))
+    app = FastAPI()
+    app.include_router(notification.router)
+    app.dependency_overrides[get_db] = lambda: FakeSession(seen)
+    user_id = uuid.uuid4()
+
+    response = TestClient(app).post("/notifications/seen", json={"user_id": str(user_id), "ids": [str(id) for id in seen]})
+    assert response.status_code == 200
+    assert response.json()["meta"] == {"updated": 2}
+    assert published == [(user_id, seen)]
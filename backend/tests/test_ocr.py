@@ -0,0 +1,57 @@
+import pytest
+from app.core.errors import BadRequestError
+from app.utils import ocr
+
+LOCAL = {"menu_items": [{"name": "Idli"}], "global_addons": []}
+VISION = [("menu_items", {"name": "Dosa"})]
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def vision(file_path):
+        calls.append("vision")
+        yield from VISION
+
+    monkeypatch.setattr(ocr, "stream_menu_data_from_image", vision)
+    monkeypatch.setattr(ocr.settings, "OCR_MIN_CONFIDENCE", 60)
+    return calls
+
+
+def _local(confidence=None, error=None):
+    def run(file_path):
+        if error:
+            raise error
+        return LOCAL, confidence
+    return run
+
+
+def test_hybrid_uses_confident_local_ocr(monkeypatch, calls):
+    monkeypatch.setattr(ocr.settings, "OCR_MODE", "hybrid")
+    monkeypatch.setattr(ocr, "ocr_menu_image", _local(confidence=85))
+    assert list(ocr.stream_menu_data("menu.png")) == [("menu_items", {"name": "Idli"})]
+    assert calls == []
+
+
+def test_hybrid_falls_back_on_low_confidence(monkeypatch, calls):
+    monkeypatch.setattr(ocr.settings, "OCR_MODE", "hybrid")
+    monkeypatch.setattr(ocr, "ocr_menu_image", _local(confidence=20))
+    assert list(ocr.stream_menu_data("menu.png")) == VISION
+    assert calls == ["vision"]
+
+
+def test_hybrid_falls_back_when_local_ocr_fails(monkeypatch, calls):
+    monkeypatch.setattr(ocr.settings, "OCR_MODE", "hybrid")
+    monkeypatch.setattr(ocr, "ocr_menu_image", _local(error=RuntimeError("tesseract missing")))
+    assert list(ocr.stream_menu_data("menu.png")) == VISION
+
+
+def test_local_mode_never_falls_back(monkeypatch, calls):
+    monkeypatch.setattr(ocr.settings, "OCR_MODE", "local")
+    monkeypatch.setattr(ocr, "ocr_menu_image", _local(confidence=5))
+    assert list(ocr.stream_menu_data("menu.png")) == [("menu_items", {"name": "Idli"})]
+    monkeypatch.setattr(ocr, "ocr_menu_image", _local(error=RuntimeError("tesseract missing")))
+    with pytest.raises(BadRequestError):
+        list(ocr.stream_menu_data("menu.png"))
+    assert calls == []
@@ -0,0 +1,90 @@
+import uuid
+from sqlalchemy.exc import IntegrityError
+from app.utils import popularity as popularity_module
+from app.utils.popularity import PopularityCounters
+
+WINDOWS = (("1h", 3600, 0.5), ("24h", 86400, 0.3), ("7d", 604800, 0.2))
+
+
+def _counters(monkeypatch, now):
+    clock = [now]
+    monkeypatch.setattr(popularity_module.time, "time", lambda: clock[0])
+    return PopularityCounters(bucket_seconds=300, windows=WINDOWS, flush_interval=60), clock
+
+
+def test_events_roll_out_of_each_window(monkeypatch):
+    now = 1_700_000_000.0
+    counters, clock = _counters(monkeypatch, now)
+    counters.record("dosa", orders=2, at=now - 7200)
+    counters.record("dosa", orders=1, favorites=1, at=now)
+    assert counters.counts("dosa") == {
+        "1h": {"orders": 1, "favorites": 1},
+        "24h": {"orders": 3, "favorites": 1},
+        "7d": {"orders": 3, "favorites": 1},
+    }
+
+    clock[0] = now + 86400
+    assert counters.counts("dosa")["1h"] == {"orders": 0, "favorites": 0}
+    assert counters.counts("dosa")["24h"] == {"orders": 0, "favorites": 0}
+    assert counters.counts("dosa")["7d"] == {"orders": 3, "favorites": 1}
+
+    clock[0] = now + 8 * 86400
+    assert counters.counts("dosa")["7d"] == {"orders": 0, "favorites": 0}
+
+
+def test_score_decays_as_events_age(monkeypatch):
+    now = 1_700_000_000.0
+    counters, clock = _counters(monkeypatch, now)
+    counters.record("dosa", orders=5, at=now)
+    scores = []
+    for elapsed in (0, 7200, 2 * 86400, 8 * 86400):
+        clock[0] = now + elapsed
+        scores.append(counters.score("dosa"))
+    assert scores[0] > scores[1] > scores[2] > scores[3] == 0.0
+    assert counters.score("unknown") == 0.0
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def filter(self, *args):
+        return self
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class FakeSession:
+    def __init__(self, existing):
+        self.existing = existing
+        self.rollbacks = 0
+
+    def query(self, *entities):
+        return FakeQuery([(menu_item_id,) for menu_item_id in self.existing])
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def test_flush_skips_deleted_menu_items(monkeypatch):
+    now = 1_700_000_000.0
+    counters, _ = _counters(monkeypatch, now)
+    monkeypatch.setattr(popularity_module.settings, "POPULARITY_NOTIFY", False)
+    kept, deleted = uuid.uuid4(), uuid.uuid4()
+    counters.record(kept, orders=1, at=now)
+    counters.record(deleted, orders=1, at=now)
+
+    written = []
+
+    def write(db, deltas):
+        if any(menu_item_id == str(deleted) for menu_item_id, _, _, _ in deltas):
+            raise IntegrityError("INSERT", {}, Exception("violates foreign key constraint"))
+        written.extend(deltas)
+
+    monkeypatch.setattr(counters, "_write_deltas", write)
+    db = FakeSession([kept])
+    assert counters.flush(db) == 1
+    assert [menu_item_id for menu_item_id, _, _, _ in written] == [str(kept)]
+    assert db.rollbacks == 1
+    assert counters.drain() == []
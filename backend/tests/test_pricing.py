@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta, timezone
+import uuid
+from app.models.menu_items import MenuItem
+from app.utils import catalogue
+from app.utils.pricing import PromotionIndex, pricing_now
+
+
+def _promotion_index(discount_percent=25):
+    # Rows as psycopg2 returns them for timestamptz columns: timezone-aware.
+    now = datetime.now(timezone.utc)
+    return PromotionIndex([(uuid.uuid4(), discount_percent, now - timedelta(hours=1), now + timedelta(hours=1))])
+
+
+def _menu_item(restaurant_id):
+    return MenuItem(
+        id=uuid.uuid4(),
+        restaurant_id=restaurant_id,
+        name="Chicken 65",
+        options=[{"name": "Regular", "price": 10.0}, {"name": "Large", "price": 14.5}],
+        tags=[],
+        allergens=[],
+        meta={},
+    )
+
+
+def test_promotion_index_accepts_aware_timestamps():
+    index = _promotion_index()
+    assert index.active(pricing_now()).discount_percent == 25
+    assert index.next_change(pricing_now()) > pricing_now()
+
+
+def test_menu_listing_applies_active_promotion(monkeypatch):
+    restaurant_id = uuid.uuid4()
+    index = _promotion_index()
+    monkeypatch.setattr(catalogue, "get_promotion_index", lambda db, rid: index)
+    monkeypatch.setattr(catalogue, "addons_for_menu_items", lambda db, ids: {})
+    monkeypatch.setattr(
+        catalogue,
+        "load_restaurant_menu",
+        lambda db, rid: catalogue.serialize_menu_items(db, [_menu_item(rid)]),
+    )
+
+    menu = catalogue.get_restaurant_menu(None, restaurant_id)
+
+    options = menu.value[0]["options"]
+    assert [option["discounted_price"] for option in options] == [7.5, 10.88]
+    assert menu.expires_at is not None
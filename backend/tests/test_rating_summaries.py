@@ -0,0 +1,56 @@
+import uuid
+from sqlalchemy.dialects import postgresql
+from app.repositories.repository import ReviewRepository
+from app.schemas.reviews import ReviewCreate, ReviewUpdate
+
+COUNTERS = ("review_count", "rating_sum", "rating_1", "rating_2", "rating_3", "rating_4", "rating_5")
+
+
+# Applies the summary upserts the way Postgres would: insert the deltas or add
+# them to the existing row.
+class FakeSession:
+    def __init__(self):
+        self.info = {}
+        self.summaries = {}
+
+    def execute(self, statement, *args):
+        params = statement.compile(dialect=postgresql.dialect()).params
+        row = self.summaries.setdefault(params["restaurant_id"], dict.fromkeys(COUNTERS, 0))
+        for key in COUNTERS:
+            row[key] += params[key]
+
+    def add(self, obj):
+        pass
+
+    def delete(self, obj):
+        pass
+
+    def flush(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def test_review_writes_keep_the_summary_consistent():
+    db, reviews = FakeSession(), ReviewRepository()
+    restaurant_id = uuid.uuid4()
+
+    first = reviews.create(db, ReviewCreate(user_id=uuid.uuid4(), restaurant_id=restaurant_id, rating=4))
+    second = reviews.create(db, ReviewCreate(user_id=uuid.uuid4(), restaurant_id=restaurant_id, rating=2))
+    reviews.update(db, first, ReviewUpdate(rating=5))
+    reviews.update(db, first, ReviewUpdate(comment="Still great"))
+    reviews.delete(db, db_obj=second)
+
+    assert db.summaries[restaurant_id] == {
+        "review_count": 1,
+        "rating_sum": 5,
+        "rating_1": 0,
+        "rating_2": 0,
+        "rating_3": 0,
+        "rating_4": 0,
+        "rating_5": 1,
+    }
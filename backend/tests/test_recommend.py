@@ -0,0 +1,55 @@
+import pytest
+from app.repositories.repository import MenuItemRepository, menu_item_exclusions
+from app.utils import recommend
+from app.utils.recommend import RRF_K, is_lexical_query, reciprocal_rank_fusion
+
+
+def test_fusion_ranks_items_found_by_both_lists_first():
+    semantic = ["paneer", "dosa", "idli"]
+    lexical = ["dosa", "vada"]
+    fused = reciprocal_rank_fusion([semantic, lexical])
+    assert sorted(fused, key=fused.get, reverse=True) == ["dosa", "paneer", "vada", "idli"]
+    assert fused["dosa"] == pytest.approx(1 / (RRF_K + 2) + 1 / (RRF_K + 1))
+    assert fused["paneer"] == pytest.approx(1 / (RRF_K + 1))
+
+
+def test_lexical_query_needs_a_short_query_matching_a_dish_name(monkeypatch):
+    monkeypatch.setattr(recommend.settings, "LEXICAL_SHORT_CIRCUIT_MAX_TERMS", 3)
+    assert is_lexical_query("chicken 65", [("id", 0.9, True)])
+    assert not is_lexical_query("chicken 65", [("id", 0.9, False)])
+    assert not is_lexical_query("something spicy with chicken please", [("id", 0.9, True)])
+    assert not is_lexical_query("chicken 65", [])
+
+
+def test_lexical_short_circuit_skips_the_embedding(monkeypatch):
+    monkeypatch.setattr(recommend.settings, "LEXICAL_SHORT_CIRCUIT_MAX_TERMS", 3)
+    searched = []
+
+    def search(self, db, query_text, k=30, **exclusions):
+        searched.append(exclusions)
+        return [("a", 0.9, True), ("b", 0.4, False)]
+
+    def embed(query_text):
+        raise AssertionError("embedding should not be requested")
+
+    monkeypatch.setattr(MenuItemRepository, "search", search)
+    monkeypatch.setattr(recommend, "embed_query", embed)
+    monkeypatch.setattr(recommend, "get_user_profile", lambda db, user_id: {"preferences": None})
+    monkeypatch.setattr(recommend, "get_menu_item_details", lambda db, ids: {mid: object() for mid in ids})
+    monkeypatch.setattr(recommend, "compute_boost", lambda item, profile: 0.0)
+
+    ids, meta = recommend.resolve_query_gemini_top_k(None, "user", "chicken 65", k=5)
+    assert ids == ["a", "b"]
+    assert meta["method"] == "lexical+personalization"
+    assert meta["confidences"]["a"] == pytest.approx(1.0)
+    assert searched == [{}]
+
+
+def test_exclusions_are_pushed_into_sql():
+    params = {}
+    conditions = menu_item_exclusions(params, exclude_allergens=["peanut"], exclude_tags=["non-veg"])
+    assert conditions[0] == "m.deleted_at IS NULL"
+    assert any("m.allergens" in condition and ":exclude_allergens" in condition for condition in conditions)
+    assert any("m.tags" in condition and ":exclude_tags" in condition for condition in conditions)
+    assert params == {"exclude_allergens": ["peanut"], "exclude_tags": ["non-veg"]}
+    assert menu_item_exclusions({}) == ["m.deleted_at IS NULL"]